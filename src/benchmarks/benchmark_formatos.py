@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from preprocessing.tratamento_transferencias import tratar_transferencias
+from preprocessing.formato_colunar import ESQUEMA_TRANSFERENCIAS, salvar_parquet, ler_parquet, parquet_disponivel
+from benchmarks.geradores import gerar_transferencias_raw
+
+def medir(funcao, repeticoes=3):
+    """Executa `funcao` algumas vezes e retorna (resultado, melhor tempo)."""
+    melhor = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        decorrido = time.perf_counter() - inicio
+        melhor = decorrido if melhor is None else min(melhor, decorrido)
+    return resultado, melhor
+
+def memoria_mb(df):
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+def tamanho_mb(caminho):
+    if os.path.isfile(caminho):
+        return os.path.getsize(caminho) / 1024 ** 2
+    return sum(os.path.getsize(os.path.join(raiz, nome))
+               for raiz, _, nomes in os.walk(caminho) for nome in nomes) / 1024 ** 2
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara leitura e memória dos dados tratados em CSV e Parquet.")
+    parser.add_argument("--linhas", type=int, nargs="+", default=[10**5, 10**6])
+    parser.add_argument("--anos", type=int, nargs="+", default=[2023, 2024], help="Temporadas da leitura filtrada")
+    args = parser.parse_args()
+
+    if not parquet_disponivel():
+        print("[ERRO] O benchmark exige o pacote pyarrow instalado.")
+        sys.exit(1)
+
+    colunas = ["Clube_ID", "Tipo", "Valor", "Ano"]
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho_csv = os.path.join(diretorio, "transferencias.csv")
+        for linhas in args.linhas:
+            df = tratar_transferencias(gerar_transferencias_raw(linhas))
+            df.to_csv(caminho_csv, sep=";", index=False, encoding="utf-8-sig", float_format="%.2f")
+            caminho = salvar_parquet(df, caminho_csv, ESQUEMA_TRANSFERENCIAS)
+
+            leituras = {
+                "CSV completo": lambda: pd.read_csv(caminho_csv, sep=";", encoding="utf-8"),
+                "Parquet completo": lambda: ler_parquet(caminho, ESQUEMA_TRANSFERENCIAS),
+                "CSV colunas": lambda: pd.read_csv(caminho_csv, sep=";", encoding="utf-8", usecols=colunas),
+                "Parquet colunas": lambda: ler_parquet(caminho, ESQUEMA_TRANSFERENCIAS, colunas=colunas),
+                "CSV temporadas": lambda: (lambda d: d[d["Ano"].isin(args.anos)])(
+                    pd.read_csv(caminho_csv, sep=";", encoding="utf-8")),
+                "Parquet temporadas": lambda: ler_parquet(caminho, ESQUEMA_TRANSFERENCIAS, anos=args.anos),
+            }
+
+            print(f"\n{linhas} linhas | disco: CSV {tamanho_mb(caminho_csv):.1f} MB, Parquet {tamanho_mb(caminho):.1f} MB")
+            for nome, leitura in leituras.items():
+                resultado, tempo = medir(leitura)
+                print(f"  {nome:<20} {tempo:8.3f}s | {memoria_mb(resultado):8.1f} MB | {len(resultado):>9} linhas")
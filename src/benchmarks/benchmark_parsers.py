@@ -0,0 +1,86 @@
+import os
+import sys
+import glob
+import gzip
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scraping.parsers import backends_disponiveis, ler_tabela_classificacao, ler_secoes_transferencias
+from benchmarks.geradores import gerar_pagina_wikipedia, gerar_pagina_transfermarkt
+
+def carregar_paginas(diretorio):
+    """
+    Lê as páginas salvas (.html ou .html.gz, inclusive as do cache de páginas) e as separa por tipo.
+    Retorna {"wikipedia": [...], "transfermarkt": [...]} com o conteúdo em bytes.
+    """
+    paginas = {"wikipedia": [], "transfermarkt": []}
+    caminhos = glob.glob(os.path.join(diretorio, "**", "*.html"), recursive=True)
+    caminhos += glob.glob(os.path.join(diretorio, "**", "*.html.gz"), recursive=True)
+    for caminho in sorted(caminhos):
+        abrir = gzip.open if caminho.endswith(".gz") else open
+        with abrir(caminho, "rb") as arquivo:
+            conteudo = arquivo.read()
+        if b"content-box-headline" in conteudo:
+            paginas["transfermarkt"].append(conteudo)
+        elif "Classificação".encode("utf-8") in conteudo:
+            paginas["wikipedia"].append(conteudo)
+    return paginas
+
+def paginas_sinteticas(quantidade):
+    """Gera páginas sintéticas no formato das páginas reais."""
+    return {
+        "wikipedia": [gerar_pagina_wikipedia(2015 + i % 10, seed=i).encode("utf-8") for i in range(quantidade)],
+        "transfermarkt": [gerar_pagina_transfermarkt(seed=i).encode("utf-8") for i in range(quantidade)],
+    }
+
+LEITORES = {"wikipedia": ler_tabela_classificacao, "transfermarkt": ler_secoes_transferencias}
+
+def verificar_equivalencia(paginas, backends):
+    """Confere, linha a linha, se cada backend produz exatamente a mesma saída que o BeautifulSoup."""
+    divergencias = 0
+    for tipo, lista in paginas.items():
+        leitor = LEITORES[tipo]
+        for i, pagina in enumerate(lista):
+            referencia = leitor(pagina, "bs4")
+            for backend in backends:
+                if backend != "bs4" and leitor(pagina, backend) != referencia:
+                    divergencias += 1
+                    print(f"[ERRO] {tipo} #{i}: saída do backend '{backend}' difere do BeautifulSoup")
+    return divergencias
+
+def medir(paginas, backends, rodadas):
+    """Retorna {(tipo, backend): páginas por segundo}."""
+    resultados = {}
+    for tipo, lista in paginas.items():
+        if not lista:
+            continue
+        leitor = LEITORES[tipo]
+        for backend in backends:
+            inicio = time.perf_counter()
+            for _ in range(rodadas):
+                for pagina in lista:
+                    leitor(pagina, backend)
+            duracao = time.perf_counter() - inicio
+            resultados[(tipo, backend)] = len(lista) * rodadas / duracao
+    return resultados
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara a velocidade e a saída dos backends de parsing.")
+    parser.add_argument("--paginas", help="Diretório com páginas salvas (ex.: data/cache/paginas/objetos)")
+    parser.add_argument("--sinteticas", type=int, default=10, help="Páginas sintéticas por tipo, sem --paginas")
+    parser.add_argument("--rodadas", type=int, default=3)
+    args = parser.parse_args()
+
+    paginas = carregar_paginas(args.paginas) if args.paginas else paginas_sinteticas(args.sinteticas)
+    backends = backends_disponiveis()
+    print(f"[INFO] Páginas: {len(paginas['wikipedia'])} Wikipédia, {len(paginas['transfermarkt'])} Transfermarkt")
+
+    divergencias = verificar_equivalencia(paginas, backends)
+    if divergencias:
+        print(f"[ERRO] {divergencias} página(s) com saída divergente.")
+        sys.exit(1)
+    print("[INFO] Saídas idênticas ao BeautifulSoup em todos os backends.")
+
+    for (tipo, backend), taxa in medir(paginas, backends, args.rodadas).items():
+        print(f"{tipo:<14} {backend:<6} {taxa:10.1f} páginas/s")
@@ -0,0 +1,81 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import metricas as modulo_metricas
+from preprocessing.rede_transferencias import construir_rede, gravar_rede, RedeTransferencias
+from benchmarks.geradores import gerar_transferencias_tratadas
+
+def medir(funcao, chamadas):
+    """Executa `funcao` `chamadas` vezes e retorna (último resultado, tempo médio por chamada)."""
+    inicio = time.perf_counter()
+    for _ in range(chamadas):
+        resultado = funcao()
+    return resultado, (time.perf_counter() - inicio) / chamadas
+
+def contrapartes_pandas(df, clube, n=10):
+    """Contrapartes com filtros sobre o DataFrame inteiro (a forma atual), usada como referência."""
+    linhas = df[df["Clube_ID"] == clube]
+    saida = linhas["Tipo"] == "Saída"
+    valores = linhas["Valor"].fillna(0)
+    tabela = pd.DataFrame({
+        "Cedidos": saida.groupby(linhas["Origem_Destino"]).sum(),
+        "Recebidos": (~saida).groupby(linhas["Origem_Destino"]).sum(),
+        "Valor_Recebido": valores.where(saida, 0).groupby(linhas["Origem_Destino"]).sum(),
+        "Valor_Pago": valores.where(~saida, 0).groupby(linhas["Origem_Destino"]).sum(),
+    })
+    tabela["Transferencias"] = tabela["Cedidos"] + tabela["Recebidos"]
+    tabela = tabela.rename_axis("Contraparte").reset_index()
+    return (tabela.sort_values(["Transferencias", "Valor_Recebido"], ascending=False, kind="mergesort")
+            .head(n).reset_index(drop=True))
+
+def fluxo_pandas(df, clube, contraparte):
+    linhas = df[(df["Clube_ID"] == clube) & (df["Origem_Destino"] == contraparte)]
+    return linhas.groupby(["Ano", "Tipo"], dropna=False)["Valor"].agg(["size", "sum"]).unstack("Tipo", fill_value=0)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara consultas na rede de transferências (CSR) e filtros do pandas.")
+    parser.add_argument("--linhas", type=int, nargs="+", default=[10**5, 10**6])
+    parser.add_argument("--clubes", type=int, default=40, help="Clubes coletados (Clube_ID de 1 a N)")
+    parser.add_argument("--chamadas", type=int, default=50, help="Chamadas de cada consulta por medição")
+    args = parser.parse_args()
+
+    modulo_metricas.NIVEL_LOG = "ERRO"
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "rede.json")
+        for linhas in args.linhas:
+            df = gerar_transferencias_tratadas(linhas, args.clubes)
+            inicio = time.perf_counter()
+            gravar_rede(*construir_rede(df), caminho)
+            montagem = time.perf_counter() - inicio
+            rede = RedeTransferencias.carregar(caminho)
+
+            clube = 1
+            contraparte = rede.contrapartes(clube, n=1)["Contraparte"].iloc[0]
+            referencia, tempo_pandas = medir(lambda: contrapartes_pandas(df, clube), args.chamadas)
+            resultado, tempo_rede = medir(lambda: rede.contrapartes(clube), args.chamadas)
+            iguais = (referencia[["Cedidos", "Recebidos"]].to_numpy() == resultado[["Cedidos", "Recebidos"]].to_numpy()).all() \
+                and np.allclose(referencia["Valor_Pago"], resultado["Valor_Pago"], rtol=1e-5)
+            if not iguais:
+                print(f"[ERRO] Contrapartes da rede diferem do pandas com {linhas} linhas.")
+                sys.exit(1)
+
+            referencia, tempo_fluxo_pandas = medir(lambda: fluxo_pandas(df, clube, contraparte), args.chamadas)
+            resultado, tempo_fluxo_rede = medir(lambda: rede.fluxo(clube, contraparte), args.chamadas)
+            if referencia[("size", "Saída")].sum() != resultado["Jogadores_A_para_B"].sum():
+                print(f"[ERRO] Fluxo da rede difere do pandas com {linhas} linhas.")
+                sys.exit(1)
+
+            _, tempo_caminho = medir(lambda: rede.caminho(clube, args.clubes), args.chamadas)
+            print(f"\n{linhas} linhas | rede montada e gravada em {montagem:.3f}s "
+                  f"({rede.quantidade_nos} clubes, {len(rede.origem)} arestas)")
+            print(f"  contrapartes | pandas {tempo_pandas * 1e3:9.3f} ms | rede {tempo_rede * 1e3:7.3f} ms"
+                  f" | {tempo_pandas / tempo_rede:6.1f}x")
+            print(f"  fluxo        | pandas {tempo_fluxo_pandas * 1e3:9.3f} ms | rede {tempo_fluxo_rede * 1e3:7.3f} ms"
+                  f" | {tempo_fluxo_pandas / tempo_fluxo_rede:6.1f}x")
+            print(f"  caminho      | rede {tempo_caminho * 1e3:7.3f} ms")
@@ -0,0 +1,47 @@
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from preprocessing.tratamento_transferencias import (
+    limpar_valor, converter_temporada, tratar_transferencias
+)
+from preprocessing.tratamento_delta import ids_estaveis
+from benchmarks.geradores import gerar_transferencias_raw
+
+def tratar_linha_a_linha(df_transferencias):
+    """Tratamento original, com .apply linha a linha, usado como referência."""
+    ids = ids_estaveis(df_transferencias)
+    df_transferencias["Empréstimo"] = df_transferencias["Transfer Sum"].apply(
+        lambda x: "Sim" if "loan" in str(x).lower() or "end of loan" in str(x).lower() else "Não"
+    )
+    df_transferencias["Valor"] = df_transferencias["Transfer Sum"].apply(limpar_valor)
+    df_transferencias["Ano"] = df_transferencias["Temporada"].apply(converter_temporada)
+    df_tratado = df_transferencias[["Clube_ID", "Tipo", "Origem_Destino", "Valor", "Empréstimo", "Ano"]].copy()
+    df_tratado.insert(0, "ID", ids.to_numpy())
+    return df_tratado
+
+def como_csv(df):
+    return df.to_csv(sep=";", index=False, float_format="%.2f")
+
+def medir(funcao, df):
+    inicio = time.perf_counter()
+    resultado = funcao(df.copy())
+    return resultado, time.perf_counter() - inicio
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara o tratamento de transferências linha a linha e vetorizado.")
+    parser.add_argument("--linhas", type=int, nargs="+", default=[10**4, 10**5, 10**6])
+    args = parser.parse_args()
+
+    for linhas in args.linhas:
+        df = gerar_transferencias_raw(linhas)
+        referencia, tempo_referencia = medir(tratar_linha_a_linha, df)
+        vetorizado, tempo_vetorizado = medir(tratar_transferencias, df)
+
+        if como_csv(referencia) != como_csv(vetorizado):
+            print(f"[ERRO] Resultado vetorizado difere do linha a linha com {linhas} linhas.")
+            sys.exit(1)
+        print(f"{linhas:>10} linhas | apply {tempo_referencia:8.3f}s | vetorizado {tempo_vetorizado:8.3f}s"
+              f" | {tempo_referencia / tempo_vetorizado:5.1f}x")
@@ -0,0 +1,244 @@
+import os
+import sys
+import json
+import math
+import time
+import gzip
+import argparse
+import itertools
+import platform
+from datetime import datetime
+from dotenv import load_dotenv, find_dotenv
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import metricas as modulo_metricas
+import preprocessing.tratamento_clubes as tratamento_clubes
+from scraping.brasileirao_scraper import analisar_tabela
+from scraping.transferencias_scraper import analisar_transferencias
+from preprocessing.tratamento_transferencias import (
+    limpar_valor, converter_temporada, limpar_valores, converter_temporadas
+)
+from modelos.projecao_temporada import forcas_clubes, probabilidades_jogos, simular_temporadas
+from benchmarks.benchmark_parsers import carregar_paginas
+from benchmarks.geradores import (
+    gerar_pagina_wikipedia, gerar_pagina_transfermarkt, gerar_colunas_limpeza,
+    gerar_clubes_raw, gerar_brasileirao_tratado, gerar_transferencias_tratadas,
+)
+
+# Carrega as variáveis de ambiente
+load_dotenv(find_dotenv())
+
+DIRETORIO_BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+
+# Páginas salvas usadas no benchmark de parsing (.html ou .html.gz, separadas por tipo pelo conteúdo)
+DIRETORIO_FIXTURES = os.getenv("DIRETORIO_FIXTURES", os.path.join(DIRETORIO_BENCHMARKS, "fixtures"))
+
+# Tempos de referência da suíte, gravados com --salvar-baseline
+ARQUIVO_BASELINE = os.getenv("ARQUIVO_BASELINE", os.path.join(DIRETORIO_BENCHMARKS, "baseline.json"))
+
+# Quanto um caso pode ficar mais lento que o baseline antes de contar como regressão (0.25 = 25%)
+LIMITE_REGRESSAO = float(os.getenv("LIMITE_REGRESSAO", 0.25))
+
+# Tamanhos padrão de cada grupo; --completo inclui 10^7 linhas na limpeza
+LINHAS_LIMPEZA = [10**4, 10**5, 10**6]
+LINHAS_LIMPEZA_COMPLETO = LINHAS_LIMPEZA + [10**7]
+LINHAS_LINHA_A_LINHA = 10**5  # A versão linha a linha (referência) só é medida até aqui
+QUANTIDADES_CLUBES = [20, 500, 5000]
+TEMPORADAS_PROJECAO = [10**4, 10**5]
+GRUPOS = ["parsing", "limpeza", "clubes", "projecao"]
+TRANSFERENCIAS_POR_CLUBE = 200
+
+# Duração mínima (s) de cada medição; casos mais rápidos são repetidos para reduzir o ruído
+TEMPO_MINIMO = float(os.getenv("TEMPO_MINIMO_BENCHMARK", 0.2))
+
+def gravar_fixtures(diretorio, quantidade=3):
+    """Grava páginas sintéticas de cada tipo em `diretorio`, compactadas, para uso como fixtures."""
+    os.makedirs(diretorio, exist_ok=True)
+    for i in range(quantidade):
+        paginas = {
+            f"wikipedia_{2015 + i}.html.gz": gerar_pagina_wikipedia(2015 + i, seed=i),
+            f"transfermarkt_{i}.html.gz": gerar_pagina_transfermarkt(seed=i),
+        }
+        for nome, html in paginas.items():
+            # mtime fixo: o mesmo conteúdo gera sempre o mesmo arquivo
+            with gzip.GzipFile(os.path.join(diretorio, nome), "wb", mtime=0) as arquivo:
+                arquivo.write(html.encode("utf-8"))
+    print(f"[INFO] {2 * quantidade} fixture(s) gravada(s) em {diretorio}")
+
+def medir(funcao, repeticoes, tempo_minimo=TEMPO_MINIMO):
+    """
+    Retorna o melhor tempo de `funcao` em `repeticoes` medições (menos sensível a ruído que a média).
+    Casos muito rápidos são executados várias vezes por medição, até somar `tempo_minimo`.
+    """
+    inicio = time.perf_counter()
+    funcao()
+    chamadas = max(1, math.ceil(tempo_minimo / max(time.perf_counter() - inicio, 1e-9)))
+
+    melhor = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for _ in range(chamadas):
+            funcao()
+        decorrido = (time.perf_counter() - inicio) / chamadas
+        melhor = decorrido if melhor is None else min(melhor, decorrido)
+    return melhor
+
+def casos_parsing(diretorio):
+    """Casos de parsing completo (leitura do HTML + extração das linhas) sobre as páginas salvas."""
+    paginas = carregar_paginas(diretorio)
+    if not paginas["wikipedia"] and not paginas["transfermarkt"]:
+        print(f"[ALERTA] Nenhuma página encontrada em {diretorio}; rode com --gravar-fixtures.")
+    if paginas["wikipedia"]:
+        yield ("parsing/analisar_tabela", len(paginas["wikipedia"]), "páginas",
+               lambda: [analisar_tabela(html, 2020) for html in paginas["wikipedia"]])
+    if paginas["transfermarkt"]:
+        yield ("parsing/analisar_transferencias", len(paginas["transfermarkt"]), "páginas",
+               lambda: [analisar_transferencias(html, "1") for html in paginas["transfermarkt"]])
+
+def casos_limpeza(tamanhos):
+    """
+    Casos de limpeza de valores e temporadas, vetorizada e (até LINHAS_LINHA_A_LINHA) linha a linha.
+    Os dados de cada tamanho são gerados só quando chega a vez dele, para não manter todos em memória.
+    """
+    for linhas in tamanhos:
+        df = gerar_colunas_limpeza(linhas)
+        yield (f"limpeza/limpar_valores/{linhas}", linhas, "linhas", lambda: limpar_valores(df["Transfer Sum"]))
+        yield (f"limpeza/converter_temporadas/{linhas}", linhas, "linhas", lambda: converter_temporadas(df["Temporada"]))
+        if linhas <= LINHAS_LINHA_A_LINHA:
+            yield (f"limpeza/limpar_valor/{linhas}", linhas, "linhas", lambda: df["Transfer Sum"].apply(limpar_valor))
+            yield (f"limpeza/converter_temporada/{linhas}", linhas, "linhas",
+                   lambda: df["Temporada"].apply(converter_temporada))
+
+def casos_clubes(quantidades):
+    """Casos de enriquecimento dos clubes (calcular_estatisticas) com dados sintéticos de cada tamanho."""
+    coluna = tratamento_clubes.COLUNA_NOME_OFICIAL or "Nome Oficial"
+    tratamento_clubes.COLUNA_NOME_OFICIAL = coluna
+    for quantidade in quantidades:
+        df_clubes = gerar_clubes_raw(quantidade, coluna)
+        df_brasileirao = gerar_brasileirao_tratado(df_clubes[coluna].tolist())
+        df_transferencias = gerar_transferencias_tratadas(quantidade * TRANSFERENCIAS_POR_CLUBE, quantidade)
+        yield (f"clubes/calcular_estatisticas/{quantidade}", quantidade, "clubes",
+               lambda: tratamento_clubes.calcular_estatisticas(df_clubes, df_brasileirao, df_transferencias))
+
+def casos_projecao(quantidades, processos=os.cpu_count() or 1):
+    """
+    Casos da simulação de temporadas (20 clubes, turno e returno), medidos em temporadas/s;
+    com mais de uma CPU, o maior tamanho também é medido com um processo por CPU.
+    """
+    df_brasileirao = gerar_brasileirao_tratado([f"Clube {i}" for i in range(30)], temporadas=10)
+    ano = int(df_brasileirao["Ano"].max())
+    clubes = df_brasileirao.loc[df_brasileirao["Ano"] == ano, "Clube"].tolist()
+    aproveitamento, taxa_empate = forcas_clubes(df_brasileirao, clubes, ano)
+    jogos = probabilidades_jogos(aproveitamento.to_numpy(), taxa_empate)
+    for temporadas in quantidades:
+        yield (f"projecao/simular_temporadas/{temporadas}", temporadas, "temporadas",
+               lambda: simular_temporadas(*jogos, temporadas=temporadas, processos=1))
+    if processos > 1:
+        yield (f"projecao/simular_temporadas/{quantidades[-1]}/{processos}_processos", quantidades[-1], "temporadas",
+               lambda: simular_temporadas(*jogos, temporadas=quantidades[-1], processos=processos))
+
+def executar_casos(casos, repeticoes):
+    """Mede cada caso (à medida que são gerados) e retorna {nome: {"segundos", "quantidade", "unidade", "por_segundo"}}."""
+    resultados = {}
+    for nome, quantidade, unidade, funcao in casos:
+        segundos = medir(funcao, repeticoes)
+        resultados[nome] = {
+            "segundos": round(segundos, 6),
+            "quantidade": quantidade,
+            "unidade": unidade,
+            "por_segundo": round(quantidade / segundos, 1) if segundos else None,
+        }
+        print(f"{nome:<42} {segundos:10.4f}s | {resultados[nome]['por_segundo']:>14,.1f} {unidade}/s")
+    return resultados
+
+def ambiente():
+    """Identificação da máquina: tempos de máquinas diferentes não são comparáveis."""
+    return {"python": platform.python_version(), "plataforma": platform.platform(),
+            "processador": platform.machine(), "cpus": os.cpu_count()}
+
+def salvar_baseline(resultados, caminho=ARQUIVO_BASELINE):
+    """Grava os resultados como baseline, mantendo os casos do baseline anterior que não foram medidos agora."""
+    anterior = ler_baseline(caminho)
+    casos = anterior["casos"] if anterior else {}
+    casos.update(resultados)
+    baseline = {"gerado_em": datetime.now().isoformat(timespec="seconds"), "ambiente": ambiente(),
+                "casos": dict(sorted(casos.items()))}
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump(baseline, arquivo, ensure_ascii=False, indent=2)
+    print(f"[INFO] Baseline salvo em {caminho} ({len(resultados)} caso(s) atualizado(s))")
+
+def ler_baseline(caminho=ARQUIVO_BASELINE):
+    if not os.path.exists(caminho):
+        return None
+    with open(caminho, encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+def comparar(resultados, baseline, limite=LIMITE_REGRESSAO):
+    """
+    Compara os tempos com o baseline e retorna a lista de regressões
+    (casos mais lentos que o baseline por mais de `limite`).
+    """
+    if baseline["ambiente"] != ambiente():
+        print(f"[ALERTA] Baseline gerado em outro ambiente ({baseline['ambiente']}); "
+              "grave um baseline local com --salvar-baseline.")
+
+    regressoes = []
+    for nome, atual in resultados.items():
+        referencia = baseline["casos"].get(nome)
+        if referencia is None:
+            print(f"[INFO] {nome}: sem baseline")
+            continue
+        variacao = atual["segundos"] / referencia["segundos"] - 1
+        situacao = "REGRESSÃO" if variacao > limite else "ok"
+        print(f"{nome:<42} {referencia['segundos']:10.4f}s → {atual['segundos']:10.4f}s ({variacao:+7.1%}) {situacao}")
+        if variacao > limite:
+            regressoes.append(nome)
+    return regressoes
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Suíte de benchmarks (parsing, limpeza, enriquecimento dos clubes e projeção de temporadas) "
+                    "com baseline e limite de regressão.")
+    parser.add_argument("--grupos", nargs="+", choices=GRUPOS, default=GRUPOS, help="Grupos a executar (padrão: todos)")
+    parser.add_argument("--fixtures", default=DIRETORIO_FIXTURES,
+                        help="Diretório com páginas salvas (ex.: data/cache/paginas/objetos)")
+    parser.add_argument("--gravar-fixtures", action="store_true", help="Regrava as fixtures sintéticas e sai")
+    parser.add_argument("--completo", action="store_true", help="Inclui 10^7 linhas na limpeza")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--salvar-baseline", action="store_true", help="Grava os resultados como novo baseline")
+    parser.add_argument("--baseline", default=ARQUIVO_BASELINE)
+    parser.add_argument("--limite", type=float, default=LIMITE_REGRESSAO,
+                        help="Regressão tolerada em relação ao baseline (0.25 = 25%% mais lento)")
+    args = parser.parse_args()
+
+    if args.gravar_fixtures:
+        gravar_fixtures(args.fixtures)
+        sys.exit(0)
+
+    # As mensagens por página dos scrapers atrapalhariam a leitura (e o tempo) do benchmark
+    modulo_metricas.NIVEL_LOG = "ERRO"
+
+    geradores = {
+        "parsing": lambda: casos_parsing(args.fixtures),
+        "limpeza": lambda: casos_limpeza(LINHAS_LIMPEZA_COMPLETO if args.completo else LINHAS_LIMPEZA),
+        "clubes": lambda: casos_clubes(QUANTIDADES_CLUBES),
+        "projecao": lambda: casos_projecao(TEMPORADAS_PROJECAO),
+    }
+    casos = itertools.chain.from_iterable(geradores[grupo]() for grupo in args.grupos)
+
+    resultados = executar_casos(casos, args.repeticoes)
+
+    if args.salvar_baseline:
+        salvar_baseline(resultados, args.baseline)
+        sys.exit(0)
+
+    baseline = ler_baseline(args.baseline)
+    if baseline is None:
+        print(f"[ALERTA] Baseline {args.baseline} não encontrado; grave um com --salvar-baseline.")
+        sys.exit(0)
+
+    regressoes = comparar(resultados, baseline, args.limite)
+    if regressoes:
+        print(f"[ERRO] {len(regressoes)} caso(s) acima do limite de {args.limite:.0%}: {', '.join(regressoes)}")
+        sys.exit(1)
+    print(f"[INFO] Nenhuma regressão acima de {args.limite:.0%}.")
@@ -0,0 +1,191 @@
+import random
+
+# Nomes usados para montar páginas e dados sintéticos
+CLUBES_EXEMPLO = [
+    "Corinthians", "Palmeiras", "Flamengo", "São Paulo", "Santos", "Grêmio", "Internacional",
+    "Atlético Mineiro", "Cruzeiro", "Fluminense", "Botafogo", "Vasco da Gama", "Bahia",
+    "Fortaleza", "Athletico Paranaense", "Red Bull Bragantino", "Cuiabá", "Goiás", "Ceará",
+    "Sport", "Coritiba", "Juventude", "Chapecoense", "Avaí", "América Mineiro", "Vitória",
+]
+VALORES_EXEMPLO = ["€1.5m", "€200k", "free transfer", "loan transfer", "End of loan", "-", "?", "€12.00m", "€750k"]
+
+def _ruido(rng, blocos):
+    """Conteúdo irrelevante (menus, scripts, anúncios) para aproximar o tamanho das páginas reais."""
+    partes = []
+    for i in range(blocos):
+        partes.append(
+            f'<div class="bloco-{i}"><ul>'
+            + "".join(f'<li><a href="/pagina/{rng.randint(1, 10**6)}">Link {j}</a></li>' for j in range(20))
+            + f'</ul><script>var dados_{i} = {{"id": {rng.randint(1, 10**6)}, "tabela": "<table>"}};</script></div>'
+        )
+    return "\n".join(partes)
+
+def gerar_pagina_wikipedia(ano, clubes=20, ruido=30, seed=None):
+    """Gera uma página no formato da Wikipédia com a seção "Classificação" de uma temporada."""
+    rng = random.Random(seed if seed is not None else ano)
+    nomes = rng.sample(CLUBES_EXEMPLO, min(clubes, len(CLUBES_EXEMPLO)))
+    cabecalho = "".join(f"<th>{c}</th>" for c in ["Pos", "Equipevde", "Pts", "J", "V", "E", "D", "GP", "GC", "SG"])
+    linhas = []
+    for pos, nome in enumerate(nomes, start=1):
+        v, e = rng.randint(5, 25), rng.randint(5, 15)
+        d = 38 - v - e
+        gp, gc = rng.randint(25, 75), rng.randint(25, 75)
+        sg = gp - gc
+        sg_texto = f"+{sg}" if sg > 0 else (f"−{-sg}" if sg < 0 else "0")
+        campeao = "<b>(C)</b>" if pos == 1 else ""
+        linhas.append(
+            f'<tr><th scope="row">{pos}</th>'
+            f'<td style="text-align:left"><span class="flagicon"><img src="x.png"/></span> '
+            f'<a href="/wiki/{nome.replace(" ", "_")}">{nome}</a>{campeao}</td>'
+            f"<td><b>{3 * v + e}</b></td><td>38</td><td>{v}</td><td>{e}</td><td>{d}</td>"
+            f"<td>{gp}</td><td>{gc}</td><td>{sg_texto}</td>"
+            f"<td>Vaga na <a href=\"/wiki/Libertadores\">Libertadores</a><sup>[{pos}]</sup></td></tr>"
+        )
+    tabela = (
+        '<table class="wikitable" style="text-align:center">'
+        f"<tbody><tr>{cabecalho}<th>Classificação ou descenso</th></tr>\n" + "\n".join(linhas) + "</tbody></table>"
+    )
+    return (
+        f"<!DOCTYPE html><html><head><title>Campeonato Brasileiro de Futebol de {ano}</title></head><body>"
+        + _ruido(rng, ruido)
+        + '<table class="infobox"><tr><td>Edição</td><td>Campeonato</td></tr></table>'
+        + '<div class="mw-heading mw-heading2"><h2 id="Classificação">Classificação</h2></div>'
+        + tabela
+        + '<h2 id="Resultados">Resultados</h2><table class="wikitable"><tr><th>Casa</th></tr><tr><td>1–0</td></tr></table>'
+        + _ruido(rng, ruido)
+        + "</body></html>"
+    )
+
+def gerar_pagina_transfermarkt(temporadas=12, transferencias_por_secao=25, ruido=120, seed=0):
+    """Gera uma página no formato do Transfermarkt com seções de chegadas e saídas por temporada."""
+    rng = random.Random(seed)
+    secoes = []
+    for inicio in range(14, 14 + temporadas):
+        for titulo in ("Arrivals", "Departures"):
+            linhas = []
+            for i in range(transferencias_por_secao):
+                valor = rng.choice(VALORES_EXEMPLO)
+                if valor == "loan transfer" and rng.random() < 0.5:
+                    valor = f"Loan fee:\n{rng.choice(['€200k', '€1.00m'])}"
+                linhas.append(
+                    f'<tr class="odd"><td class="hauptlink"><a href="/jogador/{i}">Jogador {inicio}-{i}</a></td>'
+                    f'<td class="zentriert">{rng.randint(17, 35)}</td>'
+                    f'<td><img src="c.png"/> <a href="/clube/{i}">{rng.choice(CLUBES_EXEMPLO)}</a></td>'
+                    f'<td class="rechts">{valor}</td></tr>'
+                )
+            secoes.append(
+                f'<div class="box"><h2 class="content-box-headline">\n    {titulo} {inicio}/{inicio + 1}\n</h2>'
+                '<div class="responsive-table"><table class="items"><thead><tr><th>Jogador</th><th>Idade</th>'
+                "<th>Clube</th><th>Valor</th></tr></thead><tbody>" + "".join(linhas) + "</tbody></table></div></div>"
+            )
+    return (
+        "<!DOCTYPE html><html><head><title>Transfers</title></head><body>"
+        + _ruido(rng, ruido)
+        + "".join(secoes)
+        + _ruido(rng, ruido)
+        + "</body></html>"
+    )
+
+# Valores do campo "Transfer Sum" como aparecem no CSV bruto, incluindo casos problemáticos
+TRANSFER_SUMS_EXEMPLO = [
+    "€1.50m", "€200k", "€12.00m", "€750k", "€1,20m", "€3m", "€45k", "€0.5m", "free transfer",
+    "loan transfer", "End of loan", "Unknown", "-", "?", "€1.2.3m", "draft", "€.", "",
+]
+
+def gerar_colunas_limpeza(linhas, seed=0):
+    """Gera só as colunas "Temporada" e "Transfer Sum" do CSV bruto, as que passam pela limpeza."""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    inicios = rng.integers(14, 26, linhas)
+    temporadas = np.char.add(np.char.add(np.char.zfill(inicios.astype(str), 2), "/"),
+                             np.char.zfill((inicios + 1).astype(str), 2))
+    # Algumas temporadas no formato de ano completo ou inválidas, como aparecem em páginas antigas
+    especiais = rng.random(linhas) < 0.001
+    temporadas = np.where(especiais, rng.choice(["2015", "n/d"], linhas), temporadas)
+
+    valores = rng.choice(np.array(TRANSFER_SUMS_EXEMPLO, dtype=object), linhas)
+    valores[rng.random(linhas) < 0.01] = np.nan
+    return pd.DataFrame({"Temporada": temporadas.astype(object), "Transfer Sum": valores})
+
+def gerar_transferencias_raw(linhas, clubes=40, seed=0):
+    """Gera um DataFrame no esquema do CSV bruto de transferências (tudo como texto)."""
+    import numpy as np
+    import pandas as pd
+
+    colunas = gerar_colunas_limpeza(linhas, seed)
+    rng = np.random.default_rng(seed + 1)
+    return pd.DataFrame({
+        "Temporada": colunas["Temporada"],
+        "Clube_ID": rng.integers(1, clubes + 1, linhas).astype(str).astype(object),
+        "Tipo": rng.choice(np.array(["Entrada", "Saída"], dtype=object), linhas),
+        "Player": np.char.add("Jogador ", rng.integers(0, linhas, linhas).astype(str)).astype(object),
+        "Origem_Destino": rng.choice(np.array(CLUBES_EXEMPLO, dtype=object), linhas),
+        "Transfer Sum": colunas["Transfer Sum"],
+    })
+
+UFS_EXEMPLO = ["SP", "RJ", "MG", "RS", "PR", "SC", "BA", "PE", "CE", "GO", "MT", "DF", "PA", "AM"]
+
+def nomes_clubes(quantidade):
+    """Nomes de clubes distintos: os de exemplo e, além deles, nomes numerados de largura fixa."""
+    extras = [f"Esporte Clube {i:05d}" for i in range(max(0, quantidade - len(CLUBES_EXEMPLO)))]
+    return (CLUBES_EXEMPLO + extras)[:quantidade]
+
+def gerar_clubes_raw(quantidade, coluna_nome_oficial="Nome Oficial", seed=0):
+    """Gera um DataFrame no esquema do CSV de clubes (ID, nome oficial, UF, nome e código no Transfermarkt)."""
+    import pandas as pd
+
+    rng = random.Random(seed)
+    nomes = nomes_clubes(quantidade)
+    return pd.DataFrame({
+        "ID": range(1, quantidade + 1),
+        coluna_nome_oficial: nomes,
+        "UF": [rng.choice(UFS_EXEMPLO) for _ in nomes],
+        "Nome_Transfer": nomes,
+        "Codigo_Transfer": [str(rng.randint(100, 99999)) for _ in nomes],
+    })
+
+def gerar_brasileirao_tratado(nomes, temporadas=None, seed=0):
+    """
+    Gera um DataFrame no esquema do CSV tratado do Brasileirão: 20 clubes de `nomes` por temporada.
+    Por padrão, temporadas suficientes para que cada clube apareça em duas, em média.
+    """
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    temporadas = temporadas or max(10, len(nomes) // 10)
+    por_temporada = min(20, len(nomes))
+    linhas = temporadas * por_temporada
+
+    clubes = np.concatenate([rng.choice(len(nomes), por_temporada, replace=False) for _ in range(temporadas)])
+    vitorias = rng.integers(5, 26, linhas)
+    empates = rng.integers(5, 16, linhas)
+    gp, gc = rng.integers(25, 76, linhas), rng.integers(25, 76, linhas)
+    return pd.DataFrame({
+        "ID": np.arange(1, linhas + 1),
+        "Posição": np.tile(np.arange(1, por_temporada + 1), temporadas),
+        "Clube": np.asarray(nomes, dtype=object)[clubes],
+        "Pontos": 3 * vitorias + empates,
+        "Jogos": 38,
+        "Vitórias": vitorias,
+        "Empates": empates,
+        "Derrotas": 38 - vitorias - empates,
+        "GP": gp,
+        "GC": gc,
+        "SG": gp - gc,
+        "Ano": np.repeat(np.arange(2025 - temporadas, 2025), por_temporada),
+    })
+
+def gerar_transferencias_tratadas(linhas, clubes, seed=0):
+    """
+    Gera um DataFrame no esquema do CSV tratado de transferências, com Clube_ID numérico
+    (como é lido do CSV) referenciando os IDs de 1 a `clubes`.
+    """
+    import pandas as pd
+    from preprocessing.tratamento_transferencias import tratar_transferencias
+
+    df = tratar_transferencias(gerar_transferencias_raw(linhas, clubes=clubes, seed=seed))
+    df["Clube_ID"] = pd.to_numeric(df["Clube_ID"])
+    return df
@@ -0,0 +1,38 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scraping.servidor_fixtures import iniciar_servidor
+from scraping.cliente_http import buscar_paginas
+from scraping.limitador import limitador
+from benchmarks.geradores import gerar_pagina_wikipedia
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Coleta páginas sintéticas de um servidor local que limita acessos e mostra a adaptação do limitador.")
+    parser.add_argument("--paginas", type=int, default=60)
+    parser.add_argument("--taxa-maxima", type=float, default=3, help="Taxa (req/s) acima da qual o servidor responde 429")
+    parser.add_argument("--prob-erro", type=float, default=0.05, help="Probabilidade de o servidor responder 503")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        for i in range(args.paginas):
+            with open(os.path.join(diretorio, f"pagina_{i}.html"), "w", encoding="utf-8") as arquivo:
+                arquivo.write(gerar_pagina_wikipedia(2015 + i % 10, seed=i))
+
+        servidor, url_base = iniciar_servidor(diretorio, taxa_maxima=args.taxa_maxima, prob_erro=args.prob_erro)
+        urls = [f"{url_base}/pagina/{i}" for i in range(args.paginas)]
+        try:
+            inicio = time.perf_counter()
+            paginas = buscar_paginas(urls)
+            decorrido = time.perf_counter() - inicio
+        finally:
+            servidor.shutdown()
+
+    obtidas = sum(pagina is not None for pagina in paginas)
+    print(f"[INFO] {obtidas}/{args.paginas} páginas em {decorrido:.1f}s ({obtidas / decorrido:.2f} páginas/s)")
+    print(f"[INFO] Respostas do servidor: {servidor.estrangulamento.contagem}")
+    print(f"[INFO] Estado final do limitador: {limitador(urls[0]).estado()}")
@@ -0,0 +1,182 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv, find_dotenv
+
+from metricas import metricas, log
+from preprocessing.formato_colunar import ESQUEMA_BRASILEIRAO, ESQUEMA_TRANSFERENCIAS, ESQUEMA_CLUBES, aplicar_esquema
+from preprocessing.tratamento_transferencias import ler_transferencias_tratadas
+
+# Carrega as variáveis de ambiente
+load_dotenv(find_dotenv())
+
+# Quantos conjuntos de dados ficam carregados em memória ao mesmo tempo (os menos usados saem primeiro)
+CACHE_DADOS_MAXIMO = int(os.getenv("CACHE_DADOS_MAXIMO", 6))
+
+def _ler_transferencias_raw(caminho):
+    return pd.read_csv(caminho, sep=";", dtype=str)
+
+def _ler_brasileirao_raw(caminho):
+    return pd.read_csv(caminho, sep=";", encoding="utf-8")
+
+def _ler_clubes_raw(caminho):
+    return pd.read_csv(caminho, sep=";", encoding="utf-8")
+
+def _ler_transferencias_processed(caminho):
+    return aplicar_esquema(ler_transferencias_tratadas(caminho), ESQUEMA_TRANSFERENCIAS)
+
+def _ler_brasileirao_processed(caminho):
+    df = pd.read_csv(caminho, sep=";", encoding="utf-8", dtype={"Clube": str, "Clube_ID": "Int32"})
+    return aplicar_esquema(df, ESQUEMA_BRASILEIRAO)
+
+def _ler_clubes_processed(caminho):
+    return aplicar_esquema(pd.read_csv(caminho, sep=";", encoding="utf-8-sig"), ESQUEMA_CLUBES)
+
+# Conjuntos de dados disponíveis: nome → (variável de ambiente com o caminho do CSV, função de leitura tipada)
+CONJUNTOS = {
+    "transferencias_raw": ("ARQUIVO_TRANSFERENCIAS_RAW", _ler_transferencias_raw),
+    "brasileirao_raw": ("ARQUIVO_BRASILEIRAO_RAW", _ler_brasileirao_raw),
+    "clubes_raw": ("ARQUIVO_CLUBES_RAW", _ler_clubes_raw),
+    "transferencias": ("ARQUIVO_TRANSFERENCIAS_PROCESSED", _ler_transferencias_processed),
+    "brasileirao": ("ARQUIVO_BRASILEIRAO_PROCESSED", _ler_brasileirao_processed),
+    "clubes": ("ARQUIVO_CLUBES_PROCESSED", _ler_clubes_processed),
+}
+
+def hash_arquivo(caminho):
+    sha = hashlib.sha256()
+    with open(caminho, "rb") as arquivo:
+        for bloco in iter(lambda: arquivo.read(1 << 20), b""):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+class Tabela:
+    """
+    Um conjunto de dados carregado: o DataFrame tipado e índices de posições por valor, montados na
+    primeira consulta a cada combinação de colunas. Consultas por igualdade viram buscas em dicionário.
+    """
+
+    def __init__(self, df, assinatura, hash_conteudo):
+        self.df = df
+        self.assinatura = assinatura  # (mtime_ns, tamanho) do arquivo lido
+        self.hash_conteudo = hash_conteudo
+        self._indices = {}
+        self._trava = threading.Lock()
+
+    def indice(self, colunas):
+        """
+        {chave: posições (ordenadas) das linhas com essa chave} para a tupla de `colunas`; a chave é o
+        valor (uma coluna) ou a tupla de valores (várias). Linhas com algum valor nulo ficam de fora.
+        """
+        with self._trava:
+            if colunas not in self._indices:
+                agrupador = colunas[0] if len(colunas) == 1 else list(colunas)
+                self._indices[colunas] = self.df.groupby(agrupador, observed=True, sort=False).indices
+            return self._indices[colunas]
+
+    def posicoes(self, **filtros):
+        """Posições das linhas que atendem a todos os filtros (coluna=valor); filtros None são ignorados."""
+        filtros = {coluna: valor for coluna, valor in filtros.items() if valor is not None}
+        if not filtros:
+            return np.arange(len(self.df))
+        colunas = tuple(filtros)
+        chave = filtros[colunas[0]] if len(colunas) == 1 else tuple(filtros.values())
+        return self.indice(colunas).get(chave, np.empty(0, dtype=np.intp))
+
+    def linhas(self, **filtros):
+        return self.df.iloc[self.posicoes(**filtros)]
+
+class CacheDados:
+    """
+    Cache LRU dos conjuntos de dados, por caminho. Cada acesso compara o mtime e o tamanho do arquivo
+    com os da leitura anterior; se mudaram, o conteúdo é comparado pelo hash e o CSV só é lido de novo
+    se ele realmente mudou.
+    """
+
+    def __init__(self, maximo=CACHE_DADOS_MAXIMO):
+        self.maximo = maximo
+        self._tabelas = OrderedDict()  # (nome, caminho) → Tabela
+        self._trava = threading.RLock()
+
+    def tabela(self, nome, caminho=None):
+        if nome not in CONJUNTOS:
+            raise ValueError(f"[ERRO] Conjunto de dados desconhecido: {nome} (opções: {', '.join(CONJUNTOS)})")
+        variavel, ler = CONJUNTOS[nome]
+        caminho = caminho or os.getenv(variavel)
+        if not caminho:
+            raise ValueError(f"[ERRO] Caminho de '{nome}' não configurado; defina {variavel} no .env.")
+
+        with self._trava:
+            estado = os.stat(caminho)
+            assinatura = (estado.st_mtime_ns, estado.st_size)
+            chave = (nome, os.path.abspath(caminho))
+            tabela = self._tabelas.get(chave)
+
+            if tabela is not None and tabela.assinatura != assinatura:
+                conteudo = hash_arquivo(caminho)
+                if conteudo == tabela.hash_conteudo:
+                    tabela.assinatura = assinatura  # Arquivo regravado com o mesmo conteúdo
+                else:
+                    tabela = None
+            else:
+                conteudo = None
+
+            if tabela is None:
+                metricas().contar("cache_dados_falhas")
+                with metricas().cronometro(f"leitura/{nome}"):
+                    tabela = Tabela(ler(caminho), assinatura, conteudo or hash_arquivo(caminho))
+                metricas().contar_linhas(f"leitura/{nome}", len(tabela.df))
+                log("DEBUG", f"{nome}: {len(tabela.df)} linha(s) lidas de {caminho}")
+            else:
+                metricas().contar("cache_dados_acertos")
+
+            self._tabelas[chave] = tabela
+            self._tabelas.move_to_end(chave)
+            while len(self._tabelas) > self.maximo:
+                self._tabelas.popitem(last=False)
+            return tabela
+
+    def limpar(self):
+        with self._trava:
+            self._tabelas.clear()
+
+_trava_cache = threading.Lock()
+_cache = None
+
+def cache_dados():
+    """Retorna o cache de dados do processo."""
+    global _cache
+    with _trava_cache:
+        if _cache is None:
+            _cache = CacheDados()
+        return _cache
+
+def carregar(nome, caminho=None):
+    """
+    DataFrame tipado do conjunto `nome` (ver CONJUNTOS), lido uma vez e reaproveitado enquanto o
+    arquivo não mudar. O DataFrame é compartilhado entre as chamadas: use .copy() antes de alterá-lo.
+    """
+    return cache_dados().tabela(nome, caminho).df
+
+def historico_clube(id_clube):
+    """Temporadas do clube (pelo ID do índice de clubes) no Brasileirão tratado, em ordem cronológica."""
+    linhas = cache_dados().tabela("brasileirao").linhas(Clube_ID=int(id_clube))
+    return linhas.sort_values("Ano", kind="mergesort")
+
+def tabela_temporada(ano):
+    """Classificação do Brasileirão de `ano`, em ordem de posição."""
+    linhas = cache_dados().tabela("brasileirao").linhas(Ano=int(ano))
+    return linhas.sort_values("Posição", kind="mergesort")
+
+def transferencias(clube=None, ano=None, tipo=None):
+    """
+    Transferências tratadas filtradas por clube (ID do CSV de clubes), temporada e tipo
+    ("Entrada" ou "Saída"); filtros omitidos não restringem o resultado.
+    """
+    return cache_dados().tabela("transferencias").linhas(
+        Clube_ID=None if clube is None else str(clube),
+        Ano=None if ano is None else int(ano),
+        Tipo=tipo,
+    )
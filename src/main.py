@@ -0,0 +1,260 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import importlib
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dotenv import load_dotenv, find_dotenv
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from metricas import metricas, log
+
+# Carrega as variáveis de ambiente
+load_dotenv(find_dotenv())
+
+# Estado do pipeline: hash das entradas e do código de cada etapa na última execução bem-sucedida
+ESTADO_PIPELINE = os.getenv("ESTADO_PIPELINE", os.path.join("data", "pipeline_estado.json"))
+
+# Número máximo de etapas independentes executadas ao mesmo tempo
+PIPELINE_WORKERS = int(os.getenv("PIPELINE_WORKERS", 2))
+
+# Saídas com caminho padrão, para que um .env sem essas variáveis continue funcionando
+os.environ.setdefault("ARQUIVO_FEATURES_CLUBES", os.path.join("data", "features", "features_clubes.json"))
+os.environ.setdefault("ARQUIVO_REDE_TRANSFERENCIAS", os.path.join("data", "features", "rede_transferencias.json"))
+
+DIRETORIO_SRC = os.path.dirname(os.path.abspath(__file__))
+
+class Etapa:
+    """
+    Uma etapa do pipeline: a função `modulo.funcao`, os arquivos que lê e grava (nomes de variáveis
+    do .env) e as etapas das quais depende. O módulo só é importado quando a etapa executa.
+    """
+
+    def __init__(self, nome, modulo, funcao, entradas=(), saidas=(), dependencias=(), codigo=(), coleta=False):
+        self.nome = nome
+        self.modulo = modulo
+        self.funcao = funcao
+        self.entradas = list(entradas)
+        self.saidas = list(saidas)
+        self.dependencias = list(dependencias)
+        self.codigo = [modulo, *codigo]  # Módulos cujo código-fonte entra no hash
+        self.coleta = coleta  # Etapas de coleta dependem da rede, não só dos arquivos de entrada
+
+    def caminhos(self, variaveis):
+        caminhos = []
+        for variavel in variaveis:
+            caminho = os.getenv(variavel)
+            if not caminho:
+                raise ValueError(f"[ERRO] A variável {variavel} da etapa '{self.nome}' não foi definida. Verifique o .env.")
+            caminhos.append(caminho)
+        return caminhos
+
+    def executar(self, opcoes):
+        funcao = getattr(importlib.import_module(self.modulo), self.funcao)
+        if self.coleta:
+            return funcao(**opcoes)
+        return funcao()
+
+ETAPAS = [
+    Etapa("coleta_brasileirao", "scraping.brasileirao_scraper", "executar",
+          saidas=["ARQUIVO_BRASILEIRAO_RAW"],
+          codigo=["scraping.parsers", "scraping.cliente_http"], coleta=True),
+    Etapa("coleta_transferencias", "scraping.transferencias_scraper", "executar",
+          entradas=["ARQUIVO_CLUBES_RAW"], saidas=["ARQUIVO_TRANSFERENCIAS_RAW"],
+          codigo=["scraping.parsers", "scraping.cliente_http", "scraping.pool_drivers"], coleta=True),
+    Etapa("tratamento_brasileirao", "preprocessing.tratamento_brasileirao", "processar_brasileirao",
+          entradas=["ARQUIVO_BRASILEIRAO_RAW", "ARQUIVO_CLUBES_RAW"], saidas=["ARQUIVO_BRASILEIRAO_PROCESSED"],
+          dependencias=["coleta_brasileirao"], codigo=["preprocessing.formato_colunar", "preprocessing.indice_clubes",
+                                                          "preprocessing.tratamento_delta", "preprocessing.tratamento_blocos"]),
+    Etapa("tratamento_transferencias", "preprocessing.tratamento_transferencias", "processar_transferencias",
+          entradas=["ARQUIVO_TRANSFERENCIAS_RAW", "ARQUIVO_CLUBES_RAW"], saidas=["ARQUIVO_TRANSFERENCIAS_PROCESSED"],
+          dependencias=["coleta_transferencias"], codigo=["preprocessing.formato_colunar", "preprocessing.indice_clubes",
+                                                             "preprocessing.tratamento_delta", "preprocessing.tratamento_blocos"]),
+    Etapa("tratamento_clubes", "preprocessing.tratamento_clubes", "processar_clubes",
+          entradas=["ARQUIVO_CLUBES_RAW", "ARQUIVO_BRASILEIRAO_PROCESSED", "ARQUIVO_TRANSFERENCIAS_PROCESSED"],
+          saidas=["ARQUIVO_CLUBES_PROCESSED"],
+          dependencias=["tratamento_brasileirao", "tratamento_transferencias"],
+          codigo=["preprocessing.formato_colunar", "preprocessing.indice_clubes"]),
+    Etapa("features_clubes", "preprocessing.features_clubes", "processar_features",
+          entradas=["ARQUIVO_BRASILEIRAO_PROCESSED", "ARQUIVO_TRANSFERENCIAS_PROCESSED"],
+          saidas=["ARQUIVO_FEATURES_CLUBES"],
+          dependencias=["tratamento_brasileirao", "tratamento_transferencias"], codigo=["preprocessing.indice_clubes"]),
+    Etapa("rede_transferencias", "preprocessing.rede_transferencias", "processar_rede",
+          entradas=["ARQUIVO_TRANSFERENCIAS_PROCESSED", "ARQUIVO_CLUBES_RAW"], saidas=["ARQUIVO_REDE_TRANSFERENCIAS"],
+          dependencias=["tratamento_transferencias"],
+          codigo=["preprocessing.indice_clubes", "preprocessing.tratamento_transferencias"]),
+]
+
+def _arquivo_modulo(modulo):
+    return os.path.join(DIRETORIO_SRC, *modulo.split(".")) + ".py"
+
+def hash_etapa(etapa):
+    """Hash do conteúdo dos arquivos de entrada e do código-fonte da etapa."""
+    sha = hashlib.sha256(etapa.nome.encode("utf-8"))
+    arquivos = etapa.caminhos(etapa.entradas) + [_arquivo_modulo(modulo) for modulo in etapa.codigo]
+    for caminho in arquivos:
+        sha.update(caminho.encode("utf-8"))
+        if not os.path.exists(caminho):
+            sha.update(b"\0ausente")
+            continue
+        with open(caminho, "rb") as arquivo:
+            for bloco in iter(lambda: arquivo.read(1 << 20), b""):
+                sha.update(bloco)
+    return sha.hexdigest()
+
+def carregar_estado():
+    if not os.path.exists(ESTADO_PIPELINE):
+        return {}
+    with open(ESTADO_PIPELINE, encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+def salvar_estado(estado):
+    diretorio = os.path.dirname(ESTADO_PIPELINE)
+    if diretorio:
+        os.makedirs(diretorio, exist_ok=True)
+    temporario = f"{ESTADO_PIPELINE}.tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        json.dump(estado, arquivo, ensure_ascii=False, indent=2)
+    os.replace(temporario, ESTADO_PIPELINE)
+
+def ordenar_etapas(etapas):
+    """Valida o grafo de dependências e retorna as etapas em ordem topológica."""
+    por_nome = {etapa.nome: etapa for etapa in etapas}
+    ordem, visitando, visitadas = [], set(), set()
+
+    def visitar(nome):
+        if nome in visitadas:
+            return
+        if nome in visitando:
+            raise ValueError(f"[ERRO] Dependência circular envolvendo a etapa '{nome}'.")
+        if nome not in por_nome:
+            raise ValueError(f"[ERRO] Etapa desconhecida: '{nome}'.")
+        visitando.add(nome)
+        for dependencia in por_nome[nome].dependencias:
+            visitar(dependencia)
+        visitando.discard(nome)
+        visitadas.add(nome)
+        ordem.append(por_nome[nome])
+
+    for etapa in etapas:
+        visitar(etapa.nome)
+    return ordem
+
+def selecionar_etapas(etapas, nomes):
+    """Etapas pedidas e todas as suas dependências (todas, se `nomes` for vazio)."""
+    if not nomes:
+        return etapas
+    por_nome = {etapa.nome: etapa for etapa in etapas}
+    selecionadas = set()
+
+    def incluir(nome):
+        if nome not in por_nome:
+            raise ValueError(f"[ERRO] Etapa desconhecida: '{nome}'.")
+        if nome not in selecionadas:
+            selecionadas.add(nome)
+            for dependencia in por_nome[nome].dependencias:
+                incluir(dependencia)
+
+    for nome in nomes:
+        incluir(nome)
+    return [etapa for etapa in etapas if etapa.nome in selecionadas]
+
+def executar_pipeline(etapas=ETAPAS, workers=PIPELINE_WORKERS, forcar=(), coletar=False, opcoes_coleta=None):
+    """
+    Executa as etapas respeitando as dependências; etapas independentes rodam em paralelo.
+    Uma etapa é pulada quando o hash das entradas e do código não mudou desde a última execução
+    e as saídas existem. Etapas de coleta só reexecutam com `coletar=True` ou se a saída não existir.
+    Retorna {nome: "executada" | "pulada" | "falhou" | "cancelada"}.
+    """
+    etapas = ordenar_etapas(etapas)
+    nomes_etapas = {etapa.nome for etapa in etapas}
+    opcoes_coleta = opcoes_coleta or {}
+    estado = carregar_estado()
+    situacao = {}
+    pendentes = list(etapas)
+    em_execucao = {}
+
+    def pronta(etapa):
+        return all(situacao.get(d) in ("executada", "pulada") for d in etapa.dependencias if d in nomes_etapas)
+
+    def bloqueada(etapa):
+        return any(situacao.get(d) in ("falhou", "cancelada") for d in etapa.dependencias if d in nomes_etapas)
+
+    def iniciar(executor, etapa):
+        saidas_existem = all(os.path.exists(caminho) for caminho in etapa.caminhos(etapa.saidas))
+        if etapa.coleta:
+            # O que a coleta produz depende dos sites, não só do código: reexecuta apenas quando pedido
+            atualizada = saidas_existem and not coletar
+            motivo = "saída já coletada (use --coletar para atualizar)"
+        else:
+            atualizada = saidas_existem and estado.get(etapa.nome, {}).get("hash") == hash_etapa(etapa)
+            motivo = "entradas e código sem alterações"
+        if etapa.nome not in forcar and atualizada:
+            log("INFO", f"Etapa '{etapa.nome}' pulada: {motivo}.")
+            situacao[etapa.nome] = "pulada"
+            return
+        log("INFO", f"Iniciando etapa '{etapa.nome}'.")
+        em_execucao[executor.submit(_cronometrar, etapa, opcoes_coleta.get(etapa.nome, {}))] = etapa
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        while pendentes or em_execucao:
+            for etapa in list(pendentes):
+                if bloqueada(etapa):
+                    log("ALERTA", f"Etapa '{etapa.nome}' cancelada: uma dependência falhou.")
+                    situacao[etapa.nome] = "cancelada"
+                    pendentes.remove(etapa)
+                elif pronta(etapa):
+                    pendentes.remove(etapa)
+                    iniciar(executor, etapa)
+
+            if not em_execucao:
+                continue
+
+            concluidos, _ = wait(em_execucao, return_when=FIRST_COMPLETED)
+            for futuro in concluidos:
+                etapa = em_execucao.pop(futuro)
+                try:
+                    duracao = futuro.result()
+                except Exception as e:
+                    log("ERRO", f"Etapa '{etapa.nome}' falhou: {e}")
+                    situacao[etapa.nome] = "falhou"
+                    continue
+                # O hash é recalculado: a própria etapa pode ter alterado as suas entradas
+                estado[etapa.nome] = {"hash": hash_etapa(etapa), "duracao_s": round(duracao, 2),
+                                      "executada_em": time.strftime("%Y-%m-%dT%H:%M:%S")}
+                salvar_estado(estado)
+                situacao[etapa.nome] = "executada"
+                log("INFO", f"Etapa '{etapa.nome}' concluída em {duracao:.1f}s.")
+    return situacao
+
+def _cronometrar(etapa, opcoes):
+    inicio = time.perf_counter()
+    etapa.executar(opcoes)
+    duracao = time.perf_counter() - inicio
+    metricas().registrar_tempo(f"pipeline_{etapa.nome}", duracao)
+    return duracao
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Executa o pipeline de coleta e tratamento dos dados.")
+    parser.add_argument("etapas", nargs="*", help="Etapas a executar, com as suas dependências (padrão: todas)")
+    parser.add_argument("--workers", type=int, default=PIPELINE_WORKERS, help="Etapas independentes em paralelo")
+    parser.add_argument("--forcar", nargs="+", default=[], metavar="ETAPA", help="Reexecuta as etapas mesmo sem alterações")
+    parser.add_argument("--coletar", action="store_true", help="Reexecuta as etapas de coleta (rede)")
+    parser.add_argument("--offline", action="store_true", help="Coleta somente a partir do cache de páginas")
+    parser.add_argument("--incremental", action="store_true", help="Coleta somente o que falta ou está desatualizado")
+    parser.add_argument("--listar", action="store_true", help="Lista as etapas e as dependências, sem executar")
+    args = parser.parse_args()
+
+    if args.listar:
+        for etapa in ordenar_etapas(ETAPAS):
+            print(f"{etapa.nome:<28} depende de: {', '.join(etapa.dependencias) or '-'}")
+        sys.exit(0)
+
+    opcoes = {"offline": args.offline, "incremental": args.incremental}
+    resultado = executar_pipeline(selecionar_etapas(ETAPAS, args.etapas), args.workers, set(args.forcar),
+                                  args.coletar, {etapa.nome: opcoes for etapa in ETAPAS if etapa.coleta})
+    log("INFO", f"Resumo: {resultado}")
+    metricas().exportar("pipeline")
+    sys.exit(1 if any(s in ("falhou", "cancelada") for s in resultado.values()) else 0)
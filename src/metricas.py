@@ -0,0 +1,200 @@
+import os
+import json
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from dotenv import load_dotenv, find_dotenv
+
+# Carrega as variáveis de ambiente
+load_dotenv(find_dotenv())
+
+# Nível mínimo das mensagens exibidas: DEBUG, INFO, ALERTA ou ERRO (DEBUG inclui as mensagens por linha)
+NIVEIS_LOG = ("DEBUG", "INFO", "ALERTA", "ERRO")
+NIVEL_LOG = os.getenv("NIVEL_LOG", "INFO").upper()
+
+# Diretório dos resumos de métricas exportados ao final de cada execução
+METRICAS_DIR = os.getenv("METRICAS_DIR", os.path.join("data", "metricas"))
+
+# Limites (s) dos buckets dos histogramas de latência
+BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+def nivel_ativo(nivel):
+    """True se mensagens de `nivel` devem ser exibidas; use antes de montar mensagens caras (ex.: por linha)."""
+    minimo = NIVEL_LOG if NIVEL_LOG in NIVEIS_LOG else "INFO"
+    return NIVEIS_LOG.index(nivel) >= NIVEIS_LOG.index(minimo)
+
+def log(nivel, mensagem):
+    """Exibe `mensagem` no formato "[NIVEL] ..." se o nível estiver ativo."""
+    if nivel_ativo(nivel):
+        print(f"[{nivel}] {mensagem}")
+
+def _novo_histograma():
+    return {"n": 0, "soma": 0.0, "max": 0.0, "buckets": [0] * (len(BUCKETS_SEGUNDOS) + 1)}
+
+class Metricas:
+    """
+    Registro de métricas da execução: cronômetros por etapa (fetch, popup, parse, extracao, limpeza,
+    escrita) com histograma de latência, latência por URL, linhas processadas e contadores de eventos.
+    É seguro entre threads; métricas de outros processos entram com `mesclar`.
+    """
+
+    def __init__(self):
+        self._trava = threading.Lock()
+        self.zerar()
+
+    def zerar(self):
+        with self._trava:
+            self.iniciado_em = time.time()
+            self.etapas = {}
+            self.urls = {}
+            self.linhas = {}
+            self.contadores = {}
+
+    def registrar_tempo(self, etapa, segundos, url=None):
+        with self._trava:
+            histograma = self.etapas.setdefault(etapa, _novo_histograma())
+            histograma["n"] += 1
+            histograma["soma"] += segundos
+            histograma["max"] = max(histograma["max"], segundos)
+            histograma["buckets"][bisect.bisect_left(BUCKETS_SEGUNDOS, segundos)] += 1
+            if url is not None:
+                por_url = self.urls.setdefault(url, {"n": 0, "soma": 0.0, "max": 0.0})
+                por_url["n"] += 1
+                por_url["soma"] += segundos
+                por_url["max"] = max(por_url["max"], segundos)
+
+    @contextmanager
+    def cronometro(self, etapa, url=None):
+        """Mede o tempo do bloco e o registra na etapa (e na URL, se informada)."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar_tempo(etapa, time.perf_counter() - inicio, url)
+
+    def contar(self, nome, valor=1):
+        with self._trava:
+            self.contadores[nome] = self.contadores.get(nome, 0) + valor
+
+    def contar_linhas(self, etapa, quantidade):
+        with self._trava:
+            self.linhas[etapa] = self.linhas.get(etapa, 0) + quantidade
+
+    def capturar(self):
+        """Estado bruto atual (serializável), usado para levar métricas de um processo a outro."""
+        with self._trava:
+            return json.loads(json.dumps({"etapas": self.etapas, "urls": self.urls,
+                                          "linhas": self.linhas, "contadores": self.contadores}))
+
+    def mesclar(self, bruto):
+        """Soma ao registro as métricas capturadas em outro processo."""
+        with self._trava:
+            for etapa, outro in bruto["etapas"].items():
+                histograma = self.etapas.setdefault(etapa, _novo_histograma())
+                histograma["n"] += outro["n"]
+                histograma["soma"] += outro["soma"]
+                histograma["max"] = max(histograma["max"], outro["max"])
+                histograma["buckets"] = [a + b for a, b in zip(histograma["buckets"], outro["buckets"])]
+            for url, outro in bruto["urls"].items():
+                por_url = self.urls.setdefault(url, {"n": 0, "soma": 0.0, "max": 0.0})
+                por_url["n"] += outro["n"]
+                por_url["soma"] += outro["soma"]
+                por_url["max"] = max(por_url["max"], outro["max"])
+            for etapa, quantidade in bruto["linhas"].items():
+                self.linhas[etapa] = self.linhas.get(etapa, 0) + quantidade
+            for nome, valor in bruto["contadores"].items():
+                self.contadores[nome] = self.contadores.get(nome, 0) + valor
+
+    def resumo(self):
+        """Resumo da execução: tempos por etapa, linhas/s, taxa de acerto do cache e latência por URL."""
+        bruto = self.capturar()
+        acertos = bruto["contadores"].get("cache_acertos", 0)
+        consultas = acertos + bruto["contadores"].get("cache_falhas", 0)
+        etapas = {}
+        for etapa, histograma in bruto["etapas"].items():
+            linhas = bruto["linhas"].get(etapa)
+            etapas[etapa] = {
+                "chamadas": histograma["n"],
+                "total_s": round(histograma["soma"], 4),
+                "media_s": round(histograma["soma"] / histograma["n"], 4) if histograma["n"] else 0.0,
+                "max_s": round(histograma["max"], 4),
+                "linhas": linhas,
+                "linhas_por_s": round(linhas / histograma["soma"], 1) if linhas and histograma["soma"] else None,
+                "histograma": dict(zip([*map(str, BUCKETS_SEGUNDOS), "+Inf"], histograma["buckets"])),
+            }
+        return {
+            "iniciado_em": datetime.fromtimestamp(self.iniciado_em).isoformat(timespec="seconds"),
+            "duracao_s": round(time.time() - self.iniciado_em, 2),
+            "etapas": etapas,
+            "linhas": bruto["linhas"],
+            "contadores": bruto["contadores"],
+            "cache_taxa_acerto": round(acertos / consultas, 4) if consultas else None,
+            "urls": {url: {"requisicoes": dados["n"], "media_s": round(dados["soma"] / dados["n"], 4),
+                           "max_s": round(dados["max"], 4)} for url, dados in bruto["urls"].items()},
+        }
+
+    def prometheus(self):
+        """Resumo no formato de texto do Prometheus."""
+        bruto = self.capturar()
+        linhas = ["# TYPE footballscience_etapa_segundos histogram"]
+        for etapa, histograma in bruto["etapas"].items():
+            acumulado = 0
+            for limite, quantidade in zip([*map(str, BUCKETS_SEGUNDOS), "+Inf"], histograma["buckets"]):
+                acumulado += quantidade
+                linhas.append(f'footballscience_etapa_segundos_bucket{{etapa="{etapa}",le="{limite}"}} {acumulado}')
+            linhas.append(f'footballscience_etapa_segundos_sum{{etapa="{etapa}"}} {histograma["soma"]:.6f}')
+            linhas.append(f'footballscience_etapa_segundos_count{{etapa="{etapa}"}} {histograma["n"]}')
+
+        linhas.append("# TYPE footballscience_url_segundos summary")
+        for url, dados in bruto["urls"].items():
+            rotulo = url.replace("\\", "\\\\").replace('"', '\\"')
+            linhas.append(f'footballscience_url_segundos_sum{{url="{rotulo}"}} {dados["soma"]:.6f}')
+            linhas.append(f'footballscience_url_segundos_count{{url="{rotulo}"}} {dados["n"]}')
+
+        linhas.append("# TYPE footballscience_linhas_total counter")
+        for etapa, quantidade in bruto["linhas"].items():
+            linhas.append(f'footballscience_linhas_total{{etapa="{etapa}"}} {quantidade}')
+
+        linhas.append("# TYPE footballscience_eventos_total counter")
+        for nome, valor in bruto["contadores"].items():
+            linhas.append(f'footballscience_eventos_total{{evento="{nome}"}} {valor}')
+
+        taxa = self.resumo()["cache_taxa_acerto"]
+        if taxa is not None:
+            linhas.append("# TYPE footballscience_cache_taxa_acerto gauge")
+            linhas.append(f"footballscience_cache_taxa_acerto {taxa}")
+        return "\n".join(linhas) + "\n"
+
+    def exportar(self, nome, diretorio=METRICAS_DIR):
+        """
+        Grava `<diretorio>/<nome>.json` e `<diretorio>/<nome>.prom` e imprime um resumo por etapa.
+        Retorna o caminho do JSON.
+        """
+        os.makedirs(diretorio, exist_ok=True)
+        resumo = self.resumo()
+        caminho_json = os.path.join(diretorio, f"{nome}.json")
+        with open(caminho_json, "w", encoding="utf-8") as arquivo:
+            json.dump(resumo, arquivo, ensure_ascii=False, indent=2)
+        with open(os.path.join(diretorio, f"{nome}.prom"), "w", encoding="utf-8") as arquivo:
+            arquivo.write(self.prometheus())
+
+        for etapa, dados in sorted(resumo["etapas"].items(), key=lambda item: -item[1]["total_s"]):
+            taxa = f", {dados['linhas_por_s']} linhas/s" if dados["linhas_por_s"] else ""
+            log("INFO", f"Métricas | {etapa:<34} {dados['total_s']:9.3f}s em {dados['chamadas']} chamada(s){taxa}")
+        if resumo["cache_taxa_acerto"] is not None:
+            log("INFO", f"Métricas | taxa de acerto do cache: {resumo['cache_taxa_acerto']:.1%}")
+        log("INFO", f"Métricas salvas em {caminho_json}")
+        return caminho_json
+
+_trava_metricas = threading.Lock()
+_metricas = None
+
+def metricas():
+    """Retorna o registro de métricas do processo."""
+    global _metricas
+    with _trava_metricas:
+        if _metricas is None:
+            _metricas = Metricas()
+        return _metricas
@@ -0,0 +1,281 @@
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv, find_dotenv
+
+try:
+    from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+except ImportError:  # Bibliotecas de modelos são opcionais: só os modelos instalados entram na avaliação
+    HistGradientBoostingRegressor = RandomForestRegressor = None
+try:
+    from xgboost import XGBRegressor
+except ImportError:
+    XGBRegressor = None
+try:
+    from lightgbm import LGBMRegressor
+except ImportError:
+    LGBMRegressor = None
+try:
+    from catboost import CatBoostRegressor
+except ImportError:
+    CatBoostRegressor = None
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from preprocessing.features_clubes import (
+    ARQUIVO_FEATURES_CLUBES, COLUNAS_FEATURES, processar_features, ler_metadados, carregar_features
+)
+from metricas import metricas, log
+
+# Carrega as variáveis de ambiente
+load_dotenv(find_dotenv())
+
+# Índices dos folds (JSON com os metadados; os índices ficam ao lado, em <nome>.i32)
+ARQUIVO_FOLDS = os.getenv("ARQUIVO_FOLDS", os.path.join("data", "features", "folds_avaliacao.json"))
+
+# Resultados da avaliação (uma linha por modelo × hiperparâmetros × fold)
+ARQUIVO_AVALIACAO = os.getenv("ARQUIVO_AVALIACAO", os.path.join("data", "modelos", "avaliacao_modelos.csv"))
+
+# Coluna prevista, quantidade de folds (as últimas temporadas, cada uma testada com as anteriores) e processos
+ALVO_AVALIACAO = os.getenv("ALVO_AVALIACAO", "Pontos")
+FOLDS_AVALIACAO = int(os.getenv("FOLDS_AVALIACAO", 5))
+PROCESSOS_AVALIACAO = int(os.getenv("PROCESSOS_AVALIACAO", os.cpu_count() or 1))
+
+# Desempenho da própria temporada (alvos possíveis) e features, que só usam temporadas anteriores
+INICIO_FEATURES = COLUNAS_FEATURES.index("Temporadas_Anteriores")
+COLUNAS_ALVO = COLUNAS_FEATURES[2:INICIO_FEATURES]
+COLUNAS_ENTRADA = COLUNAS_FEATURES[INICIO_FEATURES:]
+
+class Media:
+    """Referência mínima: prevê a média do alvo no treino."""
+
+    def fit(self, X, y):
+        self.media = float(np.mean(y))
+        return self
+
+    def predict(self, X):
+        return np.full(len(X), self.media)
+
+class RegressaoRidge:
+    """
+    Regressão linear com penalidade L2, em NumPy. Nulos são preenchidos com a média de treino
+    da coluna e as colunas são padronizadas antes do ajuste.
+    """
+
+    def __init__(self, alpha=1.0):
+        self.alpha = alpha
+
+    def _preparar(self, X):
+        X = np.where(np.isnan(X), self.medias, X)
+        return (X - self.medias) / self.escalas
+
+    def fit(self, X, y):
+        with np.errstate(all="ignore"):
+            self.medias = np.nan_to_num(np.nanmean(X, axis=0))
+        desvios = np.where(np.isnan(X), self.medias, X).std(axis=0)
+        self.escalas = np.where(desvios > 0, desvios, 1.0)
+        Z = self._preparar(X)
+        self.intercepto = float(np.mean(y))
+        self.coeficientes = np.linalg.solve(Z.T @ Z + self.alpha * np.eye(Z.shape[1]), Z.T @ (y - self.intercepto))
+        return self
+
+    def predict(self, X):
+        return self._preparar(X) @ self.coeficientes + self.intercepto
+
+def modelos_disponiveis():
+    """{nome: (classe, grade de hiperparâmetros)} com os modelos cujas bibliotecas estão instaladas."""
+    # n_jobs/thread_count = 1: o paralelismo é entre tarefas, um processo por tarefa
+    modelos = {
+        "media": (Media, [{}]),
+        "ridge": (RegressaoRidge, [{"alpha": alpha} for alpha in (0.1, 1.0, 10.0, 100.0)]),
+    }
+    if HistGradientBoostingRegressor is not None:
+        modelos["sklearn_hgb"] = (HistGradientBoostingRegressor, [
+            {"max_depth": profundidade, "learning_rate": 0.05, "max_iter": 300, "random_state": 0}
+            for profundidade in (3, 6)])
+        modelos["sklearn_rf"] = (RandomForestRegressor, [
+            {"n_estimators": 300, "min_samples_leaf": folha, "n_jobs": 1, "random_state": 0} for folha in (1, 5)])
+    if XGBRegressor is not None:
+        modelos["xgboost"] = (XGBRegressor, [
+            {"n_estimators": 300, "max_depth": profundidade, "learning_rate": 0.05, "n_jobs": 1, "random_state": 0}
+            for profundidade in (3, 6)])
+    if LGBMRegressor is not None:
+        modelos["lightgbm"] = (LGBMRegressor, [
+            {"n_estimators": 300, "num_leaves": folhas, "learning_rate": 0.05, "n_jobs": 1, "verbose": -1,
+             "random_state": 0} for folhas in (15, 31)])
+    if CatBoostRegressor is not None:
+        modelos["catboost"] = (CatBoostRegressor, [
+            {"iterations": 300, "depth": profundidade, "learning_rate": 0.05, "thread_count": 1, "verbose": 0,
+             "random_seed": 0} for profundidade in (4, 6)])
+    return modelos
+
+def _caminho_indices(caminho):
+    return os.path.splitext(caminho)[0] + ".i32"
+
+def montar_folds(anos, quantidade=FOLDS_AVALIACAO):
+    """
+    Folds temporais: cada uma das últimas `quantidade` temporadas é o teste de um fold, treinado com
+    todas as temporadas anteriores (o modelo nunca vê temporadas posteriores à que prevê).
+    Retorna [(ano, posições de treino, posições de teste)].
+    """
+    temporadas = np.unique(anos)[1:]  # A primeira temporada não tem treino anterior
+    return [(int(ano), np.flatnonzero(anos < ano), np.flatnonzero(anos == ano)) for ano in temporadas[-quantidade:]]
+
+def gravar_folds(folds, chave, caminho=ARQUIVO_FOLDS):
+    """Grava os índices de todos os folds em um único arquivo int32 e as faixas de cada fold no JSON."""
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    faixas, inicio = [], 0
+    with open(_caminho_indices(caminho), "wb") as arquivo:
+        for ano, treino, teste in folds:
+            arquivo.write(treino.astype(np.int32).tobytes())
+            arquivo.write(teste.astype(np.int32).tobytes())
+            faixas.append({"ano": ano, "treino": [inicio, inicio + len(treino)],
+                           "teste": [inicio + len(treino), inicio + len(treino) + len(teste)]})
+            inicio += len(treino) + len(teste)
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump({"chave": chave, "total": inicio, "folds": faixas}, arquivo, indent=2)
+
+def carregar_folds(caminho=ARQUIVO_FOLDS):
+    """Folds mapeados em memória: [(ano, posições de treino, posições de teste)], com fatias do mesmo arquivo."""
+    with open(caminho, encoding="utf-8") as arquivo:
+        metadados = json.load(arquivo)
+    indices = np.memmap(_caminho_indices(caminho), dtype=np.int32, mode="r", shape=(metadados["total"],))
+    return [(fold["ano"], indices[slice(*fold["treino"])], indices[slice(*fold["teste"])])
+            for fold in metadados["folds"]]
+
+def preparar_dados(quantidade_folds=FOLDS_AVALIACAO, caminho_features=ARQUIVO_FEATURES_CLUBES,
+                   caminho_folds=ARQUIVO_FOLDS, forcar=False):
+    """
+    Atualiza a matriz de features (só as temporadas novas, ver features_clubes) e os folds. Os folds são
+    refeitos apenas se a matriz ou a quantidade de folds mudou. Retorna a quantidade de folds.
+    """
+    processar_features(forcar, caminho_features)
+    metadados = ler_metadados(caminho_features)
+    chave = f"{metadados['hash_historico']}:{metadados['linhas']}:{quantidade_folds}"
+
+    folds_atuais = None
+    if os.path.exists(caminho_folds) and os.path.exists(_caminho_indices(caminho_folds)):
+        with open(caminho_folds, encoding="utf-8") as arquivo:
+            folds_atuais = json.load(arquivo)
+    if folds_atuais is not None and folds_atuais["chave"] == chave:
+        return len(folds_atuais["folds"])
+
+    matriz, colunas = carregar_features(caminho_features)
+    folds = montar_folds(np.asarray(matriz[:, colunas.index("Ano")]), quantidade_folds)
+    gravar_folds(folds, chave, caminho_folds)
+    log("INFO", f"{len(folds)} fold(s) gravado(s) em {caminho_folds}")
+    return len(folds)
+
+# Dados do processo (abertos uma vez por worker): matriz e folds mapeados em memória, somente leitura
+_dados = {}
+
+def _abrir_dados(caminho_features, caminho_folds, alvo):
+    matriz, colunas = carregar_features(caminho_features)
+    _dados.update(matriz=matriz, folds=carregar_folds(caminho_folds),
+                  entrada=[colunas.index(coluna) for coluna in COLUNAS_ENTRADA], alvo=colunas.index(alvo))
+
+def _avaliar_tarefa(nome, parametros, fold):
+    """Ajusta um modelo em um fold e mede o ajuste, a predição e os erros no teste."""
+    classe = modelos_disponiveis()[nome][0]
+    matriz, entrada, alvo = _dados["matriz"], _dados["entrada"], _dados["alvo"]
+    ano, treino, teste = _dados["folds"][fold]
+
+    # Só as linhas do fold são copiadas para a memória do processo; linhas sem alvo ficam de fora
+    X_treino, y_treino = matriz[treino][:, entrada].astype(np.float64), matriz[treino, alvo].astype(np.float64)
+    X_teste, y_teste = matriz[teste][:, entrada].astype(np.float64), matriz[teste, alvo].astype(np.float64)
+    validas_treino, validas_teste = ~np.isnan(y_treino), ~np.isnan(y_teste)
+    X_treino, y_treino = X_treino[validas_treino], y_treino[validas_treino]
+    X_teste, y_teste = X_teste[validas_teste], y_teste[validas_teste]
+
+    inicio = time.perf_counter()
+    modelo = classe(**parametros).fit(X_treino, y_treino)
+    ajuste = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    previsto = np.asarray(modelo.predict(X_teste), dtype=np.float64)
+    predicao = time.perf_counter() - inicio
+
+    erros = previsto - y_teste
+    variancia = np.sum((y_teste - y_teste.mean()) ** 2)
+    return {
+        "Modelo": nome,
+        "Parametros": json.dumps(parametros, sort_keys=True),
+        "Ano_Teste": ano,
+        "Linhas_Treino": len(y_treino),
+        "Linhas_Teste": len(y_teste),
+        "MAE": float(np.mean(np.abs(erros))),
+        "RMSE": float(np.sqrt(np.mean(erros ** 2))),
+        "R2": float(1 - np.sum(erros ** 2) / variancia) if variancia > 0 else np.nan,
+        "Ajuste_s": ajuste,
+        "Predicao_s": predicao,
+        "Latencia_us_Linha": predicao / max(len(y_teste), 1) * 1e6,
+    }
+
+def avaliar_modelos(nomes=None, alvo=ALVO_AVALIACAO, quantidade_folds=FOLDS_AVALIACAO, processos=PROCESSOS_AVALIACAO,
+                    caminho_features=ARQUIVO_FEATURES_CLUBES, caminho_folds=ARQUIVO_FOLDS, forcar=False):
+    """
+    Avalia cada modelo × hiperparâmetros × fold em um pool de processos. Cada worker abre a matriz de
+    features e os folds mapeados em memória (as páginas são compartilhadas pelo sistema operacional)
+    e recebe só o nome do modelo, os hiperparâmetros e o número do fold.
+    Retorna um DataFrame com uma linha por tarefa: métricas, tempo de ajuste e latência de predição.
+    """
+    if alvo not in COLUNAS_ALVO:
+        raise ValueError(f"[ERRO] Alvo inválido: {alvo} (opções: {', '.join(COLUNAS_ALVO)})")
+    disponiveis = modelos_disponiveis()
+    nomes = nomes or list(disponiveis)
+    ausentes = [nome for nome in nomes if nome not in disponiveis]
+    if ausentes:
+        raise ValueError(f"[ERRO] Modelo(s) indisponível(is): {', '.join(ausentes)} (instalados: {', '.join(disponiveis)})")
+
+    with metricas().cronometro("preparacao"):
+        folds = preparar_dados(quantidade_folds, caminho_features, caminho_folds, forcar)
+    if not folds:
+        raise ValueError("[ERRO] São necessárias ao menos duas temporadas para montar os folds.")
+
+    tarefas = [(nome, parametros, fold) for nome in nomes for parametros in disponiveis[nome][1] for fold in range(folds)]
+    log("INFO", f"Avaliando {len(tarefas)} tarefa(s) ({len(nomes)} modelo(s), {folds} fold(s)) em {processos} processo(s).")
+
+    argumentos = (caminho_features, caminho_folds, alvo)
+    with metricas().cronometro("avaliacao"):
+        if processos > 1:
+            with ProcessPoolExecutor(max_workers=processos, initializer=_abrir_dados, initargs=argumentos) as executor:
+                resultados = list(executor.map(_avaliar_tarefa, *zip(*tarefas)))
+        else:
+            _abrir_dados(*argumentos)
+            resultados = [_avaliar_tarefa(*tarefa) for tarefa in tarefas]
+
+    for resultado in resultados:
+        metricas().registrar_tempo(f"ajuste/{resultado['Modelo']}", resultado["Ajuste_s"])
+        metricas().registrar_tempo(f"predicao/{resultado['Modelo']}", resultado["Predicao_s"])
+    metricas().contar_linhas("avaliacao", len(resultados))
+    return pd.DataFrame(resultados)
+
+def resumir(resultados):
+    """Média dos folds por modelo e hiperparâmetros, do menor para o maior MAE."""
+    colunas = ["MAE", "RMSE", "R2", "Ajuste_s", "Latencia_us_Linha"]
+    return (resultados.groupby(["Modelo", "Parametros"], sort=False)[colunas].mean()
+            .sort_values("MAE").reset_index())
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Avalia modelos de previsão do desempenho dos clubes com validação temporal.")
+    parser.add_argument("--modelos", nargs="+", choices=list(modelos_disponiveis()),
+                        help="Modelos avaliados (padrão: todos os instalados)")
+    parser.add_argument("--alvo", choices=COLUNAS_ALVO, default=ALVO_AVALIACAO)
+    parser.add_argument("--folds", type=int, default=FOLDS_AVALIACAO, help="Últimas temporadas usadas como teste")
+    parser.add_argument("--processos", type=int, default=PROCESSOS_AVALIACAO)
+    parser.add_argument("--forcar", action="store_true", help="Recalcula a matriz de features inteira")
+    parser.add_argument("--saida", default=ARQUIVO_AVALIACAO, help="CSV com os resultados por fold")
+    args = parser.parse_args()
+
+    resultados = avaliar_modelos(args.modelos, args.alvo, args.folds, args.processos, forcar=args.forcar)
+    os.makedirs(os.path.dirname(args.saida) or ".", exist_ok=True)
+    resultados.to_csv(args.saida, sep=";", index=False, encoding="utf-8")
+
+    with pd.option_context("display.width", 200, "display.max_columns", None, "display.max_colwidth", 60):
+        print(resumir(resultados).round(4))
+    log("INFO", f"Resultados salvos em {args.saida}")
+    metricas().exportar("avaliacao_modelos")
@@ -0,0 +1,173 @@
+import os
+import sys
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv, find_dotenv
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from metricas import metricas, log
+
+# Carrega as variáveis de ambiente
+load_dotenv(find_dotenv())
+
+# Temporadas anteriores usadas para estimar a força de cada clube
+JANELA_FORCA = int(os.getenv("JANELA_FORCA", 3))
+
+# Peso, em jogos, do aproveitamento de referência (o dos clubes rebaixados) somado ao histórico de cada clube:
+# suaviza históricos curtos e dá aos clubes sem histórico recente (promovidos) a força de um rebaixado
+JOGOS_PRIORI = float(os.getenv("JOGOS_PRIORI", 19))
+
+# Vantagem do mandante, em log-odds da vitória
+VANTAGEM_MANDO = float(os.getenv("VANTAGEM_MANDO", 0.35))
+
+# Simulação: temporadas sorteadas, temporadas por lote (limita a memória) e processos
+TEMPORADAS_SIMULADAS = int(os.getenv("TEMPORADAS_SIMULADAS", 100_000))
+TAMANHO_LOTE_SIMULACAO = int(os.getenv("TAMANHO_LOTE_SIMULACAO", 20_000))
+PROCESSOS_SIMULACAO = int(os.getenv("PROCESSOS_SIMULACAO", 1))
+SEMENTE_SIMULACAO = int(os.getenv("SEMENTE_SIMULACAO", 42))
+
+# CSV com a projeção (opcional)
+ARQUIVO_PROJECAO = os.getenv("ARQUIVO_PROJECAO")
+
+# Mesmos cortes de tratamento_clubes: vaga internacional até a 12ª posição, rebaixamento a partir da 17ª
+POSICAO_INTERNACIONAL = 12
+POSICAO_REBAIXAMENTO = 17
+
+def forcas_clubes(df_brasileirao, clubes, ano, janela=JANELA_FORCA, jogos_priori=JOGOS_PRIORI):
+    """
+    Aproveitamento esperado (fração dos pontos disputados) de cada clube de `clubes` em `ano`, a partir
+    das `janela` temporadas anteriores, suavizado pelo aproveitamento médio dos rebaixados nessas temporadas.
+    Retorna (Series de aproveitamento indexada por clube, taxa de empates do período).
+    """
+    historico = df_brasileirao[(df_brasileirao["Ano"] < ano) & (df_brasileirao["Ano"] >= ano - janela)]
+    if historico.empty:
+        raise ValueError(f"[ERRO] Sem temporadas anteriores a {ano} para estimar a força dos clubes.")
+
+    rebaixados = historico[historico["Posição"] >= POSICAO_REBAIXAMENTO]
+    referencia = rebaixados if len(rebaixados) else historico
+    priori = referencia["Pontos"].sum() / (3 * referencia["Jogos"].sum())
+
+    por_clube = historico.groupby("Clube", observed=True)[["Pontos", "Jogos"]].sum().reindex(clubes, fill_value=0)
+    aproveitamento = (por_clube["Pontos"] + 3 * jogos_priori * priori) / (3 * (por_clube["Jogos"] + jogos_priori))
+    taxa_empate = historico["Empates"].sum() / historico["Jogos"].sum()
+    return aproveitamento.clip(0.01, 0.99), float(taxa_empate)
+
+def probabilidades_jogos(aproveitamento, taxa_empate, vantagem_mando=VANTAGEM_MANDO):
+    """
+    Tabela de jogos de turno e returno (cada par de clubes se enfrenta uma vez em cada mando) e, para cada jogo,
+    os limiares de um sorteio uniforme: abaixo de `vitoria` vence o mandante, abaixo de `empate` empata.
+    A chance de vitória vem da diferença de força (logit do aproveitamento) mais a vantagem do mando;
+    a de empate é a taxa histórica.
+    """
+    forca = np.log(aproveitamento / (1 - aproveitamento))
+    n = len(forca)
+    mandantes, visitantes = np.nonzero(~np.eye(n, dtype=bool))
+    diferenca = forca[mandantes] - forca[visitantes] + vantagem_mando
+    vitoria = (1 - taxa_empate) / (1 + np.exp(-diferenca))
+    return mandantes, visitantes, vitoria.astype(np.float32), (vitoria + taxa_empate).astype(np.float32)
+
+def simular_lote(mandantes, visitantes, limiar_vitoria, limiar_empate, quantidade, semente):
+    """
+    Simula `quantidade` temporadas de uma vez: um sorteio por jogo e temporada, pontos e vitórias
+    somados por produto de matrizes e classificação por pontos, vitórias e sorteio (demais critérios).
+    Retorna (contagem[clube, posição - 1], soma dos pontos de cada clube).
+    """
+    rng = np.random.default_rng(semente)
+    n = int(max(mandantes.max(), visitantes.max())) + 1
+    jogos = np.arange(len(mandantes))
+    em_casa = np.zeros((len(jogos), n), dtype=np.float32)
+    fora = np.zeros((len(jogos), n), dtype=np.float32)
+    em_casa[jogos, mandantes] = 1
+    fora[jogos, visitantes] = 1
+
+    sorteio = rng.random((quantidade, len(jogos)), dtype=np.float32)
+    vitoria_mandante = (sorteio < limiar_vitoria).astype(np.float32)
+    vitoria_visitante = (sorteio >= limiar_empate).astype(np.float32)
+    empate = 1 - vitoria_mandante - vitoria_visitante
+    del sorteio
+
+    vitorias = vitoria_mandante @ em_casa + vitoria_visitante @ fora
+    pontos = 3 * vitorias + empate @ (em_casa + fora)
+
+    chave = pontos.astype(np.float64) * 100 + vitorias + rng.random((quantidade, n))
+    classificacao = np.argsort(-chave, axis=1)  # classificacao[s, k]: clube na posição k + 1
+    contagem = np.bincount((classificacao * n + np.arange(n)).ravel(), minlength=n * n).reshape(n, n)
+    return contagem, pontos.sum(axis=0, dtype=np.float64)
+
+def simular_temporadas(mandantes, visitantes, limiar_vitoria, limiar_empate, temporadas=TEMPORADAS_SIMULADAS,
+                       semente=SEMENTE_SIMULACAO, lote=TAMANHO_LOTE_SIMULACAO, processos=PROCESSOS_SIMULACAO):
+    """
+    Simula `temporadas` em lotes de até `lote`, cada um com seu próprio gerador derivado de `semente`:
+    o resultado depende só da semente e do tamanho do lote, e não da quantidade de processos.
+    Retorna (contagem[clube, posição - 1], soma dos pontos de cada clube).
+    """
+    tamanhos = [min(lote, temporadas - inicio) for inicio in range(0, temporadas, lote)]
+    sementes = np.random.SeedSequence(semente).spawn(len(tamanhos))
+    argumentos = [(mandantes, visitantes, limiar_vitoria, limiar_empate, tamanho, semente_lote)
+                  for tamanho, semente_lote in zip(tamanhos, sementes)]
+
+    if processos > 1 and len(argumentos) > 1:
+        with ProcessPoolExecutor(max_workers=min(processos, len(argumentos))) as executor:
+            resultados = list(executor.map(simular_lote, *zip(*argumentos)))
+    else:
+        resultados = [simular_lote(*args) for args in argumentos]
+
+    contagem = sum(resultado[0] for resultado in resultados)
+    pontos = sum(resultado[1] for resultado in resultados)
+    return contagem, pontos
+
+def projetar_temporada(df_brasileirao, ano=None, temporadas=TEMPORADAS_SIMULADAS, semente=SEMENTE_SIMULACAO,
+                       lote=TAMANHO_LOTE_SIMULACAO, processos=PROCESSOS_SIMULACAO):
+    """
+    Projeta a classificação final de `ano` (padrão: a última temporada dos dados) para os clubes que a disputam,
+    com força estimada pelas temporadas anteriores. Retorna um DataFrame indexado por clube com a probabilidade
+    de cada posição (Pos_1 ... Pos_N), de título, de vaga internacional e de rebaixamento e os pontos médios.
+    """
+    ano = int(df_brasileirao["Ano"].max()) if ano is None else ano
+    clubes = df_brasileirao.loc[df_brasileirao["Ano"] == ano, "Clube"].astype(str).drop_duplicates().tolist()
+    if len(clubes) < 2:
+        raise ValueError(f"[ERRO] A temporada {ano} não tem clubes suficientes nos dados do Brasileirão.")
+
+    aproveitamento, taxa_empate = forcas_clubes(df_brasileirao.assign(Clube=df_brasileirao["Clube"].astype(str)),
+                                                clubes, ano)
+    jogos = probabilidades_jogos(aproveitamento.to_numpy(), taxa_empate)
+
+    with metricas().cronometro("simulacao"):
+        contagem, pontos = simular_temporadas(*jogos, temporadas=temporadas, semente=semente, lote=lote,
+                                              processos=processos)
+    metricas().contar_linhas("simulacao", temporadas)
+
+    n = len(clubes)
+    probabilidades = contagem / temporadas
+    projecao = pd.DataFrame(probabilidades, index=pd.Index(clubes, name="Clube"),
+                            columns=[f"Pos_{pos}" for pos in range(1, n + 1)])
+    projecao.insert(0, "Aproveitamento_Esperado", aproveitamento.round(4).to_numpy())
+    projecao.insert(1, "Pontos_Medios", (pontos / temporadas).round(2))
+    projecao.insert(2, "Titulo", probabilidades[:, 0])
+    projecao.insert(3, "Internacional", probabilidades[:, :min(POSICAO_INTERNACIONAL, n)].sum(axis=1))
+    projecao.insert(4, "Rebaixamento", probabilidades[:, POSICAO_REBAIXAMENTO - 1:].sum(axis=1))
+    return projecao.sort_values("Pontos_Medios", ascending=False)
+
+if __name__ == "__main__":
+    from dados import carregar
+
+    parser = argparse.ArgumentParser(description="Projeta a classificação final do Brasileirão por simulação de Monte Carlo.")
+    parser.add_argument("--ano", type=int, help="Temporada projetada (padrão: a última dos dados)")
+    parser.add_argument("--temporadas", type=int, default=TEMPORADAS_SIMULADAS, help="Temporadas simuladas")
+    parser.add_argument("--semente", type=int, default=SEMENTE_SIMULACAO)
+    parser.add_argument("--lote", type=int, default=TAMANHO_LOTE_SIMULACAO, help="Temporadas simuladas por lote")
+    parser.add_argument("--processos", type=int, default=PROCESSOS_SIMULACAO)
+    parser.add_argument("--saida", default=ARQUIVO_PROJECAO, help="CSV de saída (opcional)")
+    args = parser.parse_args()
+
+    projecao = projetar_temporada(carregar("brasileirao"), args.ano, args.temporadas, args.semente,
+                                  args.lote, args.processos)
+    with pd.option_context("display.width", 200, "display.max_columns", 8):
+        print(projecao[["Aproveitamento_Esperado", "Pontos_Medios", "Titulo", "Internacional", "Rebaixamento"]])
+
+    if args.saida:
+        projecao.to_csv(args.saida, sep=";", encoding="utf-8")
+        log("INFO", f"Projeção salva em {args.saida}")
+    metricas().exportar("projecao_temporada")
@@ -0,0 +1,260 @@
+import os
+import sys
+import json
+import hashlib
+import argparse
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv, find_dotenv
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from preprocessing.indice_clubes import carregar_indice
+from metricas import metricas, log
+
+# Carrega as variáveis de ambiente
+load_dotenv(find_dotenv())
+
+# Configuração dos arquivos
+ARQUIVO_BRASILEIRAO_PROCESSED = os.getenv("ARQUIVO_BRASILEIRAO_PROCESSED")
+ARQUIVO_TRANSFERENCIAS_PROCESSED = os.getenv("ARQUIVO_TRANSFERENCIAS_PROCESSED")
+
+# Metadados da matriz de features (JSON); os valores ficam ao lado, em <nome>.f32 (float32, linha a linha)
+ARQUIVO_FEATURES_CLUBES = os.getenv("ARQUIVO_FEATURES_CLUBES", os.path.join("data", "features", "features_clubes.json"))
+
+# Janelas (em participações na Série A) das médias móveis de desempenho e (em anos) dos saldos de transferências
+JANELAS_DESEMPENHO = (3, 5)
+JANELA_TRANSFERENCIAS = 3
+
+# Colunas da matriz, na ordem em que são gravadas. Desempenho da temporada (alvos possíveis) e
+# features que só usam temporadas anteriores, para que o modelo não veja o resultado que vai prever.
+COLUNAS_FEATURES = [
+    "Clube_ID", "Ano",
+    "Posição", "Pontos", "Jogos", "Vitórias", "Empates", "Derrotas", "GP", "GC", "SG", "Aproveitamento",
+    "Temporadas_Anteriores", "Anos_Desde_Anterior",
+    "Pontos_Anterior", "Posicao_Anterior", "SG_Anterior",
+    *[f"Pontos_Media_{janela}" for janela in JANELAS_DESEMPENHO],
+    *[f"Posicao_Media_{janela}" for janela in JANELAS_DESEMPENHO],
+    "Posicao_Tendencia",
+    "Compras_Ano", "Vendas_Ano", "Saldo_Ano",
+    f"Compras_{JANELA_TRANSFERENCIAS}_Anos", f"Vendas_{JANELA_TRANSFERENCIAS}_Anos", f"Saldo_{JANELA_TRANSFERENCIAS}_Anos",
+]
+
+# Ordem das linhas da matriz: por temporada e, dentro dela, por clube. Temporadas novas vão para o fim
+# do arquivo, então anexar dá a mesma matriz que recalcular tudo.
+ORDEM_LINHAS = ["Ano", "Clube_ID"]
+
+def _caminho_dados(caminho):
+    return os.path.splitext(caminho)[0] + ".f32"
+
+def _media_movel(valores, grupos, janela):
+    """Média móvel por grupo (groupby-rolling), alinhada às linhas de `valores`."""
+    return valores.groupby(grupos).rolling(janela, min_periods=1).mean().reset_index(level=0, drop=True)
+
+def preparar_brasileirao(df_brasileirao):
+    """Linhas do Brasileirão com clube identificado, ordenadas por clube e temporada."""
+    df = df_brasileirao.copy()
+    if "Clube_ID" not in df.columns:  # CSV tratado antes do índice de clubes
+        df["Clube_ID"] = carregar_indice().resolver(df["Clube"])
+    df["Clube_ID"] = pd.to_numeric(df["Clube_ID"])
+    sem_id = df["Clube_ID"].isna().sum()
+    if sem_id:
+        log("ALERTA", f"{sem_id} linha(s) do Brasileirão sem clube identificado ficaram fora das features.")
+    df = df[df["Clube_ID"].notna()].astype({"Clube_ID": "int64", "Ano": "int64"})
+    return df.sort_values(["Clube_ID", "Ano"], kind="mergesort").reset_index(drop=True)
+
+def preparar_transferencias(df_transferencias):
+    """Valores de transferências somados por clube, ano e tipo (Entrada/Saída)."""
+    df = df_transferencias.assign(Clube_ID=pd.to_numeric(df_transferencias["Clube_ID"], errors="coerce"),
+                                  Ano=pd.to_numeric(df_transferencias["Ano"], errors="coerce"))
+    df = df.dropna(subset=["Clube_ID", "Ano"]).astype({"Clube_ID": "int64", "Ano": "int64"})
+    return df.groupby(["Clube_ID", "Ano", "Tipo"])["Valor"].sum().unstack("Tipo", fill_value=0.0)
+
+def recortar_historico(df_brasileirao, df_transferencias, primeiro_ano):
+    """
+    Reduz os dados ao necessário para calcular as features das temporadas a partir de `primeiro_ano`:
+    as últimas participações de cada clube antes dele (a maior janela) e os anos de transferências da janela.
+    Retorna (brasileirão, transferências, participações anteriores descartadas por clube).
+    """
+    anteriores = df_brasileirao[df_brasileirao["Ano"] < primeiro_ano]
+    mantidas = anteriores.groupby("Clube_ID").tail(max(JANELAS_DESEMPENHO))
+    descartadas = anteriores.groupby("Clube_ID").size().sub(mantidas.groupby("Clube_ID").size(), fill_value=0)
+    recortado = pd.concat([mantidas, df_brasileirao[df_brasileirao["Ano"] >= primeiro_ano]])
+    recortado = recortado.sort_values(["Clube_ID", "Ano"], kind="mergesort").reset_index(drop=True)
+    anos = df_transferencias.index.get_level_values("Ano")
+    return recortado, df_transferencias[anos > primeiro_ano - JANELA_TRANSFERENCIAS], descartadas
+
+def calcular_features(df_brasileirao, valores_transferencias, descartadas=None):
+    """
+    Monta a matriz (clube × temporada) a partir do Brasileirão preparado e das transferências agregadas.
+    As janelas são calculadas com groupby-rolling sobre todas as linhas de uma vez.
+    `descartadas` (participações anteriores fora de `df_brasileirao`, por clube) corrige a contagem
+    de temporadas anteriores quando o histórico foi recortado.
+    Retorna um DataFrame com as colunas de COLUNAS_FEATURES, com as linhas na ordem de ORDEM_LINHAS.
+    """
+    df = df_brasileirao
+    clubes = df["Clube_ID"]
+    por_clube = df.groupby("Clube_ID", sort=False)
+
+    features = pd.DataFrame({
+        "Clube_ID": clubes, "Ano": df["Ano"],
+        "Posição": df["Posição"], "Pontos": df["Pontos"], "Jogos": df["Jogos"],
+        "Vitórias": df["Vitórias"], "Empates": df["Empates"], "Derrotas": df["Derrotas"],
+        "GP": df["GP"], "GC": df["GC"], "SG": df["SG"],
+        "Aproveitamento": (df["Pontos"] / (df["Jogos"] * 3)).where(df["Jogos"] > 0),
+    })
+    anteriores = por_clube.cumcount()
+    if descartadas is not None:
+        anteriores = anteriores + clubes.map(descartadas).fillna(0).astype("int64")
+    features["Temporadas_Anteriores"] = anteriores
+    features["Anos_Desde_Anterior"] = df["Ano"] - por_clube["Ano"].shift()
+
+    # Desempenho das temporadas anteriores: desloca uma participação e aplica as janelas
+    pontos_anteriores = por_clube["Pontos"].shift()
+    posicoes_anteriores = por_clube["Posição"].shift()
+    features["Pontos_Anterior"] = pontos_anteriores
+    features["Posicao_Anterior"] = posicoes_anteriores
+    features["SG_Anterior"] = por_clube["SG"].shift()
+    for janela in JANELAS_DESEMPENHO:
+        features[f"Pontos_Media_{janela}"] = _media_movel(pontos_anteriores, clubes, janela)
+    for janela in JANELAS_DESEMPENHO:
+        features[f"Posicao_Media_{janela}"] = _media_movel(posicoes_anteriores, clubes, janela)
+    # Negativa quando a última posição foi melhor que a média recente (clube em ascensão)
+    features["Posicao_Tendencia"] = posicoes_anteriores - features[f"Posicao_Media_{JANELAS_DESEMPENHO[0]}"]
+
+    # Transferências por ano civil, com a janela sobre uma grade densa de anos de cada clube
+    compras, vendas = _transferencias_por_ano(valores_transferencias, df)
+    features["Compras_Ano"] = compras["Ano"]
+    features["Vendas_Ano"] = vendas["Ano"]
+    features["Saldo_Ano"] = vendas["Ano"] - compras["Ano"]
+    features[f"Compras_{JANELA_TRANSFERENCIAS}_Anos"] = compras["Janela"]
+    features[f"Vendas_{JANELA_TRANSFERENCIAS}_Anos"] = vendas["Janela"]
+    features[f"Saldo_{JANELA_TRANSFERENCIAS}_Anos"] = vendas["Janela"] - compras["Janela"]
+    return features.sort_values(ORDEM_LINHAS, kind="mergesort")[COLUNAS_FEATURES].reset_index(drop=True)
+
+def _transferencias_por_ano(valores, df):
+    """Para cada linha de `df`, compras e vendas do ano e da janela de anos terminando nele."""
+    chaves = pd.MultiIndex.from_arrays([df["Clube_ID"], df["Ano"]])
+    resultado = []
+    for tipo in ("Entrada", "Saída"):
+        serie = valores[tipo] if tipo in valores.columns else pd.Series(0.0, index=valores.index)
+        if serie.empty:
+            resultado.append({"Ano": np.zeros(len(df)), "Janela": np.zeros(len(df))})
+            continue
+        anos = serie.index.get_level_values("Ano")
+        primeiro = min(anos.min(), df["Ano"].min()) - JANELA_TRANSFERENCIAS
+        grade = pd.MultiIndex.from_product([serie.index.get_level_values("Clube_ID").unique(),
+                                            range(primeiro, max(anos.max(), df["Ano"].max()) + 1)],
+                                           names=["Clube_ID", "Ano"])
+        densa = serie.reindex(grade, fill_value=0.0)
+        janela = densa.groupby(level="Clube_ID").rolling(JANELA_TRANSFERENCIAS, min_periods=1).sum()
+        janela = janela.reset_index(level=0, drop=True)
+        resultado.append({"Ano": densa.reindex(chaves, fill_value=0.0).to_numpy(),
+                          "Janela": janela.reindex(chaves, fill_value=0.0).to_numpy()})
+    return resultado
+
+def hash_historico(df_brasileirao, valores_transferencias, ultimo_ano):
+    """Hash dos dados de origem até `ultimo_ano`: se mudar, as linhas já gravadas estão desatualizadas."""
+    sha = hashlib.sha256()
+    brasileirao = df_brasileirao[df_brasileirao["Ano"] <= ultimo_ano]
+    transferencias = valores_transferencias[valores_transferencias.index.get_level_values("Ano") <= ultimo_ano]
+    sha.update(pd.util.hash_pandas_object(brasileirao.drop(columns=["ID"], errors="ignore"), index=False).to_numpy().tobytes())
+    sha.update(pd.util.hash_pandas_object(transferencias.reset_index(), index=False).to_numpy().tobytes())
+    return sha.hexdigest()
+
+def ler_metadados(caminho=ARQUIVO_FEATURES_CLUBES):
+    if not os.path.exists(caminho) or not os.path.exists(_caminho_dados(caminho)):
+        return None
+    with open(caminho, encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+def _gravar_metadados(metadados, caminho):
+    temporario = f"{caminho}.tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        json.dump(metadados, arquivo, ensure_ascii=False, indent=2)
+    os.replace(temporario, caminho)
+
+def gravar_linhas(features, caminho=ARQUIVO_FEATURES_CLUBES, anexar=False, linhas_gravadas=0):
+    """
+    Grava as linhas no arquivo de dados (float32, linha a linha). Com `anexar`, as linhas vão para o fim
+    do arquivo, depois de descartar o que exceder `linhas_gravadas` (resto de uma gravação interrompida).
+    """
+    dados = _caminho_dados(caminho)
+    os.makedirs(os.path.dirname(dados) or ".", exist_ok=True)
+    valores = np.ascontiguousarray(features[COLUNAS_FEATURES].to_numpy(dtype=np.float32, na_value=np.nan))
+    with open(dados, "r+b" if anexar else "wb") as arquivo:
+        if anexar:
+            arquivo.truncate(linhas_gravadas * len(COLUNAS_FEATURES) * 4)
+            arquivo.seek(0, os.SEEK_END)
+        arquivo.write(valores.tobytes())
+
+def atualizar_features(df_brasileirao, df_transferencias, caminho=ARQUIVO_FEATURES_CLUBES, forcar=False):
+    """
+    Atualiza a matriz persistida em `caminho`. Temporadas novas (posteriores às já gravadas) são
+    calculadas com o histórico mínimo necessário e anexadas; se os dados de temporadas já gravadas
+    mudaram (ou com `forcar`), a matriz é recalculada inteira.
+    Retorna o número de linhas acrescentadas ou regravadas.
+    """
+    brasileirao = preparar_brasileirao(df_brasileirao)
+    valores = preparar_transferencias(df_transferencias)
+    anos = sorted(brasileirao["Ano"].unique().tolist())
+    metadados = None if forcar else ler_metadados(caminho)
+
+    incremental = (
+        metadados is not None
+        and metadados["colunas"] == COLUNAS_FEATURES
+        and metadados.get("ordem") == ORDEM_LINHAS
+        and metadados["anos"]
+        and metadados["hash_historico"] == hash_historico(brasileirao, valores, max(metadados["anos"]))
+    )
+    if incremental:
+        novos = [ano for ano in anos if ano > max(metadados["anos"])]
+        if not novos:
+            log("INFO", "Matriz de features já atualizada.")
+            return 0
+        recorte, valores_recorte, descartadas = recortar_historico(brasileirao, valores, novos[0])
+        features = calcular_features(recorte, valores_recorte, descartadas)
+        features = features[features["Ano"] >= novos[0]]
+        gravar_linhas(features, caminho, anexar=True, linhas_gravadas=metadados["linhas"])
+        linhas = metadados["linhas"] + len(features)
+        log("INFO", f"Features de {len(novos)} temporada(s) nova(s) anexadas ({len(features)} linha(s)).")
+    else:
+        if metadados is not None and not forcar:
+            log("INFO", "Dados de temporadas já gravadas mudaram; recalculando a matriz de features.")
+        features = calcular_features(brasileirao, valores)
+        gravar_linhas(features, caminho)
+        linhas = len(features)
+        log("INFO", f"Matriz de features calculada: {linhas} linha(s) × {len(COLUNAS_FEATURES)} coluna(s).")
+
+    _gravar_metadados({"colunas": COLUNAS_FEATURES, "ordem": ORDEM_LINHAS, "linhas": linhas, "anos": anos,
+                       "hash_historico": hash_historico(brasileirao, valores, max(anos))}, caminho)
+    return len(features)
+
+def carregar_features(caminho=ARQUIVO_FEATURES_CLUBES):
+    """
+    Abre a matriz de features mapeada em memória (somente leitura, sem cópia para a RAM).
+    Retorna (matriz float32 de formato linhas × colunas, lista de colunas).
+    """
+    metadados = ler_metadados(caminho)
+    if metadados is None:
+        raise FileNotFoundError(f"[ERRO] Matriz de features não encontrada em {caminho}.")
+    matriz = np.memmap(_caminho_dados(caminho), dtype=np.float32, mode="r",
+                       shape=(metadados["linhas"], len(metadados["colunas"])))
+    return matriz, metadados["colunas"]
+
+def processar_features(forcar=False, caminho=ARQUIVO_FEATURES_CLUBES):
+    """Lê os CSVs tratados do Brasileirão e das transferências e atualiza a matriz de features."""
+    df_brasileirao = pd.read_csv(ARQUIVO_BRASILEIRAO_PROCESSED, sep=";", encoding="utf-8")
+    df_transferencias = pd.read_csv(ARQUIVO_TRANSFERENCIAS_PROCESSED, sep=";", encoding="utf-8-sig")
+
+    with metricas().cronometro("features"):
+        linhas = atualizar_features(df_brasileirao, df_transferencias, caminho, forcar)
+    metricas().contar_linhas("features", linhas)
+    log("INFO", f"Matriz de features salva em {caminho}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Atualiza a matriz de features (clube × temporada).")
+    parser.add_argument("--forcar", action="store_true", help="Recalcula a matriz inteira")
+    args = parser.parse_args()
+
+    processar_features(args.forcar)
+    metricas().exportar("features_clubes")
@@ -0,0 +1,165 @@
+import os
+import sys
+import shutil
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from metricas import log
+
+try:
+    import pyarrow.dataset as ds
+except ImportError:  # pyarrow é opcional: sem ele, apenas os CSVs são gerados
+    ds = None
+
+# Esquemas declarados dos dados tratados.
+# Valores monetários usam float32: metade da memória, com precisão de ~7 dígitos significativos.
+ESQUEMA_BRASILEIRAO = {
+    "ID": "int64",  # Derivado do hash da linha bruta
+    "Posição": "int8",
+    "Clube": "category",
+    "Clube_ID": "Int32",  # Nulo para clubes fora do índice de clubes
+    "Pontos": "int16",
+    "Jogos": "int8",
+    "Vitórias": "int8",
+    "Empates": "int8",
+    "Derrotas": "int8",
+    "GP": "int16",
+    "GC": "int16",
+    "SG": "int16",
+    "Ano": "int16",
+}
+
+ESQUEMA_TRANSFERENCIAS = {
+    "ID": "int64",  # Derivado do hash da linha bruta
+    "Clube_ID": "category",
+    "Tipo": "category",
+    "Origem_Destino": "category",
+    "Origem_Destino_ID": "Int32",  # Nulo para clubes fora do índice (ex.: estrangeiros)
+    "Valor": "float32",
+    "Empréstimo": "category",
+    "Ano": "Int16",  # Pode ter temporadas fora do formato (nulas)
+}
+
+ESQUEMA_CLUBES = {
+    "ID": "int32",
+    "UF": "category",
+    "Participacoes_SerieA": "int16",
+    "Rebaixamentos": "int16",
+    "Ultimo_Ano_SerieA": "Int16",
+    "Compras_Total_R$": "float32",
+    "Vendas_Total_R$": "float32",
+    "Saldo_Transferencias_R$": "float32",
+    "Participacoes_Internacionais": "int16",
+    **{f"Pos_{pos}": "int8" for pos in range(1, 21)},
+}
+
+# Nome do diretório da partição de valores nulos (padrão do pyarrow)
+PARTICAO_NULA = "__HIVE_DEFAULT_PARTITION__"
+
+def parquet_disponivel():
+    """Retorna True se o pyarrow estiver instalado."""
+    return ds is not None
+
+def caminho_parquet(caminho_csv):
+    """Diretório Parquet correspondente a um CSV de saída (ex.: dados.csv → dados.parquet)."""
+    return os.path.splitext(caminho_csv)[0] + ".parquet"
+
+def aplicar_esquema(df, esquema):
+    """Converte as colunas presentes em `df` para os tipos do esquema."""
+    tipos = {coluna: tipo for coluna, tipo in esquema.items() if coluna in df.columns and str(df[coluna].dtype) != tipo}
+    return df.astype(tipos) if tipos else df
+
+def salvar_parquet(df, caminho_csv, esquema, particionar_por="Ano"):
+    """
+    Salva `df` em Parquet ao lado do CSV, com os tipos do esquema.
+    Com `particionar_por`, grava um diretório por valor (ex.: Ano=2015/), permitindo ler só as temporadas necessárias.
+    """
+    if not parquet_disponivel():
+        log("ALERTA", "pyarrow não instalado; saída Parquet ignorada.")
+        return None
+
+    destino = caminho_parquet(caminho_csv)
+    if os.path.isdir(destino):
+        shutil.rmtree(destino)
+    elif os.path.exists(destino):
+        os.remove(destino)
+
+    df = aplicar_esquema(df, esquema)
+    if particionar_por and particionar_por in df.columns:
+        df.to_parquet(destino, engine="pyarrow", index=False, partition_cols=[particionar_por])
+    else:
+        os.makedirs(destino, exist_ok=True)
+        df.to_parquet(os.path.join(destino, "dados.parquet"), engine="pyarrow", index=False)
+    log("INFO", f"Parquet salvo em {destino}")
+    return destino
+
+def atualizar_parquet(df, caminho_csv, esquema, valores, particionar_por="Ano"):
+    """
+    Regrava só as partições de `valores` (ex.: as temporadas com linhas novas, alteradas ou removidas),
+    com as linhas de `df` nessas partições. Sem Parquet anterior, grava tudo com salvar_parquet.
+    """
+    destino = caminho_parquet(caminho_csv)
+    if not parquet_disponivel() or not os.path.isdir(destino) or particionar_por not in df.columns:
+        return salvar_parquet(df, caminho_csv, esquema, particionar_por)
+
+    valores = pd.Series(list(valores), dtype=object)
+    for valor in valores.dropna().unique().tolist() + ([None] if valores.isna().any() else []):
+        nome = PARTICAO_NULA if valor is None else f"{int(valor) if float(valor).is_integer() else valor}"
+        particao = os.path.join(destino, f"{particionar_por}={nome}")
+        if os.path.isdir(particao):
+            shutil.rmtree(particao)
+
+    chaves = df[particionar_por]
+    alteradas = chaves.isin(valores.dropna()) | (chaves.isna() & valores.isna().any())
+    if alteradas.any():
+        aplicar_esquema(df[alteradas], esquema).to_parquet(destino, engine="pyarrow", index=False,
+                                                           partition_cols=[particionar_por])
+    log("INFO", f"Parquet atualizado em {destino} ({valores.nunique(dropna=False)} partição(ões))")
+    return destino
+
+def anexar_parquet(df, caminho_csv, esquema, parte, particionar_por="Ano"):
+    """
+    Acrescenta `df` (a parte número `parte` de um tratamento em blocos) ao Parquet ao lado do CSV.
+    A parte 0 apaga o Parquet anterior; as seguintes gravam arquivos novos nas partições, sem reler as anteriores.
+    """
+    if not parquet_disponivel():
+        if parte == 0:
+            log("ALERTA", "pyarrow não instalado; saída Parquet ignorada.")
+        return None
+
+    destino = caminho_parquet(caminho_csv)
+    if parte == 0:
+        if os.path.isdir(destino):
+            shutil.rmtree(destino)
+        elif os.path.exists(destino):
+            os.remove(destino)
+
+    df = aplicar_esquema(df, esquema)
+    if particionar_por and particionar_por in df.columns:
+        df.to_parquet(destino, engine="pyarrow", index=False, partition_cols=[particionar_por])
+    else:
+        os.makedirs(destino, exist_ok=True)
+        df.to_parquet(os.path.join(destino, f"parte-{parte:05d}.parquet"), engine="pyarrow", index=False)
+    return destino
+
+def ler_parquet(caminho, esquema=None, colunas=None, anos=None):
+    """
+    Lê um diretório Parquet (ou o Parquet correspondente a um CSV) como DataFrame tipado.
+    `colunas` limita as colunas lidas e `anos` lê somente as partições dessas temporadas.
+    """
+    if not parquet_disponivel():
+        raise ImportError("[ERRO] A leitura de Parquet exige o pacote pyarrow instalado.")
+
+    if caminho.endswith(".csv"):
+        caminho = caminho_parquet(caminho)
+    dataset = ds.dataset(caminho, format="parquet", partitioning="hive")
+
+    filtro = None
+    if anos is not None:
+        if "Ano" not in dataset.schema.names:
+            raise ValueError(f"[ERRO] O dataset {caminho} não tem a coluna 'Ano'.")
+        filtro = ds.field("Ano").isin(list(anos))
+
+    tabela = dataset.to_table(columns=list(colunas) if colunas is not None else None, filter=filtro)
+    df = tabela.to_pandas()
+    return aplicar_esquema(df, esquema) if esquema else df
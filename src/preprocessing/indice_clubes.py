@@ -0,0 +1,220 @@
+import os
+import re
+import sys
+import json
+import difflib
+import hashlib
+import threading
+import unicodedata
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv, find_dotenv
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from metricas import log
+
+# Carrega as variáveis de ambiente
+load_dotenv(find_dotenv())
+
+# Arquivos de entrada e do índice persistido
+ARQUIVO_CLUBES_RAW = os.getenv("ARQUIVO_CLUBES_RAW")
+ARQUIVO_INDICE_CLUBES = os.getenv("ARQUIVO_INDICE_CLUBES", os.path.join("data", "cache", "indice_clubes.json"))
+
+# Colunas do CSV de clubes com nomes que identificam cada clube
+COLUNA_NOME_OFICIAL = os.getenv("COLUNA_NOME_OFICIAL")
+COLUNA_NOME_TRANSFER = os.getenv("COLUNA_NOME_TRANSFER")
+
+# Similaridade mínima (0 a 1) para aceitar um nome desconhecido como variação de um nome do índice
+CORTE_SIMILARIDADE = float(os.getenv("CORTE_SIMILARIDADE", 0.9))
+
+# Palavras que não distinguem clubes: siglas de tipo de entidade e preposições
+PALAVRAS_IGNORADAS = {"fc", "ec", "cr", "fr", "saf", "clube", "club", "futebol", "de", "do", "da", "dos", "das"}
+
+# Siglas de entidade que também são siglas de estado (Acre, Santa Catarina): ignoradas só no início do
+# nome ("SC Internacional"), nunca no fim, onde indicam o estado ("Vasco-AC" não é o Vasco da Gama)
+PREFIXOS_ENTIDADE = {"sc", "ac"}
+
+# Tamanho mínimo das palavras que a busca aproximada aceita com grafia diferente (siglas de estado
+# como "mg" e "go" precisam ser iguais)
+TAMANHO_MINIMO_GRAFIA = 4
+
+# Grupos de nomes (já normalizados) do mesmo clube: grafias antigas, abreviações e nomes usados pelo Transfermarkt
+ALIASES = [
+    {"athletico paranaense", "atletico paranaense", "athletico pr", "atletico pr"},
+    {"atletico mineiro", "atletico mg"},
+    {"atletico goianiense", "atletico go"},
+    {"america mineiro", "america mg"},
+    {"red bull bragantino", "rb bragantino", "bragantino"},
+    {"vasco gama", "vasco"},
+    {"sport", "sport recife"},
+    {"gremio", "gremio porto alegrense"},
+]
+
+# Versão do formato do índice persistido
+VERSAO_NORMALIZACAO = 2
+
+@lru_cache(maxsize=None)
+def normalizar_nome(nome):
+    """
+    Chave de comparação de um nome de clube: sem acentos, minúsculas, sem marcações como "(C)",
+    pontuação e PALAVRAS_IGNORADAS (ex.: "Atlético-MG" → "atletico mg", "Botafogo FR" → "botafogo").
+    PREFIXOS_ENTIDADE só são removidos no início ("SC Internacional" → "internacional").
+    """
+    texto = unicodedata.normalize("NFKD", str(nome)).encode("ascii", "ignore").decode("ascii").lower()
+    texto = re.sub(r"\([^)]*\)", " ", texto)
+    palavras = re.sub(r"[^a-z0-9]+", " ", texto).split()
+    if len(palavras) > 1 and palavras[0] in PREFIXOS_ENTIDADE:
+        palavras = palavras[1:]
+    significativas = [palavra for palavra in palavras if palavra not in PALAVRAS_IGNORADAS]
+    return " ".join(significativas or palavras)
+
+def mesma_grafia(chave, candidata):
+    """
+    True se as duas chaves têm as mesmas palavras, na mesma ordem, e as que diferem são variações de
+    grafia: ambas com pelo menos TAMANHO_MINIMO_GRAFIA letras e similaridade de CORTE_SIMILARIDADE.
+    """
+    palavras, candidatas = chave.split(), candidata.split()
+    if len(palavras) != len(candidatas):
+        return False
+    return all(
+        palavra == outra or (
+            min(len(palavra), len(outra)) >= TAMANHO_MINIMO_GRAFIA
+            and difflib.SequenceMatcher(None, palavra, outra).ratio() >= CORTE_SIMILARIDADE
+        )
+        for palavra, outra in zip(palavras, candidatas)
+    )
+
+class IndiceClubes:
+    """
+    Índice de resolução de nomes de clubes: mapa de chave normalizada → ID do clube.
+    Consulta em O(1) por nome; nomes que não estão no índice passam por uma busca aproximada,
+    memorizada, entre as chaves conhecidas.
+    """
+
+    def __init__(self, chaves, nomes, origem=None):
+        self.chaves = chaves  # {chave normalizada: ID}
+        self.nomes = nomes  # {ID: nome oficial}
+        self.origem = origem
+        self._aproximados = {}
+        self._lista_chaves = list(chaves)
+
+    @classmethod
+    def construir(cls, df_clubes, colunas_nome=None, coluna_id="ID", origem=None):
+        """
+        Monta o índice a partir do DataFrame de clubes. Cada nome das `colunas_nome` (a primeira é a do
+        nome oficial) e os ALIASES desses nomes viram chaves do clube; chaves que apontariam para
+        mais de um clube são descartadas, para não resolver um nome para o clube errado.
+        """
+        colunas_nome = [c for c in (colunas_nome or [COLUNA_NOME_OFICIAL, COLUNA_NOME_TRANSFER])
+                        if c and c in df_clubes.columns]
+        if not colunas_nome:
+            raise ValueError("[ERRO] Nenhuma coluna de nome de clube encontrada para montar o índice.")
+
+        candidatos = {}
+        for coluna in colunas_nome:
+            for id_clube, nome in zip(df_clubes[coluna_id], df_clubes[coluna]):
+                if pd.notna(nome) and str(nome).strip():
+                    candidatos.setdefault(normalizar_nome(nome), set()).add(int(id_clube))
+        for grupo in ALIASES:
+            ids = set().union(*(candidatos.get(chave, set()) for chave in grupo))
+            for chave in grupo:
+                candidatos.setdefault(chave, set()).update(ids)
+
+        chaves = {}
+        for chave, ids in candidatos.items():
+            if len(ids) == 1:
+                chaves[chave] = ids.pop()
+            elif ids:
+                log("ALERTA", f"Nome '{chave}' corresponde a mais de um clube ({sorted(ids)}); ignorado no índice.")
+
+        nomes = {int(id_clube): str(nome) for id_clube, nome in zip(df_clubes[coluna_id], df_clubes[colunas_nome[0]])}
+        return cls(chaves, nomes, origem)
+
+    def resolver_nome(self, nome, aproximar=True):
+        """ID do clube de `nome`, ou None se ele não for encontrado."""
+        if nome is None or (isinstance(nome, float) and np.isnan(nome)):
+            return None
+        chave = normalizar_nome(nome)
+        id_clube = self.chaves.get(chave)
+        if id_clube is None and aproximar:
+            id_clube = self._aproximar(chave)
+        return id_clube
+
+    def _aproximar(self, chave):
+        """
+        Busca aproximada de uma chave desconhecida; o resultado (inclusive "não encontrado") é memorizado.
+        Só aceita chaves com as mesmas palavras, na mesma ordem, diferindo apenas na grafia de palavras
+        longas (ver mesma_grafia): "athletico mg" → "atletico mg", mas nunca "atletico go" → "atletico mg".
+        """
+        if chave not in self._aproximados:
+            parecidas = difflib.get_close_matches(chave, self._lista_chaves, n=5, cutoff=CORTE_SIMILARIDADE)
+            parecida = next((candidata for candidata in parecidas if mesma_grafia(chave, candidata)), None)
+            self._aproximados[chave] = self.chaves[parecida] if parecida is not None else None
+            if parecida is not None:
+                log("DEBUG", f"Nome '{chave}' associado por similaridade a '{parecida}'")
+        return self._aproximados[chave]
+
+    def resolver(self, nomes, aproximar=True):
+        """
+        Versão vetorizada de resolver_nome: converte uma Series de nomes em IDs (Int32, nulo se não resolvido).
+        Cada nome distinto é resolvido uma única vez e o resultado é espalhado pelas linhas.
+        """
+        codigos, unicos = pd.factorize(nomes)
+        ids = [self.resolver_nome(nome, aproximar) for nome in unicos]
+        ids = np.array([-1 if id_clube is None else id_clube for id_clube in ids] + [-1], dtype=np.int64)
+        resolvidos = ids[codigos]  # Código -1 (nome ausente) cai na sentinela do fim do vetor
+        return pd.Series(resolvidos, index=nomes.index, dtype="Int32").mask(resolvidos < 0)
+
+    def nome_oficial(self, ids):
+        """Nome oficial de cada ID de uma Series (nulo para IDs ausentes)."""
+        return ids.map(self.nomes).astype(object)
+
+    def salvar(self, caminho=ARQUIVO_INDICE_CLUBES):
+        os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            json.dump({"versao": VERSAO_NORMALIZACAO, "origem": self.origem, "chaves": self.chaves,
+                       "nomes": {str(id_clube): nome for id_clube, nome in self.nomes.items()}},
+                      arquivo, ensure_ascii=False)
+
+    @classmethod
+    def ler(cls, caminho=ARQUIVO_INDICE_CLUBES):
+        """Lê um índice persistido; None se ele não existir ou for de outra versão das regras."""
+        if not os.path.exists(caminho):
+            return None
+        with open(caminho, encoding="utf-8") as arquivo:
+            dados = json.load(arquivo)
+        if dados.get("versao") != VERSAO_NORMALIZACAO:
+            return None
+        return cls(dados["chaves"], {int(id_clube): nome for id_clube, nome in dados["nomes"].items()}, dados["origem"])
+
+def hash_origem(caminho):
+    """Hash do CSV de clubes e das regras de normalização: se algum deles mudar, o índice é refeito."""
+    sha = hashlib.sha256(json.dumps([sorted(PALAVRAS_IGNORADAS), [sorted(grupo) for grupo in ALIASES]]).encode("utf-8"))
+    with open(caminho, "rb") as arquivo:
+        for bloco in iter(lambda: arquivo.read(1 << 20), b""):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+_trava_indice = threading.Lock()
+_indice = None
+
+def carregar_indice(arquivo_clubes=ARQUIVO_CLUBES_RAW, caminho=ARQUIVO_INDICE_CLUBES):
+    """
+    Retorna o índice de clubes do processo. Usa o índice persistido em `caminho` se ele foi montado
+    a partir do mesmo CSV de clubes e das mesmas regras; caso contrário, monta um novo e o persiste.
+    """
+    global _indice
+    with _trava_indice:
+        origem = hash_origem(arquivo_clubes)
+        if _indice is not None and _indice.origem == origem:
+            return _indice
+
+        indice = IndiceClubes.ler(caminho)
+        if indice is None or indice.origem != origem:
+            df_clubes = pd.read_csv(arquivo_clubes, sep=";", encoding="utf-8")
+            indice = IndiceClubes.construir(df_clubes, origem=origem)
+            indice.salvar(caminho)
+            log("INFO", f"Índice de clubes montado com {len(indice.chaves)} chave(s) e salvo em {caminho}")
+        _indice = indice
+        return _indice
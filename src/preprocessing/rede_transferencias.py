@@ -0,0 +1,346 @@
+import os
+import sys
+import json
+import argparse
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv, find_dotenv
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from preprocessing.indice_clubes import carregar_indice, normalizar_nome
+from preprocessing.tratamento_transferencias import ler_transferencias_tratadas
+from metricas import metricas, log
+
+# Carrega as variáveis de ambiente
+load_dotenv(find_dotenv())
+
+# Configuração dos arquivos
+ARQUIVO_TRANSFERENCIAS_PROCESSED = os.getenv("ARQUIVO_TRANSFERENCIAS_PROCESSED")
+
+# Metadados da rede (JSON); os vetores ficam ao lado, em <nome>.bin, cada um em uma faixa do arquivo
+ARQUIVO_REDE_TRANSFERENCIAS = os.getenv("ARQUIVO_REDE_TRANSFERENCIAS",
+                                        os.path.join("data", "features", "rede_transferencias.json"))
+
+# Temporada gravada para transferências sem temporada válida
+ANO_DESCONHECIDO = 0
+
+# Vetores da rede e seus tipos. As arestas (uma por transferência, no sentido do jogador: origem → destino)
+# ficam ordenadas por origem, destino e ano; inicio_saidas[no]:inicio_saidas[no + 1] são as saídas do nó (CSR).
+# arestas_entradas lista as posições das arestas ordenadas por destino, com as faixas em inicio_entradas.
+VETORES = {
+    "inicio_saidas": np.int64,
+    "origem": np.int32,
+    "destino": np.int32,
+    "ano": np.int16,
+    "valor": np.float32,
+    "emprestimo": np.int8,
+    "inicio_entradas": np.int64,
+    "arestas_entradas": np.int32,
+}
+
+def _chaves_nos(df):
+    """
+    Chave de nó de cada lado das transferências: "#<ID>" para clubes do índice (o clube da página e
+    contrapartes resolvidas) e o nome normalizado para os demais (ex.: clubes estrangeiros).
+    """
+    clube = pd.to_numeric(df["Clube_ID"], errors="coerce").astype("Int64")
+    chave_clube = ("#" + clube.astype(str)).where(clube.notna())
+
+    codigos, nomes = pd.factorize(df["Origem_Destino"])
+    normalizados = np.array([normalizar_nome(nome) for nome in nomes] + [None], dtype=object)
+    chave_contraparte = pd.Series(normalizados[codigos], index=df.index)
+    if "Origem_Destino_ID" in df.columns:
+        contraparte = pd.to_numeric(df["Origem_Destino_ID"], errors="coerce").astype("Int64")
+        chave_contraparte = ("#" + contraparte.astype(str)).where(contraparte.notna(), chave_contraparte)
+    return chave_clube, chave_contraparte
+
+def construir_rede(df_transferencias, indice=None):
+    """
+    Monta a rede de transferências a partir do CSV tratado: cada clube vira um nó (inteiro) e cada
+    transferência uma aresta com temporada, valor e empréstimo. Uma transferência entre dois clubes
+    coletados aparece nas páginas dos dois (Saída em um, Entrada no outro); para não contá-la duas
+    vezes, cada combinação (origem, destino, ano, valor, empréstimo) entra o máximo de vezes em que
+    aparece em um dos lados. Retorna (vetores de VETORES, nomes dos nós, chaves dos nós).
+    """
+    chave_clube, chave_contraparte = _chaves_nos(df_transferencias)
+    validas = (chave_clube.notna() & chave_contraparte.notna()).to_numpy()
+    df = df_transferencias[validas]
+    chave_clube, chave_contraparte = chave_clube[validas], chave_contraparte[validas]
+
+    codigos, chaves = pd.factorize(pd.concat([chave_clube, chave_contraparte], ignore_index=True))
+    no_clube, no_contraparte = codigos[:len(df)], codigos[len(df):]
+    entrada = (df["Tipo"] == "Entrada").to_numpy()
+
+    arestas = pd.DataFrame({
+        "origem": np.where(entrada, no_contraparte, no_clube),
+        "destino": np.where(entrada, no_clube, no_contraparte),
+        "ano": pd.to_numeric(df["Ano"], errors="coerce").fillna(ANO_DESCONHECIDO).to_numpy(dtype=np.int16),
+        "valor": pd.to_numeric(df["Valor"], errors="coerce").to_numpy(dtype=np.float32),
+        "emprestimo": (df["Empréstimo"] == "Sim").to_numpy(dtype=np.int8),
+        "entrada": entrada,
+    })
+    por_lado = arestas.groupby(["origem", "destino", "ano", "valor", "emprestimo", "entrada"], dropna=False).size()
+    multiplicidade = por_lado.unstack("entrada", fill_value=0).max(axis=1)
+    unicas = multiplicidade.index.to_frame(index=False)
+    repetidas = np.repeat(np.arange(len(unicas)), multiplicidade.to_numpy())
+    arestas = unicas.iloc[repetidas]
+    if len(arestas) < len(df):
+        log("INFO", f"{len(df) - len(arestas)} transferência(s) registrada(s) pelos dois clubes contada(s) uma vez.")
+
+    ordem = np.lexsort((arestas["ano"].to_numpy(), arestas["destino"].to_numpy(), arestas["origem"].to_numpy()))
+    origem = arestas["origem"].to_numpy(dtype=np.int32)[ordem]
+    destino = arestas["destino"].to_numpy(dtype=np.int32)[ordem]
+    quantidade_nos = len(chaves)
+    arestas_entradas = np.argsort(destino, kind="stable").astype(np.int32)
+
+    vetores = {
+        "inicio_saidas": np.concatenate([[0], np.cumsum(np.bincount(origem, minlength=quantidade_nos))]),
+        "origem": origem,
+        "destino": destino,
+        "ano": arestas["ano"].to_numpy(dtype=np.int16)[ordem],
+        "valor": arestas["valor"].to_numpy(dtype=np.float32)[ordem],
+        "emprestimo": arestas["emprestimo"].to_numpy(dtype=np.int8)[ordem],
+        "inicio_entradas": np.concatenate([[0], np.cumsum(np.bincount(destino, minlength=quantidade_nos))]),
+        "arestas_entradas": arestas_entradas,
+    }
+
+    # Nome de cada nó: o nome oficial (clubes do índice) ou a primeira grafia encontrada
+    nomes = dict(zip(chave_contraparte, df["Origem_Destino"].astype(str)))
+    if indice is not None:
+        nomes.update({f"#{id_clube}": nome for id_clube, nome in indice.nomes.items()})
+    nomes = [nomes.get(chave, f"Clube {chave[1:]}" if chave.startswith("#") else chave) for chave in chaves]
+    return vetores, nomes, list(chaves)
+
+def gravar_rede(vetores, nomes, chaves, caminho=ARQUIVO_REDE_TRANSFERENCIAS):
+    """Grava os vetores em um único arquivo binário (alinhados a 8 bytes) e as faixas, nomes e chaves no JSON."""
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    faixas, posicao = {}, 0
+    with open(os.path.splitext(caminho)[0] + ".bin", "wb") as arquivo:
+        for nome, tipo in VETORES.items():
+            dados = np.ascontiguousarray(vetores[nome], dtype=tipo)
+            arquivo.write(dados.tobytes())
+            faixas[nome] = {"inicio": posicao, "tamanho": len(dados)}
+            posicao += dados.nbytes
+            preenchimento = -posicao % 8
+            arquivo.write(b"\0" * preenchimento)
+            posicao += preenchimento
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump({"vetores": faixas, "nomes": nomes, "chaves": chaves}, arquivo, ensure_ascii=False)
+
+class RedeTransferencias:
+    """
+    Rede de transferências (clube → clube, no sentido do jogador) em formato CSR. As saídas de um clube
+    são uma fatia contígua dos vetores e as entradas, uma fatia de arestas_entradas: consultar um clube
+    custa O(grau dele), sem percorrer as demais transferências.
+    """
+
+    def __init__(self, vetores, nomes, chaves):
+        for nome in VETORES:
+            setattr(self, nome, vetores[nome])
+        self.nomes = nomes
+        self._por_chave = {chave: no for no, chave in enumerate(chaves)}
+        self._por_nome = {}
+        for no, nome in enumerate(nomes):
+            self._por_nome.setdefault(normalizar_nome(nome), no)
+
+    @classmethod
+    def carregar(cls, caminho=ARQUIVO_REDE_TRANSFERENCIAS):
+        """Abre uma rede gravada com gravar_rede; os vetores são mapeados em memória (somente leitura)."""
+        if not os.path.exists(caminho):
+            raise FileNotFoundError(f"[ERRO] Rede de transferências não encontrada em {caminho}.")
+        with open(caminho, encoding="utf-8") as arquivo:
+            metadados = json.load(arquivo)
+        dados = os.path.splitext(caminho)[0] + ".bin"
+        vetores = {}
+        for nome, tipo in VETORES.items():
+            faixa = metadados["vetores"][nome]
+            # np.memmap não aceita vetores vazios (rede sem transferências)
+            vetores[nome] = (np.memmap(dados, dtype=tipo, mode="r", offset=faixa["inicio"], shape=(faixa["tamanho"],))
+                             if faixa["tamanho"] else np.empty(0, dtype=tipo))
+        return cls(vetores, metadados["nomes"], metadados["chaves"])
+
+    @property
+    def quantidade_nos(self):
+        return len(self.nomes)
+
+    def no(self, clube):
+        """Nó de um clube, pelo ID do índice de clubes (int) ou pelo nome (qualquer grafia conhecida)."""
+        if isinstance(clube, (int, np.integer)):
+            no = self._por_chave.get(f"#{clube}")
+        else:
+            chave = normalizar_nome(clube)
+            no = self._por_chave.get(chave, self._por_nome.get(chave))
+        if no is None:
+            raise KeyError(f"[ERRO] Clube não encontrado na rede de transferências: {clube}")
+        return no
+
+    def saidas(self, clube):
+        """Posições das arestas que saem do clube (jogadores que ele cedeu), ordenadas por destino e ano."""
+        no = self.no(clube)
+        return np.arange(self.inicio_saidas[no], self.inicio_saidas[no + 1])
+
+    def entradas(self, clube):
+        """Posições das arestas que chegam ao clube (jogadores que ele recebeu)."""
+        no = self.no(clube)
+        return np.asarray(self.arestas_entradas[self.inicio_entradas[no]:self.inicio_entradas[no + 1]])
+
+    def _filtrar(self, arestas, anos):
+        return arestas if anos is None else arestas[np.isin(self.ano[arestas], list(anos))]
+
+    def contrapartes(self, clube, n=10, anos=None):
+        """
+        Principais contrapartes do clube: jogadores cedidos a cada uma e recebidos dela, valores recebidos
+        e pagos, ordenados pelo total de transferências. `anos` limita as temporadas consideradas.
+        """
+        saidas, entradas = self._filtrar(self.saidas(clube), anos), self._filtrar(self.entradas(clube), anos)
+        vizinhos = np.concatenate([self.destino[saidas], self.origem[entradas]])
+        unicos, grupos = np.unique(vizinhos, return_inverse=True)
+        e_saida = np.arange(len(vizinhos)) < len(saidas)
+        valores = np.nan_to_num(np.concatenate([self.valor[saidas], self.valor[entradas]]))
+
+        def somar(pesos):
+            return np.bincount(grupos, weights=pesos, minlength=len(unicos))
+
+        cedidos, recebidos = somar(e_saida).astype(np.int64), somar(~e_saida).astype(np.int64)
+        valor_recebido, valor_pago = somar(np.where(e_saida, valores, 0)), somar(np.where(e_saida, 0, valores))
+        # Ordena e recorta em NumPy; só as `n` linhas do resultado viram DataFrame
+        primeiros = np.lexsort((-valor_recebido, -(cedidos + recebidos)))[:n]
+        return pd.DataFrame({
+            "Contraparte": [self.nomes[no] for no in unicos[primeiros]],
+            "Cedidos": cedidos[primeiros],
+            "Recebidos": recebidos[primeiros],
+            "Valor_Recebido": valor_recebido[primeiros],
+            "Valor_Pago": valor_pago[primeiros],
+            "Transferencias": cedidos[primeiros] + recebidos[primeiros],
+        })
+
+    def _entre(self, origem, destino):
+        """Arestas origem → destino: uma busca binária dentro das saídas da origem (ordenadas por destino)."""
+        inicio, fim = self.inicio_saidas[origem], self.inicio_saidas[origem + 1]
+        destinos = self.destino[inicio:fim]
+        return np.arange(inicio + np.searchsorted(destinos, destino, "left"),
+                         inicio + np.searchsorted(destinos, destino, "right"))
+
+    def fluxo(self, clube_a, clube_b, anos=None):
+        """
+        Fluxo entre dois clubes por temporada: jogadores e valores em cada sentido e o saldo de A
+        (valor recebido de B menos o pago a B).
+        """
+        a, b = self.no(clube_a), self.no(clube_b)
+        de_a, de_b = self._filtrar(self._entre(a, b), anos), self._filtrar(self._entre(b, a), anos)
+        anos_fluxo = np.concatenate([self.ano[de_a], self.ano[de_b]])
+        unicos, grupos = np.unique(anos_fluxo, return_inverse=True)
+        e_de_a = np.arange(len(anos_fluxo)) < len(de_a)
+        valores = np.nan_to_num(np.concatenate([self.valor[de_a], self.valor[de_b]]))
+
+        def somar(pesos):
+            return np.bincount(grupos, weights=pesos, minlength=len(unicos))
+
+        tabela = pd.DataFrame({
+            "Ano": unicos,
+            "Jogadores_A_para_B": somar(e_de_a).astype(np.int64),
+            "Jogadores_B_para_A": somar(~e_de_a).astype(np.int64),
+            "Valor_A_para_B": somar(np.where(e_de_a, valores, 0)),
+            "Valor_B_para_A": somar(np.where(e_de_a, 0, valores)),
+        })
+        tabela["Saldo_A"] = tabela["Valor_A_para_B"] - tabela["Valor_B_para_A"]
+        return tabela
+
+    def totais(self, anos=None):
+        """Totais de todos os clubes de uma vez (jogadores cedidos/recebidos e valores), com bincount sobre as arestas."""
+        arestas = np.arange(len(self.origem)) if anos is None else np.flatnonzero(np.isin(self.ano, list(anos)))
+        origem, destino = self.origem[arestas], self.destino[arestas]
+        valores = np.nan_to_num(self.valor[arestas])
+        n = self.quantidade_nos
+        return pd.DataFrame({
+            "Clube": self.nomes,
+            "Cedidos": np.bincount(origem, minlength=n),
+            "Recebidos": np.bincount(destino, minlength=n),
+            "Valor_Recebido": np.bincount(origem, weights=valores, minlength=n),
+            "Valor_Pago": np.bincount(destino, weights=valores, minlength=n),
+        })
+
+    def _busca_em_largura(self, inicio, saltos, alvo=None):
+        """
+        Busca em largura pelas saídas, expandindo a fronteira inteira de uma vez a cada salto.
+        Retorna (distância de cada nó, -1 se não alcançado; nó anterior no caminho mais curto).
+        """
+        distancia = np.full(self.quantidade_nos, -1, dtype=np.int64)
+        anterior = np.full(self.quantidade_nos, -1, dtype=np.int64)
+        distancia[inicio] = 0
+        fronteira = np.array([inicio])
+        for salto in range(1, saltos + 1):
+            inicios, fins = self.inicio_saidas[fronteira], self.inicio_saidas[fronteira + 1]
+            graus = fins - inicios
+            if not graus.sum():
+                break
+            # Posições de todas as saídas da fronteira, sem laço por nó
+            deslocamento = np.repeat(inicios - np.concatenate([[0], np.cumsum(graus)[:-1]]), graus)
+            arestas = np.arange(graus.sum()) + deslocamento
+            vizinhos, pais = self.destino[arestas], np.repeat(fronteira, graus)
+            novos = distancia[vizinhos] < 0
+            vizinhos, primeiros = np.unique(vizinhos[novos], return_index=True)
+            if not len(vizinhos):
+                break
+            distancia[vizinhos] = salto
+            anterior[vizinhos] = pais[novos][primeiros]
+            if alvo is not None and distancia[alvo] >= 0:
+                break
+            fronteira = vizinhos
+        return distancia, anterior
+
+    def alcance(self, clube, saltos=2):
+        """Clubes que receberam jogadores do clube em até `saltos` transferências encadeadas, com a distância."""
+        distancia, _ = self._busca_em_largura(self.no(clube), saltos)
+        alcancados = np.flatnonzero(distancia > 0)
+        return (pd.DataFrame({"Clube": [self.nomes[no] for no in alcancados], "Saltos": distancia[alcancados]})
+                .sort_values(["Saltos", "Clube"]).reset_index(drop=True))
+
+    def caminho(self, clube_a, clube_b, saltos=4):
+        """Menor sequência de clubes pela qual um jogador poderia ir de A a B (seguindo transferências), ou []."""
+        a, b = self.no(clube_a), self.no(clube_b)
+        distancia, anterior = self._busca_em_largura(a, saltos, alvo=b)
+        if distancia[b] < 0:
+            return []
+        caminho = [b]
+        while caminho[-1] != a:
+            caminho.append(int(anterior[caminho[-1]]))
+        return [self.nomes[no] for no in reversed(caminho)]
+
+def processar_rede():
+    """Lê as transferências tratadas, monta a rede e a grava em ARQUIVO_REDE_TRANSFERENCIAS."""
+    df_transferencias = ler_transferencias_tratadas(ARQUIVO_TRANSFERENCIAS_PROCESSED)
+
+    with metricas().cronometro("rede"):
+        vetores, nomes, chaves = construir_rede(df_transferencias, carregar_indice())
+        gravar_rede(vetores, nomes, chaves)
+    metricas().contar_linhas("rede", len(df_transferencias))
+    log("INFO", f"Rede com {len(nomes)} clube(s) e {len(vetores['origem'])} transferência(s) "
+                f"salva em {ARQUIVO_REDE_TRANSFERENCIAS}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monta e consulta a rede de transferências entre clubes.")
+    parser.add_argument("--contrapartes", metavar="CLUBE", help="Principais contrapartes do clube")
+    parser.add_argument("--fluxo", nargs=2, metavar=("CLUBE_A", "CLUBE_B"), help="Fluxo entre dois clubes por temporada")
+    parser.add_argument("--caminho", nargs=2, metavar=("CLUBE_A", "CLUBE_B"), help="Menor caminho entre dois clubes")
+    args = parser.parse_args()
+
+    if not (args.contrapartes or args.fluxo or args.caminho):
+        processar_rede()
+        metricas().exportar("rede_transferencias")
+        sys.exit(0)
+
+    def clube(valor):
+        return int(valor) if valor.isdigit() else valor
+
+    rede = RedeTransferencias.carregar()
+    if args.contrapartes:
+        print(rede.contrapartes(clube(args.contrapartes)))
+    if args.fluxo:
+        print(rede.fluxo(*map(clube, args.fluxo)))
+    if args.caminho:
+        caminho = rede.caminho(*map(clube, args.caminho))
+        if caminho:
+            print(" → ".join(caminho))
+        else:
+            log("INFO", "Nenhum caminho encontrado.")
@@ -0,0 +1,104 @@
+import os
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv, find_dotenv
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from preprocessing.formato_colunar import anexar_parquet
+from preprocessing.tratamento_delta import ids_estaveis
+from metricas import metricas, log
+
+# Carrega as variáveis de ambiente
+load_dotenv(find_dotenv())
+
+# Linhas por bloco no tratamento em blocos (0 = arquivo inteiro em memória)
+TAMANHO_BLOCO_TRATAMENTO = int(os.getenv("TAMANHO_BLOCO_TRATAMENTO", 0))
+
+# Partições (pelos bits mais altos do hash) em que os hashes são gravados em disco na primeira passada
+BITS_PARTICOES = 8
+
+class IdsEmBlocos:
+    """
+    IDs estáveis (ver ids_estaveis) para um arquivo lido em blocos, iguais aos do arquivo inteiro, sem
+    manter os hashes de todas as linhas em memória.
+    A primeira passada (no construtor) grava os hashes em `diretorio`: em ordem, para não recalculá-los,
+    e divididos em partições pelo valor. Cada partição é lida sozinha para achar os hashes que aparecem
+    mais de uma vez no arquivo; só eles ficam em memória, com um contador de ocorrências.
+    """
+
+    def __init__(self, blocos, diretorio):
+        self.caminho_hashes = os.path.join(diretorio, "hashes.u64")
+        self.lidas = 0
+        particoes = [os.path.join(diretorio, f"particao-{p:03d}.u64") for p in range(1 << BITS_PARTICOES)]
+        limites = np.arange(len(particoes) + 1, dtype=np.uint64)
+
+        with open(self.caminho_hashes, "wb") as sequencial:
+            for bloco in blocos:
+                hashes = pd.util.hash_pandas_object(bloco, index=False).to_numpy()
+                sequencial.write(hashes.tobytes())
+                ordenados = np.sort(hashes)
+                inicios = np.searchsorted(ordenados >> np.uint64(64 - BITS_PARTICOES), limites)
+                for particao in np.flatnonzero(np.diff(inicios)):
+                    with open(particoes[particao], "ab") as arquivo:
+                        arquivo.write(ordenados[inicios[particao]:inicios[particao + 1]].tobytes())
+
+        # As partições seguem a ordem dos hashes, então os repetidos já saem ordenados
+        repetidos = [np.empty(0, dtype=np.uint64)]
+        for caminho in particoes:
+            if os.path.exists(caminho):
+                unicos, contagens = np.unique(np.fromfile(caminho, dtype=np.uint64), return_counts=True)
+                repetidos.append(unicos[contagens > 1])
+                os.remove(caminho)
+        self.repetidos = np.concatenate(repetidos)
+        self.vistas = np.zeros(len(self.repetidos), dtype=np.int64)
+
+    def __call__(self, bloco):
+        """IDs de `bloco`, o próximo bloco do arquivo (na mesma ordem da primeira passada)."""
+        hashes = np.fromfile(self.caminho_hashes, dtype=np.uint64, count=len(bloco), offset=self.lidas * 8)
+        self.lidas += len(bloco)
+
+        anteriores = np.zeros(len(bloco), dtype=np.int64)
+        if len(self.repetidos):
+            posicoes = np.minimum(np.searchsorted(self.repetidos, hashes), len(self.repetidos) - 1)
+            repetidas = self.repetidos[posicoes] == hashes
+            anteriores[repetidas] = self.vistas[posicoes[repetidas]]
+            np.add.at(self.vistas, posicoes[repetidas], 1)
+        return ids_estaveis(bloco, anteriores, pd.Series(hashes, index=bloco.index))
+
+def ler_em_blocos(caminho, tamanho=TAMANHO_BLOCO_TRATAMENTO, **opcoes):
+    """Iterador de DataFrames de até `tamanho` linhas do CSV (separador ";"), sem carregar o arquivo inteiro."""
+    return pd.read_csv(caminho, sep=";", chunksize=tamanho, **opcoes)
+
+def tratar_em_blocos(abrir_blocos, tratar, caminho_processed, esquema, opcoes_csv=None):
+    """
+    Trata o arquivo bruto em blocos com `tratar(bloco, ids)` e grava cada bloco tratado assim que fica
+    pronto: anexado ao CSV de saída e, em arquivos novos, ao Parquet particionado.
+    `abrir_blocos()` retorna um novo iterador de blocos brutos; o arquivo é lido duas vezes (ver IdsEmBlocos).
+    A memória usada é a de um bloco mais os hashes que se repetem no arquivo; os hashes de todas as linhas
+    (8 bytes por linha) ficam em um diretório temporário ao lado da saída. O resultado é o mesmo do
+    tratamento do arquivo inteiro. Retorna o número de linhas gravadas.
+    """
+    opcoes_csv = {"sep": ";", "index": False, "encoding": "utf-8", **(opcoes_csv or {})}
+    linhas = 0
+    with tempfile.TemporaryDirectory(prefix=".blocos-", dir=os.path.dirname(os.path.abspath(caminho_processed))) as diretorio:
+        with metricas().cronometro("limpeza"):
+            ids = IdsEmBlocos(abrir_blocos(), diretorio)
+        log("DEBUG", f"{len(ids.repetidos)} hash(es) repetido(s) no arquivo bruto")
+
+        for parte, bloco in enumerate(abrir_blocos()):
+            with metricas().cronometro("limpeza"):
+                tratado = tratar(bloco, ids(bloco))
+            metricas().contar_linhas("limpeza", len(tratado))
+
+            with metricas().cronometro("escrita"):
+                tratado.to_csv(caminho_processed, mode="w" if parte == 0 else "a", header=parte == 0, **opcoes_csv)
+                anexar_parquet(tratado, caminho_processed, esquema, parte)
+            metricas().contar_linhas("escrita", len(tratado))
+            linhas += len(tratado)
+            log("DEBUG", f"Bloco {parte + 1}: {len(tratado)} linha(s) gravada(s) ({linhas} no total)")
+
+    if linhas:
+        log("INFO", f"{linhas} linha(s) tratada(s) em blocos e salvas em {caminho_processed}")
+    return linhas
@@ -1,7 +1,18 @@
 import pandas as pd
 import os
+import sys
+import argparse
 from dotenv import load_dotenv, find_dotenv
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from preprocessing.formato_colunar import ESQUEMA_BRASILEIRAO, salvar_parquet, atualizar_parquet
+from preprocessing.indice_clubes import carregar_indice
+from preprocessing.tratamento_delta import (
+    TRATAMENTO_DELTA, ids_estaveis, versao_tratamento, ler_estado, gravar_estado, aplicar_delta
+)
+from preprocessing.tratamento_blocos import TAMANHO_BLOCO_TRATAMENTO, ler_em_blocos, tratar_em_blocos
+from metricas import metricas, log
+
 # Carrega as variáveis de ambiente
 load_dotenv(find_dotenv())
 
@@ -9,52 +20,112 @@ load_dotenv(find_dotenv())
 ARQUIVO_BRASILEIRAO_RAW = os.getenv("ARQUIVO_BRASILEIRAO_RAW")      # CSV de entrada
 ARQUIVO_BRASILEIRAO_PROCESSED = os.getenv("ARQUIVO_BRASILEIRAO_PROCESSED")  # CSV de saída
 
-# Carregar o CSV com o separador correto
-df = pd.read_csv(ARQUIVO_BRASILEIRAO_RAW, sep=";", encoding="utf-8")
-
-# Remover "(C)" do nome dos clubes
-df["Equipevde"] = df["Equipevde"].str.replace(r"\(C\)", "", regex=True).str.strip()
-
-# Padronizar nomes de clubes
-df["Equipevde"] = df["Equipevde"].replace({
-    "Atlético Paranaense": "Athletico Paranaense"
-})
-
-# Tratamento das colunas numéricas:
-# Para a coluna SG, removemos espaços, substituímos o traço especial por traço normal e removemos o sinal "+"
-df["SG"] = df["SG"].astype(str).str.strip()\
-    .str.replace("−", "-", regex=False)\
-    .str.replace("+", "", regex=False)
-
-# Lista das colunas que devem ser convertidas para inteiro
-cols_to_convert = ["Pos", "Pts", "J", "V", "E", "D", "GP", "GC", "SG", "Ano"]
-
-# Converter as colunas para int (valores não convertíveis virão como 0)
-for col in cols_to_convert:
-    df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype(int)
-
-# Renomear as colunas conforme o padrão desejado
-df.rename(columns={
-    "Pos": "Posição",
-    "Equipevde": "Clube",
-    "Pts": "Pontos",
-    "J": "Jogos",
-    "V": "Vitórias",
-    "E": "Empates",
-    "D": "Derrotas",
-    "GP": "GP",
-    "GC": "GC",
-    "SG": "SG",
-    "Ano": "Ano"
-}, inplace=True)
-
-# Adicionar a coluna "ID" como a primeira coluna (sequencial, iniciando em 1)
-df.insert(0, "ID", range(1, len(df) + 1))
-
-# Verificar o resultado
-print(df.info())
-print(df.head())
-
-# Salvar o CSV tratado
-df.to_csv(ARQUIVO_BRASILEIRAO_PROCESSED, sep=";", index=False, encoding="utf-8")
-print(f"[INFO] Dados corrigidos e salvos em {ARQUIVO_BRASILEIRAO_PROCESSED}")
+def tratar_brasileirao(df, indice=None, ids=None):
+    """
+    Limpa a tabela bruta do Brasileirão: nomes de clubes, colunas numéricas e nomes das colunas.
+    Com o índice de clubes (`indice`), acrescenta a coluna "Clube_ID" e padroniza o nome dos clubes
+    encontrados para o nome oficial (ex.: "Atlético Paranaense" → "Athletico Paranaense").
+    Retorna o DataFrame tratado, com a coluna "ID" na primeira posição: um ID estável derivado do
+    conteúdo da linha bruta (`ids`; por padrão, calculado com ids_estaveis).
+    """
+    if ids is None:
+        ids = ids_estaveis(df)
+
+    # Remover "(C)" do nome dos clubes
+    df["Equipevde"] = df["Equipevde"].str.replace(r"\(C\)", "", regex=True).str.strip()
+
+    # Identificar e padronizar os clubes pelo índice
+    if indice is not None:
+        ids_clubes = indice.resolver(df["Equipevde"])
+        df["Equipevde"] = indice.nome_oficial(ids_clubes).fillna(df["Equipevde"])
+        df.insert(df.columns.get_loc("Equipevde") + 1, "Clube_ID", ids_clubes)
+
+    # Tratamento das colunas numéricas:
+    # Para a coluna SG, removemos espaços, substituímos o traço especial por traço normal e removemos o sinal "+"
+    df["SG"] = df["SG"].astype(str).str.strip()\
+        .str.replace("−", "-", regex=False)\
+        .str.replace("+", "", regex=False)
+
+    # Lista das colunas que devem ser convertidas para inteiro
+    cols_to_convert = ["Pos", "Pts", "J", "V", "E", "D", "GP", "GC", "SG", "Ano"]
+
+    # Converter as colunas para int (valores não convertíveis virão como 0)
+    for col in cols_to_convert:
+        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype(int)
+
+    # Renomear as colunas conforme o padrão desejado
+    df = df.rename(columns={
+        "Pos": "Posição",
+        "Equipevde": "Clube",
+        "Pts": "Pontos",
+        "J": "Jogos",
+        "V": "Vitórias",
+        "E": "Empates",
+        "D": "Derrotas",
+        "GP": "GP",
+        "GC": "GC",
+        "SG": "SG",
+        "Ano": "Ano"
+    })
+
+    # Adicionar a coluna "ID" como a primeira coluna (estável, derivado do conteúdo da linha bruta)
+    df.insert(0, "ID", ids.to_numpy())
+    return df
+
+def processar_brasileirao(delta=TRATAMENTO_DELTA, bloco=TAMANHO_BLOCO_TRATAMENTO):
+    """
+    Lê o CSV bruto do Brasileirão, trata os dados e salva o CSV processado.
+    Com `delta`, só as linhas brutas novas ou alteradas desde a última execução são tratadas.
+    Com `bloco` (linhas), o arquivo inteiro é tratado em blocos, sem ser carregado na memória.
+    """
+    indice = carregar_indice()
+    versao = versao_tratamento(tratar_brasileirao, carregar_indice, ids_estaveis, extra=indice.origem)
+    if bloco:
+        linhas = tratar_em_blocos(lambda: ler_em_blocos(ARQUIVO_BRASILEIRAO_RAW, bloco, encoding="utf-8", dtype=str),
+                                  lambda df, ids: tratar_brasileirao(df, indice, ids),
+                                  ARQUIVO_BRASILEIRAO_PROCESSED, ESQUEMA_BRASILEIRAO)
+        gravar_estado(ARQUIVO_BRASILEIRAO_PROCESSED, versao, linhas)
+        return
+
+    # Carregar o CSV com o separador correto (como texto: os IDs não dependem dos tipos inferidos)
+    df = pd.read_csv(ARQUIVO_BRASILEIRAO_RAW, sep=";", encoding="utf-8", dtype=str)
+    estado = ler_estado(ARQUIVO_BRASILEIRAO_PROCESSED) if delta else None
+
+    with metricas().cronometro("limpeza"):
+        ids = ids_estaveis(df)
+        if estado is not None and estado["versao"] == versao:
+            existente = pd.read_csv(ARQUIVO_BRASILEIRAO_PROCESSED, sep=";", encoding="utf-8",
+                                    dtype={"Clube": str, "Clube_ID": "Int32"})
+            df, tratadas, removidas = aplicar_delta(df, ids, existente,
+                                                    lambda df_novo, ids_novo: tratar_brasileirao(df_novo, indice, ids_novo))
+            anos_alterados = pd.concat([tratadas["Ano"], removidas["Ano"]]).unique()
+        else:
+            tratadas = df = tratar_brasileirao(df, indice, ids)
+            anos_alterados = None
+    metricas().contar_linhas("limpeza", len(tratadas))
+
+    # Verificar o resultado (visível com NIVEL_LOG=DEBUG)
+    log("DEBUG", f"Brasileirão tratado: {len(df)} linha(s), colunas {list(df.columns)}\n{df.head()}")
+
+    # Salvar o CSV tratado
+    with metricas().cronometro("escrita"):
+        df.to_csv(ARQUIVO_BRASILEIRAO_PROCESSED, sep=";", index=False, encoding="utf-8")
+        gravar_estado(ARQUIVO_BRASILEIRAO_PROCESSED, versao, len(df))
+        log("INFO", f"Dados corrigidos e salvos em {ARQUIVO_BRASILEIRAO_PROCESSED}")
+
+        # Salvar a versão colunar tipada, particionada por temporada (no delta, só as temporadas alteradas)
+        if anos_alterados is None:
+            salvar_parquet(df, ARQUIVO_BRASILEIRAO_PROCESSED, ESQUEMA_BRASILEIRAO)
+        elif len(anos_alterados):
+            atualizar_parquet(df, ARQUIVO_BRASILEIRAO_PROCESSED, ESQUEMA_BRASILEIRAO, anos_alterados)
+    metricas().contar_linhas("escrita", len(df))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Trata o CSV bruto do Brasileirão.")
+    parser.add_argument("--completo", action="store_true", help="Trata todas as linhas, ignorando o modo delta")
+    parser.add_argument("--blocos", type=int, default=TAMANHO_BLOCO_TRATAMENTO,
+                        help="Trata o arquivo em blocos com esse número de linhas (0 = arquivo inteiro em memória)")
+    args = parser.parse_args()
+
+    processar_brasileirao(delta=TRATAMENTO_DELTA and not args.completo, bloco=args.blocos)
+    metricas().exportar("tratamento_brasileirao")
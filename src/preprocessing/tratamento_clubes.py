@@ -1,7 +1,13 @@
 import pandas as pd
 import os
+import sys
 from dotenv import load_dotenv, find_dotenv
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from preprocessing.formato_colunar import ESQUEMA_CLUBES, salvar_parquet
+from preprocessing.indice_clubes import IndiceClubes, carregar_indice
+from metricas import metricas, log
+
 # Carregar variáveis de ambiente
 load_dotenv(find_dotenv())
 
@@ -12,69 +18,109 @@ ARQUIVO_TRANSFERENCIAS_PROCESSED = os.getenv("ARQUIVO_TRANSFERENCIAS_PROCESSED")
 ARQUIVO_BRASILEIRAO_PROCESSED = os.getenv("ARQUIVO_BRASILEIRAO_PROCESSED")
 COLUNA_NOME_OFICIAL = os.getenv("COLUNA_NOME_OFICIAL")
 
-# Carregar datasets
-df_clubes = pd.read_csv(ARQUIVO_CLUBES_RAW, sep=";", encoding="utf-8")
-df_transferencias = pd.read_csv(ARQUIVO_TRANSFERENCIAS_PROCESSED, sep=";", encoding="utf-8")
-df_brasileirao = pd.read_csv(ARQUIVO_BRASILEIRAO_PROCESSED, sep=";", encoding="utf-8")
-
-# Adicionar novas colunas
-estatisticas = []
-
-for idx, clube in df_clubes.iterrows():
-    nome_oficial = clube[COLUNA_NOME_OFICIAL]
+def juntar_participacoes(ids_clubes, df_brasileirao, indice=None):
+    """
+    Associa cada linha do Brasileirão à posição do seu clube em `ids_clubes`, pela coluna "Clube_ID".
+    Se a tabela não tiver essa coluna (CSV antigo), os nomes são resolvidos com `indice`.
+    Retorna as linhas do Brasileirão de clubes da lista, com a coluna "_clube" (posição do clube na lista).
+    """
+    if "Clube_ID" in df_brasileirao.columns:
+        ids = pd.to_numeric(df_brasileirao["Clube_ID"])
+    else:
+        ids = indice.resolver(df_brasileirao["Clube"])
+    posicoes = pd.Index(ids_clubes).get_indexer(ids.fillna(-1).astype("int64"))
+    encontradas = posicoes >= 0
+    return df_brasileirao[encontradas].assign(_clube=posicoes[encontradas])
+
+def calcular_estatisticas(df_clubes, df_brasileirao, df_transferencias, indice=None):
+    """
+    Calcula as estatísticas de todos os clubes de uma vez, com agregações agrupadas por clube.
+    `indice` só é usado se o Brasileirão não tiver "Clube_ID"; por padrão, é montado a partir de df_clubes.
+    Retorna o DataFrame enriquecido, uma linha por clube, na ordem de df_clubes.
+    """
+    clubes = range(len(df_clubes))
+    if indice is None and "Clube_ID" not in df_brasileirao.columns:
+        indice = IndiceClubes.construir(df_clubes, [COLUNA_NOME_OFICIAL])
 
     # Dados do Brasileirão
-    participacoes = df_brasileirao[df_brasileirao["Clube"].str.contains(nome_oficial, na=False)]
-    qtd_participacoes = participacoes.shape[0]
-
-    posicoes_count = participacoes["Posição"].value_counts().to_dict()
+    participacoes = juntar_participacoes(df_clubes["ID"], df_brasileirao, indice)
+    por_clube = participacoes.groupby("_clube")
 
-    rebaixamentos = participacoes[participacoes["Posição"] >= 17].shape[0]
+    qtd_participacoes = por_clube.size().reindex(clubes, fill_value=0)
+    rebaixamentos = (participacoes["Posição"] >= 17).groupby(participacoes["_clube"]).sum().reindex(clubes, fill_value=0)
+    internacionais = (participacoes["Posição"] <= 12).groupby(participacoes["_clube"]).sum().reindex(clubes, fill_value=0)
 
     # Métricas históricas
-    media_pontos = participacoes["Pontos"].mean() if qtd_participacoes > 0 else 0
-    aproveitamento = (participacoes["Pontos"].sum() / (participacoes["Jogos"].sum() * 3) * 100
-                      if participacoes["Jogos"].sum() > 0 else 0)
+    media_pontos = por_clube["Pontos"].mean().reindex(clubes).fillna(0)
+    soma_pontos = por_clube["Pontos"].sum().reindex(clubes, fill_value=0)
+    soma_jogos = por_clube["Jogos"].sum().reindex(clubes, fill_value=0)
+    aproveitamento = (soma_pontos / (soma_jogos * 3) * 100).where(soma_jogos > 0, 0)
+    ultimo_ano_serie_a = por_clube["Ano"].max().reindex(clubes)
 
-    ultimo_ano_serie_a = participacoes["Ano"].max() if qtd_participacoes > 0 else None
+    # Últimas 3 temporadas de cada clube
+    recentes = (participacoes.sort_values(["_clube", "Ano"], ascending=[True, False], kind="mergesort")
+                .groupby("_clube").head(3).groupby("_clube"))
+    media_recente = recentes["Pontos"].mean().reindex(clubes).fillna(0)
+    posicao_media_recente = recentes["Posição"].mean().reindex(clubes)
 
-    recentes = participacoes.sort_values(by="Ano", ascending=False).head(3)
-    media_recente = recentes["Pontos"].mean() if len(recentes) > 0 else 0
-    posicao_media_recente = recentes["Posição"].mean() if len(recentes) > 0 else None
+    posicoes_count = (pd.crosstab(participacoes["_clube"], participacoes["Posição"])
+                      .reindex(index=clubes, columns=range(1, 21), fill_value=0))
 
     # Dados financeiros
-    id_clube = clube["ID"]
-    transferencias_clube = df_transferencias[df_transferencias["Clube_ID"] == id_clube]
+    valores_por_tipo = df_transferencias.groupby(["Clube_ID", "Tipo"])["Valor"].sum()
+    ids = df_clubes["ID"]
 
-    compras = transferencias_clube[transferencias_clube["Tipo"] == "Chegada"]["Valor"].sum()
-    vendas = transferencias_clube[transferencias_clube["Tipo"] == "Saída"]["Valor"].sum()
+    def total_por_tipo(tipo):
+        if tipo not in valores_por_tipo.index.get_level_values("Tipo"):
+            return pd.Series(0.0, index=clubes)
+        return valores_por_tipo.xs(tipo, level="Tipo").reindex(ids).fillna(0).reset_index(drop=True)
+
+    compras = total_por_tipo("Chegada")
+    vendas = total_por_tipo("Saída")
     saldo_transferencias = vendas - compras
 
-    # Participações internacionais (top 12 colocados)
-    internacionais = participacoes[participacoes["Posição"] <= 12].shape[0]
-
-    estatisticas.append({
-        "ID": id_clube,
-        "Nome Oficial": nome_oficial,
-        "UF": clube["UF"],  # Coluna UF incluída na 3ª posição
-        "Participacoes_SerieA": qtd_participacoes,
-        "Rebaixamentos": rebaixamentos,
-        "Media_Pontos": round(media_pontos, 2),
-        "Aproveitamento(%)": round(aproveitamento, 2),
-        "Ultimo_Ano_SerieA": ultimo_ano_serie_a,
-        "Media_Pontos_Ult3anos": round(media_recente, 2),
-        "Posicao_Media_Ult3anos": round(posicao_media_recente, 2) if posicao_media_recente is not None else None,
-        "Compras_Total_R$": round(compras, 2),
-        "Vendas_Total_R$": round(vendas, 2),
-        "Saldo_Transferencias_R$": round(saldo_transferencias, 2),
-        "Participacoes_Internacionais": internacionais,
-        **{f"Pos_{pos}": posicoes_count.get(pos, 0) for pos in range(1, 21)}
+    estatisticas = pd.DataFrame({
+        "ID": ids.to_numpy(),
+        "Nome Oficial": df_clubes[COLUNA_NOME_OFICIAL].to_numpy(),
+        "UF": df_clubes["UF"].to_numpy(),  # Coluna UF incluída na 3ª posição
+        "Participacoes_SerieA": qtd_participacoes.to_numpy(),
+        "Rebaixamentos": rebaixamentos.to_numpy(),
+        "Media_Pontos": media_pontos.round(2).to_numpy(),
+        "Aproveitamento(%)": aproveitamento.round(2).to_numpy(),
+        "Ultimo_Ano_SerieA": ultimo_ano_serie_a.to_numpy(),
+        "Media_Pontos_Ult3anos": media_recente.round(2).to_numpy(),
+        "Posicao_Media_Ult3anos": posicao_media_recente.round(2).to_numpy(),
+        "Compras_Total_R$": compras.round(2).to_numpy(),
+        "Vendas_Total_R$": vendas.round(2).to_numpy(),
+        "Saldo_Transferencias_R$": saldo_transferencias.round(2).to_numpy(),
+        "Participacoes_Internacionais": internacionais.to_numpy(),
     })
-
-# DataFrame final enriquecido
-df_clubes_final = pd.DataFrame(estatisticas)
-
-# Salvar CSV tratado
-df_clubes_final.to_csv(ARQUIVO_CLUBES_PROCESSED, sep=";", index=False, encoding="utf-8-sig")
-
-print(f"[INFO] CSV enriquecido e salvo em {ARQUIVO_CLUBES_PROCESSED}")
+    for pos in range(1, 21):
+        estatisticas[f"Pos_{pos}"] = posicoes_count[pos].to_numpy()
+    return estatisticas
+
+def processar_clubes():
+    """Lê os clubes e os dados já tratados, calcula as estatísticas e salva o CSV enriquecido."""
+    # Carregar datasets
+    df_clubes = pd.read_csv(ARQUIVO_CLUBES_RAW, sep=";", encoding="utf-8")
+    df_transferencias = pd.read_csv(ARQUIVO_TRANSFERENCIAS_PROCESSED, sep=";", encoding="utf-8")
+    df_brasileirao = pd.read_csv(ARQUIVO_BRASILEIRAO_PROCESSED, sep=";", encoding="utf-8")
+
+    # DataFrame final enriquecido
+    with metricas().cronometro("limpeza"):
+        df_clubes_final = calcular_estatisticas(df_clubes, df_brasileirao, df_transferencias, carregar_indice())
+    metricas().contar_linhas("limpeza", len(df_brasileirao) + len(df_transferencias))
+
+    # Salvar CSV tratado
+    with metricas().cronometro("escrita"):
+        df_clubes_final.to_csv(ARQUIVO_CLUBES_PROCESSED, sep=";", index=False, encoding="utf-8-sig")
+
+        log("INFO", f"CSV enriquecido e salvo em {ARQUIVO_CLUBES_PROCESSED}")
+
+        # Versão colunar tipada (sem partições: uma linha por clube)
+        salvar_parquet(df_clubes_final, ARQUIVO_CLUBES_PROCESSED, ESQUEMA_CLUBES, particionar_por=None)
+    metricas().contar_linhas("escrita", len(df_clubes_final))
+
+if __name__ == "__main__":
+    processar_clubes()
+    metricas().exportar("tratamento_clubes")
@@ -0,0 +1,83 @@
+import os
+import sys
+import json
+import inspect
+import hashlib
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv, find_dotenv
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from metricas import log
+
+# Carrega as variáveis de ambiente
+load_dotenv(find_dotenv())
+
+# Modo delta: só as linhas brutas novas ou alteradas desde a última execução são tratadas
+TRATAMENTO_DELTA = os.getenv("TRATAMENTO_DELTA", "1") == "1"
+
+def ids_estaveis(df_raw, anteriores=None, hashes=None):
+    """
+    IDs derivados do conteúdo de cada linha bruta (hash vetorizado de todas as colunas): a mesma linha
+    recebe o mesmo ID em qualquer execução, independentemente da posição no arquivo.
+    Linhas idênticas são diferenciadas pela ordem de ocorrência. Retorna uma Series int64 positiva.
+    No tratamento em blocos, `anteriores` (ocorrências de cada linha nos blocos anteriores) continua
+    a contagem e `hashes` evita recalcular o hash das linhas do bloco.
+    """
+    if hashes is None:
+        hashes = pd.util.hash_pandas_object(df_raw, index=False)
+    valores = hashes.to_numpy()
+    ocorrencias = hashes.groupby(valores).cumcount().to_numpy()
+    if anteriores is not None:
+        ocorrencias = ocorrencias + anteriores
+    if ocorrencias.any():
+        # Atribuição em arrays NumPy: com Series, os hashes repetidos passariam por float64 e perderiam precisão
+        repetidas = ocorrencias > 0
+        valores = valores.copy()
+        valores[repetidas] = pd.util.hash_pandas_object(
+            pd.DataFrame({"hash": valores[repetidas], "ocorrencia": ocorrencias[repetidas]}), index=False).to_numpy()
+    return pd.Series((valores >> np.uint64(1)).astype(np.int64), index=df_raw.index)
+
+def versao_tratamento(*funcoes, extra=""):
+    """
+    Hash do código-fonte dos módulos que definem `funcoes` (e de `extra`, ex.: a origem do índice de clubes).
+    Se mudar, as linhas já tratadas podem estar desatualizadas e tudo é tratado de novo.
+    """
+    sha = hashlib.sha256(str(extra).encode("utf-8"))
+    for caminho in sorted({inspect.getsourcefile(funcao) for funcao in funcoes}):
+        with open(caminho, "rb") as arquivo:
+            sha.update(arquivo.read())
+    return sha.hexdigest()
+
+def _caminho_estado(caminho_processed):
+    return f"{caminho_processed}.delta.json"
+
+def ler_estado(caminho_processed):
+    caminho = _caminho_estado(caminho_processed)
+    if not os.path.exists(caminho) or not os.path.exists(caminho_processed):
+        return None
+    with open(caminho, encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+def gravar_estado(caminho_processed, versao, linhas):
+    with open(_caminho_estado(caminho_processed), "w", encoding="utf-8") as arquivo:
+        json.dump({"versao": versao, "linhas": linhas}, arquivo)
+
+def aplicar_delta(df_raw, ids, df_existente, tratar):
+    """
+    Trata só as linhas de `df_raw` cujo ID (ver ids_estaveis) não está em `df_existente` e as junta às
+    linhas já tratadas que continuam no bruto; linhas alteradas ganham outro ID, então a antiga sai e a
+    nova entra (upsert). `tratar(df, ids)` é a função de tratamento completa aplicada ao subconjunto.
+    Retorna (DataFrame na ordem do bruto, linhas tratadas agora, linhas antigas removidas).
+    """
+    existentes = pd.Index(df_existente["ID"])
+    novas = ~ids.isin(existentes).to_numpy()
+    continuam = existentes.isin(ids)
+    mantidas, removidas = df_existente[continuam], df_existente[~continuam]
+
+    tratadas = tratar(df_raw[novas].copy(), ids[novas])
+    combinado = pd.concat([mantidas, tratadas], ignore_index=True) if len(tratadas) else mantidas
+    combinado = combinado.set_index("ID").reindex(ids.to_numpy()).reset_index()
+    log("INFO", f"Delta: {int(novas.sum())} linha(s) nova(s) ou alterada(s), {len(removidas)} removida(s),"
+                f" {len(mantidas)} reaproveitada(s).")
+    return combinado, tratadas, removidas
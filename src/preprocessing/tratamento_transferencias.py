@@ -1,8 +1,20 @@
 import pandas as pd
+import numpy as np
 import os
 import re
+import argparse
+import sys
 from dotenv import load_dotenv, find_dotenv
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from preprocessing.formato_colunar import ESQUEMA_TRANSFERENCIAS, salvar_parquet, atualizar_parquet
+from preprocessing.indice_clubes import carregar_indice
+from preprocessing.tratamento_delta import (
+    TRATAMENTO_DELTA, ids_estaveis, versao_tratamento, ler_estado, gravar_estado, aplicar_delta
+)
+from preprocessing.tratamento_blocos import TAMANHO_BLOCO_TRATAMENTO, ler_em_blocos, tratar_em_blocos
+from metricas import metricas, log
+
 # Carrega as variáveis de ambiente
 load_dotenv(find_dotenv())
 
@@ -13,19 +25,8 @@ ARQUIVO_TRANSFERENCIAS_PROCESSED = os.getenv("ARQUIVO_TRANSFERENCIAS_PROCESSED")
 # Definir taxa de conversão fixa
 TAXA_CONVERSAO = 6.20  # 1 EUR = 6.20 BRL
 
-# Verificação se os arquivos foram carregados corretamente
-if not ARQUIVO_TRANSFERENCIAS_RAW or not ARQUIVO_TRANSFERENCIAS_PROCESSED:
-    raise ValueError("[ERRO] Um ou mais caminhos de arquivo não foram carregados corretamente. Verifique o .env.")
-
-# Carregar os dados de transferências
-df_transferencias = pd.read_csv(ARQUIVO_TRANSFERENCIAS_RAW, sep=';', dtype=str)
-
-# Identificar se a transferência foi um empréstimo
-df_transferencias["Empréstimo"] = df_transferencias["Transfer Sum"].apply(
-    lambda x: "Sim" if "loan" in str(x).lower() or "end of loan" in str(x).lower() else "Não"
-)
-
 # Função para limpar e converter valores corretamente para float
+# (versão linha a linha, mantida como referência para limpar_valores)
 def limpar_valor(transfer_sum):
     if pd.isna(transfer_sum) or transfer_sum.strip() == "-" or transfer_sum.lower() in ["unknown", "end of loan"]:
         return 0.0  # Se não houver valor, define como 0.0
@@ -50,10 +51,8 @@ def limpar_valor(transfer_sum):
 
     return 0.0  # Se não conseguiu processar corretamente
 
-# Aplicar a conversão correta dos valores
-df_transferencias["Valor"] = df_transferencias["Transfer Sum"].apply(limpar_valor)
-
 # Função para converter a temporada (ex: "14/15" → 2015, "15/16" → 2016)
+# (versão linha a linha, mantida como referência para converter_temporadas)
 def converter_temporada(temporada):
     match = re.match(r"(\d{2})/(\d{2})", str(temporada))
     if match:
@@ -61,16 +60,170 @@ def converter_temporada(temporada):
         return int(f"20{ano_final}")  # Pega o segundo ano como referência (ex: "15" → 2015)
     return None  # Retorna None se o formato estiver incorreto
 
-# Aplicar a conversão de temporada
-df_transferencias["Ano"] = df_transferencias["Temporada"].apply(converter_temporada)
-
-# Criar DataFrame com as colunas desejadas
-df_tratado = df_transferencias[["Clube_ID", "Tipo", "Origem_Destino", "Valor", "Empréstimo", "Ano"]].copy()
-
-# Criar a coluna de ID sequencial (começando em 1)
-df_tratado.insert(0, "ID", range(1, len(df_tratado) + 1))
-
-# Salvar o CSV tratado com valores corretamente formatados
-df_tratado.to_csv(ARQUIVO_TRANSFERENCIAS_PROCESSED, sep=";", index=False, encoding="utf-8-sig", float_format="%.2f")
-
-print(f"[INFO] Transferências tratadas salvas em {ARQUIVO_TRANSFERENCIAS_PROCESSED}")
+def _valores_unicos(serie):
+    """
+    Separa a Series em códigos por linha e valores distintos (NaN incluído).
+    As funções vetorizadas abaixo trabalham sobre os valores distintos, que no CSV bruto
+    são poucos, e espalham o resultado pelas linhas com uma indexação NumPy.
+    """
+    codigos, unicos = pd.factorize(serie, use_na_sentinel=False)
+    return codigos, pd.Series(unicos, dtype=object)
+
+def limpar_valores(transfer_sums):
+    """
+    Versão vetorizada de limpar_valor: converte uma Series de valores ("€1.5m", "€200k", ...) para reais.
+    Valores ausentes, não numéricos ou mal formatados (ex.: "1.2.3m") viram 0.0.
+    """
+    codigos, unicos = _valores_unicos(transfer_sums)
+    partes = unicos.str.lower().str.replace(",", ".", regex=False).str.extract(r"^€?([\d.]+)([mk]?)")
+    numeros = partes[0]
+
+    # float() só aceita um ponto decimal; o resto é descartado como na versão linha a linha
+    validos = numeros.str.fullmatch(r"\d+\.?\d*|\.\d+", na=False).to_numpy(dtype=bool)
+    valores = np.zeros(len(unicos), dtype=np.float64)
+    valores[validos] = numeros[validos].to_numpy(dtype=object).astype(np.float64)
+
+    multiplicadores = partes[1].to_numpy(dtype=object)
+    valores = np.where(multiplicadores == "m", valores * 1_000_000,
+                       np.where(multiplicadores == "k", valores * 1_000, valores))
+    valores = np.where(validos, valores * TAXA_CONVERSAO, 0.0)
+    return pd.Series(valores[codigos], index=transfer_sums.index)
+
+def converter_temporadas(temporadas):
+    """
+    Versão vetorizada de converter_temporada: "14/15" → 2015.
+    Retorna inteiros, ou floats com NaN se alguma temporada estiver fora do formato.
+    """
+    codigos, unicos = _valores_unicos(temporadas)
+    ano_final = unicos.astype(str).str.extract(r"^\d{2}/(\d{2})")[0]
+    validos = ano_final.notna().to_numpy(dtype=bool)
+    anos = np.full(len(unicos), np.nan)
+    anos[validos] = ano_final[validos].to_numpy(dtype=object).astype(np.int64) + 2000
+    anos = anos[codigos]
+    return pd.Series(anos.astype(np.int64) if validos.all() else anos, index=temporadas.index)
+
+def detectar_emprestimos(transfer_sums):
+    """Versão vetorizada da detecção de empréstimo: "Sim" se o valor mencionar "loan", senão "Não"."""
+    codigos, unicos = _valores_unicos(transfer_sums)
+    emprestimo = unicos.str.lower().str.contains("loan", regex=False, na=False).to_numpy(dtype=bool)
+    return pd.Series(np.where(emprestimo, "Sim", "Não").astype(object)[codigos], index=transfer_sums.index)
+
+def tratar_transferencias(df_transferencias, indice=None, ids=None):
+    """
+    Aplica a limpeza ao DataFrame bruto de transferências e retorna o DataFrame tratado.
+    Com o índice de clubes (`indice`), acrescenta "Origem_Destino_ID" (nulo para clubes fora do índice).
+    O "ID" de cada linha vem do conteúdo da linha bruta (`ids`; por padrão, calculado com ids_estaveis).
+    """
+    if ids is None:
+        ids = ids_estaveis(df_transferencias)
+
+    # Identificar se a transferência foi um empréstimo
+    df_transferencias["Empréstimo"] = detectar_emprestimos(df_transferencias["Transfer Sum"])
+
+    # Aplicar a conversão correta dos valores
+    df_transferencias["Valor"] = limpar_valores(df_transferencias["Transfer Sum"])
+
+    # Aplicar a conversão de temporada
+    df_transferencias["Ano"] = converter_temporadas(df_transferencias["Temporada"])
+
+    # Criar DataFrame com as colunas desejadas
+    df_tratado = df_transferencias[["Clube_ID", "Tipo", "Origem_Destino", "Valor", "Empréstimo", "Ano"]].copy()
+
+    # Identificar o clube de origem/destino pelo índice
+    if indice is not None:
+        df_tratado.insert(df_tratado.columns.get_loc("Origem_Destino") + 1, "Origem_Destino_ID",
+                          indice.resolver(df_tratado["Origem_Destino"]))
+
+    # ID estável, derivado do conteúdo da linha bruta
+    df_tratado.insert(0, "ID", ids.to_numpy())
+    return df_tratado
+
+def ler_transferencias_tratadas(caminho):
+    """Lê o CSV tratado com os mesmos tipos produzidos por tratar_transferencias."""
+    df = pd.read_csv(caminho, sep=";", encoding="utf-8-sig",
+                     dtype={"Clube_ID": str, "Tipo": str, "Origem_Destino": str, "Empréstimo": str,
+                            "Origem_Destino_ID": "Int32"})
+    return unificar_ano(df)
+
+def unificar_ano(df):
+    """Ano inteiro se todas as temporadas forem válidas, senão float com NaN (como converter_temporadas)."""
+    if df["Ano"].notna().all():
+        return df.astype({"Ano": "int64"})
+    return df.astype({"Ano": "float64"})
+
+def processar_em_blocos(indice, versao, tamanho):
+    """
+    Trata o CSV bruto em blocos de `tamanho` linhas, com memória limitada pelo bloco (ver tratar_em_blocos).
+    O tipo de "Ano" depende do arquivo inteiro (ver unificar_ano), então uma passada prévia lê só
+    as temporadas para decidir se há alguma inválida.
+    """
+    anos_validos = all(converter_temporadas(bloco["Temporada"]).notna().all()
+                       for bloco in ler_em_blocos(ARQUIVO_TRANSFERENCIAS_RAW, tamanho, usecols=["Temporada"], dtype=str))
+    tipo_ano = "int64" if anos_validos else "float64"
+
+    def tratar(bloco, ids):
+        return tratar_transferencias(bloco, indice, ids).astype({"Ano": tipo_ano})
+
+    linhas = tratar_em_blocos(lambda: ler_em_blocos(ARQUIVO_TRANSFERENCIAS_RAW, tamanho, dtype=str), tratar,
+                              ARQUIVO_TRANSFERENCIAS_PROCESSED, ESQUEMA_TRANSFERENCIAS,
+                              {"encoding": "utf-8-sig", "float_format": "%.2f"})
+    gravar_estado(ARQUIVO_TRANSFERENCIAS_PROCESSED, versao, linhas)
+
+def processar_transferencias(delta=TRATAMENTO_DELTA, bloco=TAMANHO_BLOCO_TRATAMENTO):
+    """
+    Lê o CSV bruto de transferências, trata os dados e salva o CSV processado.
+    Com `delta`, só as linhas brutas novas ou alteradas desde a última execução são tratadas e
+    inseridas no CSV processado; o resultado é o mesmo do tratamento completo.
+    Com `bloco` (linhas), o arquivo inteiro é tratado em blocos, sem ser carregado na memória; o modo
+    delta não se aplica, porque precisaria do CSV tratado inteiro em memória.
+    """
+    # Verificação se os arquivos foram carregados corretamente
+    if not ARQUIVO_TRANSFERENCIAS_RAW or not ARQUIVO_TRANSFERENCIAS_PROCESSED:
+        raise ValueError("[ERRO] Um ou mais caminhos de arquivo não foram carregados corretamente. Verifique o .env.")
+
+    indice = carregar_indice()
+    versao = versao_tratamento(tratar_transferencias, carregar_indice, ids_estaveis, extra=indice.origem)
+    if bloco:
+        processar_em_blocos(indice, versao, bloco)
+        return
+
+    # Carregar os dados de transferências
+    df_transferencias = pd.read_csv(ARQUIVO_TRANSFERENCIAS_RAW, sep=';', dtype=str)
+    estado = ler_estado(ARQUIVO_TRANSFERENCIAS_PROCESSED) if delta else None
+
+    with metricas().cronometro("limpeza"):
+        ids = ids_estaveis(df_transferencias)
+        if estado is not None and estado["versao"] == versao:
+            df_tratado, tratadas, removidas = aplicar_delta(
+                df_transferencias, ids, ler_transferencias_tratadas(ARQUIVO_TRANSFERENCIAS_PROCESSED),
+                lambda df, ids_df: tratar_transferencias(df, indice, ids_df))
+            df_tratado = unificar_ano(df_tratado)
+            anos_alterados = pd.concat([tratadas["Ano"], removidas["Ano"]]).unique()
+        else:
+            tratadas = df_tratado = tratar_transferencias(df_transferencias, indice, ids)
+            anos_alterados = None
+    metricas().contar_linhas("limpeza", len(tratadas))
+
+    # Salvar o CSV tratado com valores corretamente formatados
+    with metricas().cronometro("escrita"):
+        df_tratado.to_csv(ARQUIVO_TRANSFERENCIAS_PROCESSED, sep=";", index=False, encoding="utf-8-sig", float_format="%.2f")
+        gravar_estado(ARQUIVO_TRANSFERENCIAS_PROCESSED, versao, len(df_tratado))
+
+        log("INFO", f"Transferências tratadas salvas em {ARQUIVO_TRANSFERENCIAS_PROCESSED}")
+
+        # Versão colunar tipada, particionada por temporada (no delta, só as temporadas alteradas)
+        if anos_alterados is None:
+            salvar_parquet(df_tratado, ARQUIVO_TRANSFERENCIAS_PROCESSED, ESQUEMA_TRANSFERENCIAS)
+        elif len(anos_alterados):
+            atualizar_parquet(df_tratado, ARQUIVO_TRANSFERENCIAS_PROCESSED, ESQUEMA_TRANSFERENCIAS, anos_alterados)
+    metricas().contar_linhas("escrita", len(df_tratado))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Trata o CSV bruto de transferências.")
+    parser.add_argument("--completo", action="store_true", help="Trata todas as linhas, ignorando o modo delta")
+    parser.add_argument("--blocos", type=int, default=TAMANHO_BLOCO_TRATAMENTO,
+                        help="Trata o arquivo em blocos com esse número de linhas (0 = arquivo inteiro em memória)")
+    args = parser.parse_args()
+
+    processar_transferencias(delta=TRATAMENTO_DELTA and not args.completo, bloco=args.blocos)
+    metricas().exportar("tratamento_transferencias")
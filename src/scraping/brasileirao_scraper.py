@@ -1,15 +1,29 @@
 import os
+import sys
 import time
 import random
+import argparse
 import pandas as pd
+from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 from dotenv import find_dotenv, load_dotenv
-from bs4 import BeautifulSoup
 import re
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scraping.pool_drivers import caminho_chromedriver
+from scraping.cliente_http import buscar_paginas
+from scraping.cache_paginas import cache_paginas
+from scraping.checkpoint import Checkpoint
+from scraping.parsers import ler_tabela_classificacao, tem_secao_classificacao
+from scraping.estagio_parse import PARSER_WORKERS, EstagioParse
+from scraping.limitador import TENTATIVAS, limitador, resumo_limitadores
+from metricas import metricas, log
+from scraping.carregamento_enxuto import (
+    CARREGAMENTO_ENXUTO, ALVO_CLASSIFICACAO, configurar_opcoes, bloquear_recursos, abrir_pagina
+)
+
 # Carrega as variáveis de ambiente
 load_dotenv(find_dotenv())
 
@@ -18,10 +32,21 @@ ARQUIVO_BRASILEIRAO_RAW = os.getenv("ARQUIVO_BRASILEIRAO_RAW")
 BRASILEIRAO_SCRAPER = os.getenv("BRASILEIRAO_SCRAPER")
 USER_AGENT = os.getenv("USER_AGENT")
 
-# Configuração de tempos de espera
+# Espera fixa pelo carregamento, usada só com CARREGAMENTO_ENXUTO=0
+# (o intervalo entre requisições é controlado por scraping.limitador)
 ATRASO_MINIMO = 3
 ATRASO_MAXIMO = 6
 
+# Modo de coleta: "http" baixa as páginas diretamente e só usa o Selenium como fallback
+MODO_COLETA = os.getenv("MODO_COLETA", "http")
+
+# Intervalo de temporadas coletadas (por padrão, até a última temporada encerrada)
+ANO_INICIAL = int(os.getenv("ANO_INICIAL", 2015))
+ANO_FINAL = int(os.getenv("ANO_FINAL", datetime.now().year - 1))
+
+# Número de clubes por temporada, usado para detectar temporadas incompletas no CSV
+CLUBES_POR_TEMPORADA = 20
+
 # Número de colunas da tabela que queremos extrair (antes de adicionar a coluna "Ano")
 TARGET_COLS = 10  # Queremos as 10 primeiras colunas
 
@@ -36,50 +61,90 @@ def configurar_driver():
     chrome_options.add_experimental_option("prefs", {
         "profile.default_content_setting_values.notifications": 2
     })
+    configurar_opcoes(chrome_options)
 
-    service = Service(ChromeDriverManager().install())
+    service = Service(caminho_chromedriver())
     driver = webdriver.Chrome(service=service, options=chrome_options)
-    return driver
+    return bloquear_recursos(driver)
 
-def extrair_tabela(driver, ano):
+def baixar_tabela(driver, ano, tentativas=TENTATIVAS):
+    """
+    Acessa a página para o ano informado com o navegador e retorna o HTML, sem analisá-lo
+    (o parsing fica com o EstagioParse, em paralelo com os próximos acessos).
+    O ritmo dos acessos é controlado pelo limitador do host; páginas sem a seção "Classificação"
+    ou com erro contam como falha e são tentadas de novo, até `tentativas` vezes.
+    Retorna None se todas as tentativas falharem.
     """
-    Acessa a página para o ano informado e extrai a tabela de classificação.
+    url = BRASILEIRAO_SCRAPER.format(ano)
+    controle = limitador(url)
+    for _ in range(tentativas):
+        controle.aguardar()
+        log("INFO", f"Acessando URL: {url}")
+        try:
+            if CARREGAMENTO_ENXUTO:
+                with metricas().cronometro("fetch", url):
+                    abrir_pagina(driver, url, ALVO_CLASSIFICACAO)
+            else:
+                with metricas().cronometro("fetch", url):
+                    driver.get(url)
+                time.sleep(random.uniform(ATRASO_MINIMO, ATRASO_MAXIMO))
+            html = driver.page_source
+        except Exception as e:
+            controle.registrar_falha(f"erro no navegador em {url}: {e.__class__.__name__}")
+            continue
+
+        if tem_secao_classificacao(html):
+            controle.registrar_sucesso()
+            return html
+        controle.registrar_falha(f"página sem a tabela em {url}")
+
+    log("ERRO", f"Ano {ano} falhou após {tentativas} tentativa(s).")
+    return None
+
+def classe_temporada(ano):
+    """Classe de cache da página do ano: temporadas encerradas nunca expiram."""
+    return "temporada_fechada" if ano < datetime.now().year else "temporada_atual"
+
+def analisar_tabela(html, ano, backend=None):
+    """
+    Extrai a tabela de classificação do HTML (str ou bytes) da página do ano informado.
     Se a coluna "Classificação ou descenso" existir, ela é removida.
     São extraídas exatamente as primeiras TARGET_COLS colunas da tabela.
     Ao final, é adicionada a coluna "Ano".
-    Retorna (headers, rows).
+    `backend` escolhe o parser (ver scraping.parsers); por padrão, BACKEND_PARSER.
+    Retorna (headers, rows); headers é None se a tabela não estiver na página.
     """
-    url = BRASILEIRAO_SCRAPER.format(ano)
-    print(f"[INFO] Acessando URL: {url}")
-    driver.get(url)
-    time.sleep(random.uniform(ATRASO_MINIMO, ATRASO_MAXIMO))
-    soup = BeautifulSoup(driver.page_source, "html.parser")
-
-    secao_classificacao = soup.find("h2", id="Classificação")
-    if not secao_classificacao:
-        print(f"[ALERTA] Seção 'Classificação' não encontrada para o ano {ano}")
+    with metricas().cronometro("parse"):
+        secao_encontrada, tabela = ler_tabela_classificacao(html, backend)
+    if not secao_encontrada:
+        log("ALERTA", f"Seção 'Classificação' não encontrada para o ano {ano}")
         return None, []
 
-    tabela = secao_classificacao.find_next("table", {"class": "wikitable"})
-    if not tabela:
-        print(f"[ALERTA] Tabela de classificação não encontrada para o ano {ano}")
+    if tabela is None:
+        log("ALERTA", f"Tabela de classificação não encontrada para o ano {ano}")
         return None, []
 
-    header_row = tabela.find("tr")
-    raw_headers = [th.get_text(strip=True) for th in header_row.find_all("th")]
+    with metricas().cronometro("extracao"):
+        headers, rows = _extrair_linhas(tabela, ano)
+    metricas().contar_linhas("extracao", len(rows))
+    log("INFO", f"Extraído {len(rows)} linhas para o ano {ano}")
+    return headers, rows
+
+def _extrair_linhas(tabela, ano):
+    """Aplica o corte de colunas e acrescenta o ano às linhas lidas da tabela."""
+    raw_headers, linhas = tabela
 
     # Se a coluna indesejada estiver presente, guarda seu índice e remove-a
     index_classificacao = raw_headers.index("Classificação ou descenso") if "Classificação ou descenso" in raw_headers else None
     if index_classificacao is not None:
         raw_headers.pop(index_classificacao)
-        print(f"[INFO] Removendo a coluna 'Classificação ou descenso' dos cabeçalhos para o ano {ano}.")
+        log("INFO", f"Removendo a coluna 'Classificação ou descenso' dos cabeçalhos para o ano {ano}.")
 
     # Força a pegar somente as primeiras TARGET_COLS colunas e adiciona "Ano"
     headers = raw_headers[:TARGET_COLS] + ["Ano"]
 
     rows = []
-    for row in tabela.find_all("tr")[1:]:
-        raw_cells = [cell.get_text(strip=True) for cell in row.find_all(["th", "td"])]
+    for raw_cells in linhas:
         # Se a coluna indesejada existia, remove a célula correspondente (se houver)
         if index_classificacao is not None and len(raw_cells) > index_classificacao:
             raw_cells.pop(index_classificacao)
@@ -91,31 +156,119 @@ def extrair_tabela(driver, ano):
         # Adiciona o ano
         row_cells.append(str(ano))
         rows.append(row_cells)
-
-    print(f"[INFO] Extraído {len(rows)} linhas para o ano {ano}")
     return headers, rows
 
-def coletar_dados():
+def coletar_dados(modo=MODO_COLETA, anos=None, checkpoint=None, workers=PARSER_WORKERS):
     """
-    Itera de 2015 a 2024, extraindo a tabela de cada ano e acumulando os dados.
+    Itera pelos anos informados (padrão: ANO_INICIAL a ANO_FINAL), extraindo a tabela de cada ano e acumulando os dados.
+    Páginas válidas no cache de páginas não são baixadas novamente.
+    No modo "http", as temporadas restantes são baixadas em paralelo e o navegador
+    só é aberto para os anos cuja tabela não veio no HTML.
+    O parsing roda em `workers` processos (EstagioParse): cada página é analisada assim que chega,
+    enquanto as próximas ainda estão sendo baixadas.
+    Com um checkpoint, cada ano é gravado em disco assim que termina e os anos já concluídos são pulados.
     Retorna (header_final, dados_gerais).
     """
-    driver = configurar_driver()
+    cache = cache_paginas()
+    anos = list(anos) if anos is not None else list(range(ANO_INICIAL, ANO_FINAL + 1))
+    pendentes = [ano for ano in anos if checkpoint is None or not checkpoint.concluido(ano)]
+    urls = {ano: BRASILEIRAO_SCRAPER.format(ano) for ano in pendentes}
+    baixadas = {}  # Páginas baixadas nesta execução, salvas no cache se tiverem a tabela
+
+    def ao_concluir(chave, resultado):
+        ano = chave[0]
+        headers, rows = resultado
+        html = baixadas.pop(chave, None)
+        if headers is not None and html is not None:
+            cache.salvar(urls[ano], html)
+        if rows and checkpoint is not None:
+            checkpoint.registrar(ano, rows, headers)
+
+    def enviar(estagio, chave, html):
+        if chave[1] != "cache":
+            baixadas[chave] = html
+        estagio.enviar(chave, html, chave[0])
+
+    with EstagioParse(analisar_tabela, workers, ao_concluir=ao_concluir) as estagio:
+        # Páginas do cache vão direto para o parsing
+        a_baixar = []
+        for ano in pendentes:
+            html = cache.obter(urls[ano], classe_temporada(ano))
+            if html is not None:
+                enviar(estagio, (ano, "cache"), html)
+            else:
+                a_baixar.append(ano)
+
+        # Páginas baixadas entram no parsing à medida que chegam
+        if modo == "http" and a_baixar and not cache.somente_replay:
+            def ao_receber(indice, html):
+                if html:
+                    enviar(estagio, (a_baixar[indice], "http"), html)
+            buscar_paginas((urls[ano] for ano in a_baixar), ao_receber=ao_receber)
+
+        resultados = {}
+        for ano in pendentes:
+            resultados[ano] = estagio.resultado((ano, "cache")) or estagio.resultado((ano, "http"), (None, []))
+
+        # Anos cuja tabela não veio no HTML: o navegador baixa, o parsing continua no pool
+        sem_tabela = [ano for ano in pendentes if resultados[ano][0] is None]
+        if sem_tabela and not cache.somente_replay:
+            driver = configurar_driver()
+            for ano in sem_tabela:
+                if modo == "http":
+                    log("INFO", f"Usando o navegador para o ano {ano}")
+                html = baixar_tabela(driver, ano)
+                if html is not None:
+                    enviar(estagio, (ano, "navegador"), html)
+            driver.quit()
+            for ano in sem_tabela:
+                resultados[ano] = estagio.resultado((ano, "navegador"), resultados[ano])
+    resumo_limitadores()
+
     dados_gerais = []
     header_final = None
-
-    for ano in range(2015, 2025):
-        headers, rows = extrair_tabela(driver, ano)
+    for ano in pendentes:
+        headers, rows = resultados[ano]
         if rows:
             if header_final is None:
                 header_final = headers
             dados_gerais.extend(rows)
         else:
-            print(f"[ALERTA] Nenhum dado encontrado para o ano {ano}")
-        time.sleep(random.uniform(ATRASO_MINIMO, ATRASO_MAXIMO))
-    driver.quit()
+            log("ALERTA", f"Nenhum dado encontrado para o ano {ano}")
+
+    if checkpoint is not None:
+        # Junta o que foi coletado agora com o que já estava gravado, na ordem dos anos
+        colunas, unidades = checkpoint.carregar()
+        header_final = header_final or colunas
+        dados_gerais = [linha for ano in anos for linha in unidades.get(str(ano), [])]
     return header_final, dados_gerais
 
+def anos_desatualizados(anos):
+    """
+    Compara os anos pedidos com o CSV bruto existente e retorna os que precisam ser coletados:
+    anos ausentes, incompletos (menos de CLUBES_POR_TEMPORADA linhas) ou ainda em andamento.
+    """
+    if not ARQUIVO_BRASILEIRAO_RAW or not os.path.exists(ARQUIVO_BRASILEIRAO_RAW):
+        return list(anos)
+    df = pd.read_csv(ARQUIVO_BRASILEIRAO_RAW, sep=";", dtype=str)
+    linhas_por_ano = pd.to_numeric(df["Ano"], errors="coerce").value_counts()
+    ano_atual = datetime.now().year
+    return [ano for ano in anos if linhas_por_ano.get(ano, 0) < CLUBES_POR_TEMPORADA or ano >= ano_atual]
+
+def mesclar_com_existente(headers, dados):
+    """
+    Junta as linhas recém-coletadas às do CSV bruto existente.
+    Anos presentes nos novos dados substituem os antigos; os demais são mantidos.
+    """
+    if not ARQUIVO_BRASILEIRAO_RAW or not os.path.exists(ARQUIVO_BRASILEIRAO_RAW):
+        return headers, dados
+    df = pd.read_csv(ARQUIVO_BRASILEIRAO_RAW, sep=";", dtype=str).fillna("")
+    headers = headers or list(df.columns)
+    indice_ano = headers.index("Ano")
+    anos_novos = {str(linha[indice_ano]) for linha in dados}
+    mantidos = df[~df["Ano"].isin(anos_novos)]
+    return headers, mantidos[headers].values.tolist() + dados
+
 def corrigir_saldo_gols(valor):
     """
     Corrige os valores de saldo de gols (SG), garantindo que os números negativos sejam mantidos.
@@ -127,15 +280,50 @@ def corrigir_saldo_gols(valor):
     return "0"
 
 def salvar_dados(headers, dados):
-    """Salva os dados extraídos em um arquivo CSV formatado."""
+    """Salva os dados extraídos em um arquivo CSV formatado. Retorna True se o CSV foi gravado."""
     if not dados:
-        print("[ERRO] Nenhum dado extraído!")
-        return
+        log("ERRO", "Nenhum dado extraído!")
+        return False
     df = pd.DataFrame(dados, columns=headers)
     df.sort_values(by=["Ano"], inplace=True)
-    df.to_csv(ARQUIVO_BRASILEIRAO_RAW, sep=";", index=False, encoding="utf-8")
-    print(f"[INFO] Dados corrigidos e salvos em {ARQUIVO_BRASILEIRAO_RAW}")
+    with metricas().cronometro("escrita"):
+        df.to_csv(ARQUIVO_BRASILEIRAO_RAW, sep=";", index=False, encoding="utf-8")
+    metricas().contar_linhas("escrita", len(df))
+    log("INFO", f"Dados corrigidos e salvos em {ARQUIVO_BRASILEIRAO_RAW}")
+    return True
+
+def executar(modo=MODO_COLETA, anos=None, offline=False, retomar=False, incremental=False):
+    """Coleta os anos pedidos (padrão: ANO_INICIAL a ANO_FINAL) e salva o CSV bruto."""
+    if offline:
+        cache_paginas().somente_replay = True
+
+    anos = list(anos) if anos is not None else list(range(ANO_INICIAL, ANO_FINAL + 1))
+    if incremental:
+        anos = anos_desatualizados(anos)
+        log("INFO", f"Anos a coletar: {anos}")
+
+    checkpoint = Checkpoint(ARQUIVO_BRASILEIRAO_RAW, retomar=retomar)
+    header_final, dados = coletar_dados(modo, anos, checkpoint)
+    if incremental:
+        header_final, dados = mesclar_com_existente(header_final, dados)
+    # Sem CSV gravado, o checkpoint é mantido para a coleta poder ser retomada
+    if salvar_dados(header_final, dados):
+        checkpoint.finalizar()
 
 if __name__ == "__main__":
-    header_final, dados = coletar_dados()
-    salvar_dados(header_final, dados)
+    parser = argparse.ArgumentParser(description="Coleta as tabelas do Brasileirão na Wikipédia.")
+    parser.add_argument("--modo", choices=["http", "selenium"], default=MODO_COLETA,
+                        help="http: baixa direto e usa o navegador só como fallback")
+    parser.add_argument("--offline", action="store_true",
+                        help="Usa somente as páginas já salvas no cache, sem acessar a rede")
+    parser.add_argument("--ano-inicial", type=int, default=ANO_INICIAL)
+    parser.add_argument("--ano-final", type=int, default=ANO_FINAL)
+    parser.add_argument("--resume", action="store_true",
+                        help="Retoma uma coleta interrompida a partir do último checkpoint")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Coleta somente os anos ausentes ou desatualizados no CSV bruto")
+    args = parser.parse_args()
+
+    executar(args.modo, range(args.ano_inicial, args.ano_final + 1), offline=args.offline,
+             retomar=args.resume, incremental=args.incremental)
+    metricas().exportar("coleta_brasileirao")
@@ -0,0 +1,172 @@
+import os
+import sys
+import gzip
+import time
+import sqlite3
+import hashlib
+import threading
+from dotenv import load_dotenv, find_dotenv
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from metricas import metricas
+
+# Carrega as variáveis de ambiente
+load_dotenv(find_dotenv())
+
+# Configuração do cache de páginas
+CACHE_PAGINAS_DIR = os.getenv("CACHE_PAGINAS_DIR", os.path.join("data", "cache", "paginas"))
+CACHE_PAGINAS_MAX_MB = float(os.getenv("CACHE_PAGINAS_MAX_MB", 500))
+CACHE_PAGINAS_ATIVO = os.getenv("CACHE_PAGINAS_ATIVO", "1").lower() not in ("0", "false", "nao", "não")
+CACHE_SOMENTE_REPLAY = os.getenv("CACHE_SOMENTE_REPLAY", "0").lower() in ("1", "true", "sim")
+
+# Validade (em segundos) de cada classe de página; None = nunca expira
+TTL_POR_CLASSE = {
+    "temporada_fechada": None,  # Tabelas de temporadas encerradas não mudam mais
+    "temporada_atual": float(os.getenv("CACHE_TTL_TEMPORADA_ATUAL_H", 6)) * 3600,
+    "transferencias": float(os.getenv("CACHE_TTL_TRANSFERENCIAS_H", 24)) * 3600,
+}
+
+class CachePaginas:
+    """
+    Cache persistente de páginas HTML.
+    O conteúdo é guardado comprimido (gzip) e endereçado pelo seu hash SHA-256, de modo que
+    páginas idênticas ocupam espaço uma única vez. Um índice SQLite associa cada
+    (URL, data da coleta) ao conteúdo e guarda o último acesso, usado na remoção LRU
+    quando o tamanho total ultrapassa `tamanho_maximo_mb`.
+    """
+
+    def __init__(self, diretorio=CACHE_PAGINAS_DIR, tamanho_maximo_mb=CACHE_PAGINAS_MAX_MB,
+                 somente_replay=CACHE_SOMENTE_REPLAY):
+        self.diretorio = diretorio
+        self.tamanho_maximo = int(tamanho_maximo_mb * 1024 * 1024)
+        self.somente_replay = somente_replay
+        self._trava = threading.Lock()
+
+        os.makedirs(os.path.join(diretorio, "objetos"), exist_ok=True)
+        self._conexao = sqlite3.connect(os.path.join(diretorio, "indice.sqlite"), check_same_thread=False)
+        self._conexao.execute("""
+            CREATE TABLE IF NOT EXISTS paginas (
+                url TEXT NOT NULL,
+                coletado_em REAL NOT NULL,
+                hash TEXT NOT NULL,
+                tamanho INTEGER NOT NULL,
+                ultimo_acesso REAL NOT NULL,
+                PRIMARY KEY (url, coletado_em)
+            )
+        """)
+        self._conexao.commit()
+
+    def _caminho_objeto(self, hash_conteudo):
+        return os.path.join(self.diretorio, "objetos", hash_conteudo[:2], f"{hash_conteudo}.html.gz")
+
+    def obter(self, url, classe=None, data=None):
+        """
+        Retorna o conteúdo (bytes) mais recente da URL, ou None se não houver versão válida.
+        `classe` define a validade (TTL_POR_CLASSE); no modo somente replay a validade é ignorada.
+        `data` (AAAA-MM-DD) busca a versão coletada naquele dia.
+        """
+        conteudo = self._ler(url, classe, data)
+        metricas().contar("cache_acertos" if conteudo is not None else "cache_falhas")
+        return conteudo
+
+    def _ler(self, url, classe, data):
+        with self._trava:
+            consulta = "SELECT coletado_em, hash FROM paginas WHERE url = ?"
+            parametros = [url]
+            if data is not None:
+                consulta += " AND date(coletado_em, 'unixepoch', 'localtime') = ?"
+                parametros.append(data)
+            linha = self._conexao.execute(consulta + " ORDER BY coletado_em DESC LIMIT 1", parametros).fetchone()
+            if linha is None:
+                return None
+
+            coletado_em, hash_conteudo = linha
+            ttl = TTL_POR_CLASSE.get(classe)
+            if ttl is not None and data is None and not self.somente_replay and time.time() - coletado_em > ttl:
+                return None
+
+            try:
+                with gzip.open(self._caminho_objeto(hash_conteudo), "rb") as arquivo:
+                    conteudo = arquivo.read()
+            except (OSError, EOFError):
+                self._conexao.execute("DELETE FROM paginas WHERE hash = ?", (hash_conteudo,))
+                self._conexao.commit()
+                return None
+
+            self._conexao.execute(
+                "UPDATE paginas SET ultimo_acesso = ? WHERE url = ? AND coletado_em = ?",
+                (time.time(), url, coletado_em),
+            )
+            self._conexao.commit()
+            return conteudo
+
+    def salvar(self, url, conteudo):
+        """Guarda uma nova versão da página e aplica o limite de tamanho do cache."""
+        if isinstance(conteudo, str):
+            conteudo = conteudo.encode("utf-8")
+        hash_conteudo = hashlib.sha256(conteudo).hexdigest()
+        caminho = self._caminho_objeto(hash_conteudo)
+
+        with self._trava:
+            if not os.path.exists(caminho):
+                os.makedirs(os.path.dirname(caminho), exist_ok=True)
+                temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with gzip.open(temporario, "wb") as arquivo:
+                    arquivo.write(conteudo)
+                os.replace(temporario, caminho)
+
+            agora = time.time()
+            self._conexao.execute(
+                "INSERT OR REPLACE INTO paginas VALUES (?, ?, ?, ?, ?)",
+                (url, agora, hash_conteudo, os.path.getsize(caminho), agora),
+            )
+            self._conexao.commit()
+            self._aplicar_limite()
+
+    def _tamanho_total(self):
+        return self._conexao.execute(
+            "SELECT COALESCE(SUM(tamanho), 0) FROM (SELECT DISTINCT hash, tamanho FROM paginas)"
+        ).fetchone()[0]
+
+    def _aplicar_limite(self):
+        """Remove as versões acessadas há mais tempo até o cache caber no limite."""
+        tamanho = self._tamanho_total()
+        if tamanho <= self.tamanho_maximo:
+            return
+
+        antigas = self._conexao.execute(
+            "SELECT url, coletado_em, hash, tamanho FROM paginas ORDER BY ultimo_acesso ASC"
+        ).fetchall()
+        for url, coletado_em, hash_conteudo, tamanho_objeto in antigas:
+            if tamanho <= self.tamanho_maximo:
+                break
+            self._conexao.execute("DELETE FROM paginas WHERE url = ? AND coletado_em = ?", (url, coletado_em))
+            em_uso = self._conexao.execute("SELECT 1 FROM paginas WHERE hash = ? LIMIT 1", (hash_conteudo,)).fetchone()
+            if em_uso is None:
+                try:
+                    os.remove(self._caminho_objeto(hash_conteudo))
+                except OSError:
+                    pass
+                tamanho -= tamanho_objeto
+        self._conexao.commit()
+
+class CacheDesativado:
+    """Substituto sem efeito, usado quando CACHE_PAGINAS_ATIVO=0."""
+    somente_replay = False
+
+    def obter(self, url, classe=None, data=None):
+        return None
+
+    def salvar(self, url, conteudo):
+        pass
+
+_cache = None
+_trava_cache = threading.Lock()
+
+def cache_paginas():
+    """Retorna o cache de páginas compartilhado pelo processo."""
+    global _cache
+    with _trava_cache:
+        if _cache is None:
+            _cache = CachePaginas() if CACHE_PAGINAS_ATIVO else CacheDesativado()
+        return _cache
@@ -0,0 +1,80 @@
+import os
+import sys
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from dotenv import load_dotenv, find_dotenv
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from metricas import log
+
+# Carrega as variáveis de ambiente
+load_dotenv(find_dotenv())
+
+# "Carregamento enxuto": bloqueia recursos dispensáveis e espera apenas o elemento necessário,
+# em vez de carregar a página inteira e aguardar um intervalo fixo
+CARREGAMENTO_ENXUTO = os.getenv("CARREGAMENTO_ENXUTO", "1") == "1"
+
+# Tempo máximo (s) de espera pelo elemento alvo de cada página
+TIMEOUT_PAGINA = float(os.getenv("TIMEOUT_PAGINA", 30))
+
+# Recursos que não fazem parte do HTML das tabelas: imagens, fontes, mídia, anúncios e rastreadores
+URLS_BLOQUEADAS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3",
+    "*doubleclick.net*", "*googlesyndication.com*", "*googletagmanager.com*", "*google-analytics.com*",
+    "*googletagservices.com*", "*adservice.google.*", "*amazon-adsystem.com*", "*facebook.net*",
+    "*scorecardresearch.com*", "*criteo.*", "*taboola.com*", "*outbrain.com*", "*adnxs.com*",
+]
+
+# Elementos que indicam que a página já tem o que o scraper lê: o título da seção e a tabela seguinte
+ALVO_CLASSIFICACAO = "//h2[@id='Classificação']/following::table[contains(concat(' ', normalize-space(@class), ' '), ' wikitable ')]"
+ALVO_TRANSFERENCIAS = "//h2[contains(concat(' ', normalize-space(@class), ' '), ' content-box-headline ')]/following::table"
+
+def configurar_opcoes(chrome_options):
+    """
+    Ajusta as opções do Chrome para o carregamento enxuto: estratégia "eager" (o driver devolve
+    o controle no DOMContentLoaded) e imagens desativadas. Sem efeito se o modo estiver desligado.
+    """
+    if not CARREGAMENTO_ENXUTO:
+        return chrome_options
+    chrome_options.page_load_strategy = "eager"
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    return chrome_options
+
+def bloquear_recursos(driver):
+    """Bloqueia, via DevTools, as requisições de URLS_BLOQUEADAS no driver informado."""
+    if not CARREGAMENTO_ENXUTO:
+        return driver
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": URLS_BLOQUEADAS})
+    except (WebDriverException, AttributeError) as e:
+        log("ALERTA", f"Não foi possível bloquear recursos no navegador: {e}")
+    driver.set_page_load_timeout(TIMEOUT_PAGINA)
+    return driver
+
+def aguardar_alvo(driver, xpath, timeout=TIMEOUT_PAGINA):
+    """
+    Espera até que o elemento `xpath` exista na página, retornando assim que ele aparecer.
+    Retorna False se o tempo esgotar (a página é analisada mesmo assim, e o parser decide).
+    """
+    try:
+        WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.XPATH, xpath)))
+        return True
+    except TimeoutException:
+        log("ALERTA", f"Elemento alvo não apareceu em {timeout:g}s: {driver.current_url}")
+        return False
+
+def abrir_pagina(driver, url, xpath, timeout=TIMEOUT_PAGINA):
+    """
+    Abre `url` e retorna assim que o elemento alvo estiver presente (ou o tempo esgotar).
+    Se o carregamento passar do limite, interrompe o que faltar e segue com o DOM já disponível.
+    """
+    try:
+        driver.get(url)
+    except TimeoutException:
+        driver.execute_script("window.stop();")
+    return aguardar_alvo(driver, xpath, timeout)
@@ -0,0 +1,84 @@
+import os
+import sys
+import json
+import threading
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from metricas import log
+
+class Checkpoint:
+    """
+    Grava em disco, de forma incremental, as linhas de cada unidade coletada (ano ou clube).
+    As linhas vão para `<saida>.parcial.jsonl` (somente acréscimo, uma unidade por linha) e o
+    manifesto `<saida>.checkpoint.json` registra as unidades concluídas, permitindo retomar
+    uma coleta interrompida sem refazer o que já foi salvo.
+    """
+
+    def __init__(self, caminho_saida, retomar=False):
+        self.caminho_parcial = f"{caminho_saida}.parcial.jsonl"
+        self.caminho_manifesto = f"{caminho_saida}.checkpoint.json"
+        self._trava = threading.Lock()
+
+        if retomar and os.path.exists(self.caminho_manifesto):
+            with open(self.caminho_manifesto, encoding="utf-8") as arquivo:
+                self.manifesto = json.load(arquivo)
+            log("INFO", f"Retomando coleta: {len(self.manifesto['concluidos'])} unidade(s) já concluída(s).")
+        else:
+            self.manifesto = {"iniciado_em": datetime.now().isoformat(timespec="seconds"),
+                              "colunas": None, "concluidos": []}
+            if os.path.exists(self.caminho_parcial):
+                os.remove(self.caminho_parcial)
+        self._concluidos = set(self.manifesto["concluidos"])
+
+    def concluido(self, chave):
+        """Retorna True se a unidade já foi gravada em uma execução anterior."""
+        return str(chave) in self._concluidos
+
+    def registrar(self, chave, linhas, colunas=None):
+        """Acrescenta as linhas da unidade ao arquivo parcial e a marca como concluída."""
+        chave = str(chave)
+        with self._trava:
+            diretorio = os.path.dirname(self.caminho_parcial)
+            if diretorio:
+                os.makedirs(diretorio, exist_ok=True)
+            with open(self.caminho_parcial, "a", encoding="utf-8") as arquivo:
+                arquivo.write(json.dumps({"chave": chave, "linhas": linhas}, ensure_ascii=False) + "\n")
+                arquivo.flush()
+                os.fsync(arquivo.fileno())
+
+            if colunas is not None and self.manifesto["colunas"] is None:
+                self.manifesto["colunas"] = list(colunas)
+            if chave not in self._concluidos:
+                self._concluidos.add(chave)
+                self.manifesto["concluidos"].append(chave)
+            self._salvar_manifesto()
+
+    def _salvar_manifesto(self):
+        temporario = f"{self.caminho_manifesto}.tmp"
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            json.dump(self.manifesto, arquivo, ensure_ascii=False, indent=2)
+        os.replace(temporario, self.caminho_manifesto)
+
+    def carregar(self):
+        """
+        Lê as linhas gravadas das unidades concluídas.
+        Retorna (colunas, {chave: linhas}); registros incompletos (ex.: queda durante a escrita) são ignorados.
+        """
+        unidades = {}
+        if os.path.exists(self.caminho_parcial):
+            with open(self.caminho_parcial, encoding="utf-8") as arquivo:
+                for linha in arquivo:
+                    try:
+                        registro = json.loads(linha)
+                    except json.JSONDecodeError:
+                        continue
+                    if registro["chave"] in self._concluidos:
+                        unidades[registro["chave"]] = registro["linhas"]
+        return self.manifesto["colunas"], unidades
+
+    def finalizar(self):
+        """Remove os arquivos de checkpoint depois que a saída final foi salva."""
+        for caminho in (self.caminho_parcial, self.caminho_manifesto):
+            if os.path.exists(caminho):
+                os.remove(caminho)
@@ -0,0 +1,100 @@
+import os
+import sys
+import asyncio
+from urllib.parse import urlparse
+import httpx
+from dotenv import load_dotenv, find_dotenv
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scraping.limitador import TENTATIVAS, STATUS_TEMPORARIOS, limitador, ler_retry_after
+from metricas import metricas, log
+
+# Carrega as variáveis de ambiente
+load_dotenv(find_dotenv())
+
+USER_AGENT = os.getenv("USER_AGENT")
+
+# Limites do cliente HTTP
+CONCORRENCIA_HTTP = int(os.getenv("CONCORRENCIA_HTTP", 16))  # Conexões abertas no total
+LIMITE_HTTP_POR_HOST = int(os.getenv("LIMITE_HTTP_POR_HOST", 4))  # Requisições simultâneas por host
+TIMEOUT_HTTP = float(os.getenv("TIMEOUT_HTTP", 20))  # Segundos
+
+def criar_cliente(concorrencia=CONCORRENCIA_HTTP, timeout=TIMEOUT_HTTP):
+    """Cria um cliente assíncrono com pool de conexões keep-alive."""
+    return httpx.AsyncClient(
+        headers={"User-Agent": USER_AGENT} if USER_AGENT else None,
+        follow_redirects=True,
+        timeout=timeout,
+        limits=httpx.Limits(max_connections=concorrencia, max_keepalive_connections=concorrencia),
+    )
+
+async def buscar_pagina(cliente, url, semaforo, tentativas=TENTATIVAS):
+    """
+    Baixa uma página e retorna o conteúdo em bytes, ou None em caso de falha.
+    Cada requisição espera a vaga do limitador do host; 429/5xx, timeouts e respostas vazias
+    reduzem a taxa do host e são tentados de novo, até `tentativas` vezes.
+    """
+    controle = limitador(url)
+    async with semaforo:
+        for tentativa in range(1, tentativas + 1):
+            await controle.aguardar_async()
+            try:
+                with metricas().cronometro("fetch", url):
+                    resposta = await cliente.get(url)
+            except httpx.TimeoutException:
+                metricas().contar("http_timeout")
+                controle.registrar_falha(f"timeout em {url}")
+                continue
+            except httpx.HTTPError as e:
+                log("ALERTA", f"Falha HTTP em {url}: {e!r}")
+                return None
+
+            metricas().contar(f"http_{resposta.status_code}")
+            if resposta.status_code in STATUS_TEMPORARIOS:
+                controle.registrar_falha(f"HTTP {resposta.status_code} em {url}",
+                                         ler_retry_after(resposta.headers.get("Retry-After")))
+                continue
+            if resposta.is_error:
+                log("ALERTA", f"Falha HTTP em {url}: status {resposta.status_code}")
+                return None
+            if not resposta.content.strip():
+                controle.registrar_falha(f"página vazia em {url}")
+                continue
+
+            controle.registrar_sucesso()
+            return resposta.content
+
+        log("ERRO", f"{url} falhou após {tentativas} tentativa(s).")
+        return None
+
+async def buscar_paginas_async(urls, limite_por_host=LIMITE_HTTP_POR_HOST, cliente=None, ao_receber=None):
+    """
+    Baixa todas as URLs concorrentemente, respeitando `limite_por_host` requisições por host.
+    `ao_receber(indice, conteudo)`, se informado, é chamado assim que cada página chega (em uma
+    thread auxiliar, para que uma fila cheia do lado de quem consome não trave os downloads).
+    Retorna uma lista de bytes (ou None) na mesma ordem de `urls`.
+    """
+    semaforos = {}
+    for url in urls:
+        host = urlparse(url).netloc
+        if host not in semaforos:
+            semaforos[host] = asyncio.Semaphore(limite_por_host)
+
+    async def baixar(cliente_ativo, indice, url):
+        conteudo = await buscar_pagina(cliente_ativo, url, semaforos[urlparse(url).netloc])
+        if ao_receber is not None:
+            await asyncio.to_thread(ao_receber, indice, conteudo)
+        return conteudo
+
+    async def executar(cliente_ativo):
+        tarefas = [baixar(cliente_ativo, indice, url) for indice, url in enumerate(urls)]
+        return await asyncio.gather(*tarefas)
+
+    if cliente is not None:
+        return await executar(cliente)
+    async with criar_cliente() as novo_cliente:
+        return await executar(novo_cliente)
+
+def buscar_paginas(urls, limite_por_host=LIMITE_HTTP_POR_HOST, ao_receber=None):
+    """Versão síncrona de buscar_paginas_async, para uso direto nos scrapers."""
+    return asyncio.run(buscar_paginas_async(list(urls), limite_por_host, ao_receber=ao_receber))
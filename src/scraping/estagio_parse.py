@@ -0,0 +1,109 @@
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, Future
+from dotenv import load_dotenv, find_dotenv
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from metricas import metricas, log
+
+# Carrega as variáveis de ambiente
+load_dotenv(find_dotenv())
+
+# Processos dedicados ao parsing das páginas (1 = parsing na própria thread, sem pool)
+PARSER_WORKERS = int(os.getenv("PARSER_WORKERS", os.cpu_count() or 1))
+
+# Páginas aguardando ou em parsing; acima disso, quem baixa espera (0 = 2 por worker)
+TAMANHO_FILA_PARSE = int(os.getenv("TAMANHO_FILA_PARSE", 0))
+
+def _executar_medido(funcao, args):
+    """Executa `funcao` em um worker e devolve, junto do resultado, as métricas registradas nele."""
+    registro = metricas()
+    registro.zerar()
+    resultado = funcao(*args)
+    return resultado, registro.capturar()
+
+class EstagioParse:
+    """
+    Estágio de parsing desacoplado da coleta: as páginas baixadas entram em uma fila limitada
+    e um pool de processos executa `funcao` sobre elas em paralelo, enquanto a rede segue baixando.
+    Quando a fila está cheia, `enviar` bloqueia quem baixa até um worker terminar (contrapressão).
+    `ao_concluir(chave, resultado)`, se informado, é chamado assim que cada página termina.
+    Os resultados são lidos por chave, então a ordem final não depende da ordem de conclusão.
+    """
+
+    def __init__(self, funcao, workers=PARSER_WORKERS, tamanho_fila=TAMANHO_FILA_PARSE, ao_concluir=None):
+        self.funcao = funcao
+        self.workers = max(1, workers)
+        self.ao_concluir = ao_concluir
+        self._vagas = threading.BoundedSemaphore(tamanho_fila or 2 * self.workers)
+        self._futuros = {}
+        self._executor = None
+
+    def __enter__(self):
+        if self.workers > 1:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self
+
+    def __exit__(self, *exc):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=exc[0] is not None)
+        return False
+
+    def enviar(self, chave, *args):
+        """Agenda o parsing de uma página; bloqueia enquanto a fila estiver cheia."""
+        futuro = Future()
+        self._futuros[chave] = futuro
+        if self._executor is None:
+            try:
+                resultado = self.funcao(*args)
+            except Exception as e:
+                futuro.set_exception(e)
+            else:
+                self._concluir(chave, futuro, resultado)
+            return futuro
+
+        self._vagas.acquire()
+        try:
+            medido = self._executor.submit(_executar_medido, self.funcao, args)
+        except Exception:
+            self._vagas.release()
+            raise
+        medido.add_done_callback(lambda f: (self._vagas.release(), self._receber(chave, f, futuro)))
+        return futuro
+
+    def _receber(self, chave, medido, futuro):
+        """Separa o resultado das métricas do worker, que são somadas às do processo principal."""
+        if medido.cancelled():
+            futuro.cancel()
+            return
+        if medido.exception() is not None:
+            futuro.set_exception(medido.exception())
+            return
+        resultado, bruto = medido.result()
+        metricas().mesclar(bruto)
+        self._concluir(chave, futuro, resultado)
+
+    def _concluir(self, chave, futuro, resultado):
+        # ao_concluir roda antes de liberar o resultado: quem espera por ele já encontra o checkpoint gravado
+        if self.ao_concluir is not None:
+            try:
+                self.ao_concluir(chave, resultado)
+            except Exception as e:
+                log("ERRO", f"Falha ao registrar o resultado de {chave}: {e}")
+        futuro.set_result(resultado)
+
+    def resultado(self, chave, padrao=None):
+        """Espera e retorna o resultado da página `chave` (ou `padrao` se ela não foi enviada ou falhou)."""
+        futuro = self._futuros.get(chave)
+        if futuro is None:
+            return padrao
+        try:
+            return futuro.result()
+        except Exception as e:
+            log("ERRO", f"Falha no parsing de {chave}: {e!r}")
+            return padrao
+
+    def resultados(self, chaves, padrao=None):
+        """Resultados na ordem de `chaves`, independentemente da ordem em que terminaram."""
+        return [self.resultado(chave, padrao) for chave in chaves]
@@ -0,0 +1,149 @@
+import os
+import time
+import random
+import asyncio
+import sys
+import threading
+from urllib.parse import urlparse
+from dotenv import load_dotenv, find_dotenv
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from metricas import metricas, log
+
+# Carrega as variáveis de ambiente
+load_dotenv(find_dotenv())
+
+# Taxa de requisições por host (req/s): começa em TAXA_INICIAL e se ajusta entre TAXA_MINIMA e TAXA_MAXIMA
+TAXA_INICIAL = float(os.getenv("TAXA_INICIAL", 0.5))
+TAXA_MINIMA = float(os.getenv("TAXA_MINIMA", 0.05))
+TAXA_MAXIMA = float(os.getenv("TAXA_MAXIMA", 4))
+
+# AIMD: cada resposta saudável soma INCREMENTO_TAXA; cada falha multiplica a taxa por FATOR_REDUCAO
+INCREMENTO_TAXA = float(os.getenv("INCREMENTO_TAXA", 0.1))
+FATOR_REDUCAO = float(os.getenv("FATOR_REDUCAO", 0.5))
+
+# Pausa após falhas seguidas: BACKOFF_BASE * 2^(falhas - 1), limitada a BACKOFF_MAXIMO, com jitter
+BACKOFF_BASE = float(os.getenv("BACKOFF_BASE", 2))
+BACKOFF_MAXIMO = float(os.getenv("BACKOFF_MAXIMO", 120))
+
+# Número de tentativas por página antes de desistir
+TENTATIVAS = int(os.getenv("TENTATIVAS", 4))
+
+# Rajada máxima de requisições permitida depois de um período ocioso
+CAPACIDADE_RAJADA = float(os.getenv("CAPACIDADE_RAJADA", 1))
+
+# Status HTTP que indicam limitação ou instabilidade temporária do servidor
+STATUS_TEMPORARIOS = {429, 500, 502, 503, 504}
+
+class LimitadorHost:
+    """
+    Limitador adaptativo de um host: token bucket cuja taxa segue AIMD.
+    Respostas saudáveis aumentam a taxa aos poucos; 429/5xx, timeouts e páginas vazias
+    reduzem a taxa pela metade e pausam o host com backoff exponencial e jitter.
+    Pode ser usado por threads (aguardar) e por corrotinas (aguardar_async).
+    """
+
+    def __init__(self, host, taxa=TAXA_INICIAL, taxa_minima=TAXA_MINIMA, taxa_maxima=TAXA_MAXIMA,
+                 capacidade=CAPACIDADE_RAJADA, relogio=time.monotonic):
+        self.host = host
+        self.taxa = taxa
+        self.taxa_minima = taxa_minima
+        self.taxa_maxima = taxa_maxima
+        self.capacidade = capacidade
+        self._relogio = relogio
+        self._trava = threading.Lock()
+        self._proximo_teorico = relogio()  # Horário teórico da próxima vaga com o bucket vazio
+        self._pausado_ate = 0.0
+        self.falhas_seguidas = 0
+        self.sucessos = 0
+        self.falhas = 0
+
+    def reservar(self):
+        """
+        Reserva a próxima vaga de requisição e retorna quantos segundos esperar por ela.
+        As vagas são agendadas em sequência (token bucket na forma de horários teóricos), então
+        requisições que esperavam uma pausa saem espaçadas pela taxa, e não todas juntas.
+        """
+        with self._trava:
+            agora = self._relogio()
+            intervalo = 1 / self.taxa
+            rajada = (self.capacidade - 1) * intervalo
+            envio = max(agora, self._proximo_teorico - rajada, self._pausado_ate)
+            self._proximo_teorico = max(self._proximo_teorico, envio) + intervalo
+            return envio - agora
+
+    def aguardar(self):
+        """Bloqueia a thread até a próxima vaga do host."""
+        espera = self.reservar()
+        if espera > 0:
+            metricas().registrar_tempo("espera", espera)
+            time.sleep(espera)
+
+    async def aguardar_async(self):
+        """Versão assíncrona de aguardar."""
+        espera = self.reservar()
+        if espera > 0:
+            metricas().registrar_tempo("espera", espera)
+            await asyncio.sleep(espera)
+
+    def registrar_sucesso(self):
+        """Resposta saudável: aumento aditivo da taxa."""
+        with self._trava:
+            self.sucessos += 1
+            self.falhas_seguidas = 0
+            self.taxa = min(self.taxa_maxima, self.taxa + INCREMENTO_TAXA)
+            if self.sucessos % 10 == 0:
+                log("INFO", f"Limitador {self.host}: {self.sucessos} resposta(s) saudável(is); taxa {self.taxa:.2f} req/s")
+
+    def registrar_falha(self, motivo, retry_after=None):
+        """
+        Falha temporária: redução multiplicativa da taxa e pausa do host.
+        `retry_after` (segundos, se o servidor informou) tem prioridade sobre o backoff calculado.
+        Retorna a pausa aplicada, em segundos.
+        """
+        with self._trava:
+            self.falhas += 1
+            self.falhas_seguidas += 1
+            taxa_anterior = self.taxa
+            self.taxa = max(self.taxa_minima, self.taxa * FATOR_REDUCAO)
+            if retry_after is not None:
+                pausa = min(retry_after, BACKOFF_MAXIMO)
+            else:
+                pausa = min(BACKOFF_MAXIMO, BACKOFF_BASE * 2 ** (self.falhas_seguidas - 1))
+                pausa *= random.uniform(0.5, 1.5)  # Jitter: evita que os workers voltem todos juntos
+            self._pausado_ate = max(self._pausado_ate, self._relogio() + pausa)
+            metricas().contar("limitador_falhas")
+            log("ALERTA", f"Limitador {self.host}: {motivo}; taxa {taxa_anterior:.2f} → {self.taxa:.2f} req/s,"
+                          f" pausa de {pausa:.1f}s (falha {self.falhas_seguidas} seguida)")
+            return pausa
+
+    def estado(self):
+        """Resumo do estado do limitador, para os logs da execução."""
+        with self._trava:
+            return {"host": self.host, "taxa": round(self.taxa, 3), "sucessos": self.sucessos,
+                    "falhas": self.falhas, "falhas_seguidas": self.falhas_seguidas}
+
+_trava_limitadores = threading.Lock()
+_limitadores = {}
+
+def limitador(url):
+    """Retorna o limitador compartilhado do host de `url` (um por host, por processo)."""
+    host = urlparse(url).netloc or url
+    with _trava_limitadores:
+        if host not in _limitadores:
+            _limitadores[host] = LimitadorHost(host)
+        return _limitadores[host]
+
+def resumo_limitadores():
+    """Imprime o estado final de cada host usado na execução."""
+    with _trava_limitadores:
+        limitadores = list(_limitadores.values())
+    for item in limitadores:
+        log("INFO", f"Limitador: {item.estado()}")
+
+def ler_retry_after(valor):
+    """Converte o cabeçalho Retry-After (em segundos) para float; None se ausente ou em outro formato."""
+    try:
+        return max(0.0, float(valor)) if valor is not None else None
+    except ValueError:
+        return None
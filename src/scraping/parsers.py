@@ -0,0 +1,218 @@
+import os
+import re
+from bs4 import BeautifulSoup
+from dotenv import load_dotenv, find_dotenv
+
+try:
+    from lxml import etree
+except ImportError:  # lxml é opcional: sem ele, usa-se somente o BeautifulSoup
+    etree = None
+
+# Carrega as variáveis de ambiente
+load_dotenv(find_dotenv())
+
+# Backend de parsing: "auto" usa lxml quando disponível e BeautifulSoup caso contrário
+BACKEND_PARSER = os.getenv("BACKEND_PARSER", "auto")
+
+BACKENDS = ("lxml", "bs4")
+
+_RE_TAG_TABELA = re.compile(r"<(/?)table\b[^>]*>", re.IGNORECASE)
+_RE_CLASSE = re.compile(r"""\bclass\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.IGNORECASE)
+_RE_H2_CLASSIFICACAO = re.compile(r"""<h2\b[^>]*\bid\s*=\s*["']Classificação["'][^>]*>""", re.IGNORECASE)
+_RE_H2_TRANSFERENCIAS = re.compile(
+    r"""<h2\b[^>]*\bclass\s*=\s*["'][^"']*(?<![\w-])content-box-headline(?![\w-])[^"']*["'][^>]*>.*?</h2\s*>""",
+    re.IGNORECASE | re.DOTALL,
+)
+
+def resolver_backend(backend=None):
+    """Retorna o backend efetivo ("lxml" ou "bs4") a partir do pedido e do que está instalado."""
+    backend = backend or BACKEND_PARSER
+    if backend == "auto":
+        return "lxml" if etree is not None else "bs4"
+    if backend not in BACKENDS:
+        raise ValueError(f"[ERRO] Backend de parser desconhecido: {backend}")
+    if backend == "lxml" and etree is None:
+        raise ImportError("[ERRO] O backend 'lxml' exige o pacote lxml instalado.")
+    return backend
+
+def backends_disponiveis():
+    """Backends que podem ser usados com os pacotes instalados."""
+    return [backend for backend in BACKENDS if backend != "lxml" or etree is not None]
+
+def _como_texto(html):
+    return html.decode("utf-8", errors="replace") if isinstance(html, bytes) else html
+
+def _tem_classe(tag_abertura, classe):
+    """Verifica se a tag de abertura (texto) tem `classe` entre as suas classes."""
+    match = _RE_CLASSE.search(tag_abertura)
+    if not match:
+        return False
+    valor = next(grupo for grupo in match.groups() if grupo is not None)
+    return classe in valor.split()
+
+def _fragmento(trecho):
+    """Analisa um trecho HTML com o lxml e retorna o seu primeiro elemento."""
+    documento = etree.HTML(trecho)
+    corpo = documento.find("body") if documento is not None else None
+    return corpo[0] if corpo is not None and len(corpo) else None
+
+def _recortar_tabela(texto, inicio, classe=None):
+    """
+    Retorna o trecho HTML da primeira <table> (opcionalmente com `classe`) a partir de `inicio`,
+    até o </table> correspondente, considerando tabelas aninhadas. Retorna None se não houver.
+    """
+    abertura = None
+    profundidade = 0
+    for match in _RE_TAG_TABELA.finditer(texto, inicio):
+        fechamento = match.group(1) == "/"
+        if abertura is None:
+            if not fechamento and (classe is None or _tem_classe(match.group(0), classe)):
+                abertura = match.start()
+                profundidade = 1
+            continue
+        profundidade += -1 if fechamento else 1
+        if profundidade == 0:
+            return texto[abertura:match.end()]
+    return texto[abertura:] if abertura is not None else None
+
+# Extração de texto equivalente à do BeautifulSoup
+
+_xpath_texto = etree.XPath("string()", smart_strings=False) if etree is not None else None
+_xpath_textos = etree.XPath("descendant::text()", smart_strings=False) if etree is not None else None
+
+def _texto_lxml(elemento):
+    """Equivalente a `tag.text` do BeautifulSoup."""
+    return _xpath_texto(elemento)
+
+def _texto_limpo_lxml(elemento):
+    """Equivalente a `tag.get_text(strip=True)` do BeautifulSoup."""
+    return "".join(parte.strip() for parte in _xpath_textos(elemento))
+
+def _descendentes(elemento, *tags):
+    """Descendentes com as tags informadas, em ordem de documento (sem o próprio elemento)."""
+    return (e for e in elemento.iter(*tags) if e is not elemento)
+
+_XPATH_CLASSE = "contains(concat(' ', normalize-space(@class), ' '), ' {} ')"
+
+def tem_secao_classificacao(html):
+    """Verificação rápida (sem parsing) de que a página tem o título da seção "Classificação"."""
+    return bool(html) and _RE_H2_CLASSIFICACAO.search(_como_texto(html)) is not None
+
+def tem_secoes_transferencias(html):
+    """Verificação rápida (sem parsing) de que a página tem ao menos um título h2.content-box-headline."""
+    return bool(html) and _RE_H2_TRANSFERENCIAS.search(_como_texto(html)) is not None
+
+# Tabela de classificação (Wikipédia)
+
+def ler_tabela_classificacao(html, backend=None):
+    """
+    Localiza a seção "Classificação" e a tabela wikitable que a segue.
+    Retorna (secao_encontrada, tabela), onde tabela é None ou (cabecalhos, linhas):
+    cabecalhos são os textos dos <th> da primeira linha e linhas são os textos de
+    <th>/<td> de cada linha seguinte, sem nenhum tratamento adicional.
+    """
+    if resolver_backend(backend) == "bs4":
+        return _ler_tabela_classificacao_bs4(html)
+    return _ler_tabela_classificacao_lxml(html)
+
+def _ler_tabela_classificacao_bs4(html):
+    soup = BeautifulSoup(html, "html.parser")
+
+    secao_classificacao = soup.find("h2", id="Classificação")
+    if not secao_classificacao:
+        return False, None
+
+    tabela = secao_classificacao.find_next("table", {"class": "wikitable"})
+    if not tabela:
+        return True, None
+
+    linhas = tabela.find_all("tr")
+    cabecalhos = [th.get_text(strip=True) for th in linhas[0].find_all("th")] if linhas else []
+    corpo = [[cell.get_text(strip=True) for cell in row.find_all(["th", "td"])] for row in linhas[1:]]
+    return True, (cabecalhos, corpo)
+
+def _linhas_tabela_lxml(tabela):
+    linhas = list(_descendentes(tabela, "tr"))
+    cabecalhos = [_texto_limpo_lxml(th) for th in _descendentes(linhas[0], "th")] if linhas else []
+    corpo = [[_texto_limpo_lxml(cell) for cell in _descendentes(row, "th", "td")] for row in linhas[1:]]
+    return cabecalhos, corpo
+
+def _ler_tabela_classificacao_lxml(html):
+    texto = _como_texto(html)
+
+    # Caminho rápido: recorta apenas a tabela depois do título e analisa só esse trecho
+    titulo = _RE_H2_CLASSIFICACAO.search(texto)
+    if titulo:
+        trecho = _recortar_tabela(texto, titulo.end(), "wikitable")
+        if trecho is None:
+            return True, None
+        tabela = _fragmento(trecho)
+        if tabela is not None and tabela.tag == "table":
+            return True, _linhas_tabela_lxml(tabela)
+
+    # Caminho completo (ex.: id com entidades HTML ou recorte inesperado)
+    documento = etree.HTML(texto)
+    secoes = documento.xpath("//h2[@id='Classificação']") if documento is not None else []
+    if not secoes:
+        return False, None
+    tabelas = secoes[0].xpath(f"following::table[{_XPATH_CLASSE.format('wikitable')}][1]")
+    if not tabelas:
+        return True, None
+    return True, _linhas_tabela_lxml(tabelas[0])
+
+# Seções de transferências (Transfermarkt)
+
+def ler_secoes_transferencias(html, backend=None):
+    """
+    Localiza os títulos h2.content-box-headline e a tabela que segue cada um.
+    Retorna uma lista de (titulo, linhas), onde titulo é o texto bruto do h2 e linhas
+    é None (sem tabela/tbody) ou a lista de textos dos <td> de cada linha do tbody.
+    """
+    if resolver_backend(backend) == "bs4":
+        return _ler_secoes_transferencias_bs4(html)
+    return _ler_secoes_transferencias_lxml(html)
+
+def _ler_secoes_transferencias_bs4(html):
+    soup = BeautifulSoup(html, "html.parser")
+    secoes = []
+    for section in soup.find_all("h2", class_="content-box-headline"):
+        table = section.find_next("table")
+        tbody = table.find("tbody") if table else None
+        if not tbody:
+            secoes.append((section.text, None))
+            continue
+        linhas = [[col.text.strip() for col in row.find_all("td")] for row in tbody.find_all("tr")]
+        secoes.append((section.text, linhas))
+    return secoes
+
+def _linhas_tbody_lxml(tabela):
+    tbody = next(_descendentes(tabela, "tbody"), None)
+    if tbody is None:
+        return None
+    return [[_texto_lxml(col).strip() for col in _descendentes(row, "td")] for row in _descendentes(tbody, "tr")]
+
+def _ler_secoes_transferencias_lxml(html):
+    texto = _como_texto(html)
+
+    # Caminho rápido: analisa somente cada título e a tabela que vem logo depois dele
+    titulos = list(_RE_H2_TRANSFERENCIAS.finditer(texto))
+    if titulos:
+        secoes = []
+        for titulo in titulos:
+            section = _fragmento(titulo.group(0))
+            trecho = _recortar_tabela(texto, titulo.end())
+            tabela = _fragmento(trecho) if trecho else None
+            linhas = _linhas_tbody_lxml(tabela) if tabela is not None else None
+            secoes.append((_texto_lxml(section), linhas))
+        return secoes
+
+    # Caminho completo
+    documento = etree.HTML(texto)
+    if documento is None:
+        return []
+    secoes = []
+    for section in documento.xpath(f"//h2[{_XPATH_CLASSE.format('content-box-headline')}]"):
+        tabelas = section.xpath("following::table[1]")
+        linhas = _linhas_tbody_lxml(tabelas[0]) if tabelas else None
+        secoes.append((_texto_lxml(section), linhas))
+    return secoes
@@ -0,0 +1,112 @@
+import os
+import sys
+import queue
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlparse
+from webdriver_manager.chrome import ChromeDriverManager
+from dotenv import load_dotenv, find_dotenv
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from metricas import log
+
+# Carrega as variáveis de ambiente
+load_dotenv(find_dotenv())
+
+# Caminho opcional para um chromedriver já instalado (evita a resolução pelo ChromeDriverManager)
+CHROMEDRIVER_PATH = os.getenv("CHROMEDRIVER_PATH")
+
+# Limite padrão de páginas abertas simultaneamente no mesmo host
+LIMITE_POR_HOST = int(os.getenv("LIMITE_POR_HOST", 2))
+
+_trava_chromedriver = threading.Lock()
+_caminho_chromedriver = None
+
+def caminho_chromedriver():
+    """
+    Retorna o caminho do binário do chromedriver, resolvendo-o uma única vez por processo.
+    Se CHROMEDRIVER_PATH estiver definido e existir, ele é usado diretamente.
+    """
+    global _caminho_chromedriver
+    with _trava_chromedriver:
+        if _caminho_chromedriver is None:
+            if CHROMEDRIVER_PATH and os.path.exists(CHROMEDRIVER_PATH):
+                _caminho_chromedriver = CHROMEDRIVER_PATH
+            else:
+                _caminho_chromedriver = ChromeDriverManager().install()
+        return _caminho_chromedriver
+
+class PoolDrivers:
+    """
+    Pool de até `tamanho` WebDrivers reutilizáveis, criados sob demanda por `fabrica`.
+    Cada host pode ter no máximo `limite_por_host` páginas abertas ao mesmo tempo.
+    """
+
+    def __init__(self, fabrica, tamanho, limite_por_host=LIMITE_POR_HOST):
+        self.fabrica = fabrica
+        self.tamanho = max(1, tamanho)
+        self.limite_por_host = max(1, limite_por_host)
+        self._livres = queue.Queue()
+        self._todos = []
+        self._trava = threading.Lock()
+        self._semaforos = {}
+
+    def _semaforo(self, host):
+        with self._trava:
+            if host not in self._semaforos:
+                self._semaforos[host] = threading.BoundedSemaphore(self.limite_por_host)
+            return self._semaforos[host]
+
+    def _obter_driver(self):
+        try:
+            return self._livres.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._trava:
+            criar = len(self._todos) < self.tamanho
+            if criar:
+                # Reserva a vaga antes de criar o driver, fora da trava
+                self._todos.append(None)
+                indice = len(self._todos) - 1
+
+        if not criar:
+            return self._livres.get()
+
+        try:
+            driver = self.fabrica()
+        except Exception:
+            with self._trava:
+                self._todos.pop(indice)
+            raise
+        with self._trava:
+            self._todos[indice] = driver
+        return driver
+
+    @contextmanager
+    def driver(self, url):
+        """Empresta um driver do pool respeitando o limite de concorrência do host da URL."""
+        semaforo = self._semaforo(urlparse(url).netloc)
+        with semaforo:
+            driver = self._obter_driver()
+            try:
+                yield driver
+            finally:
+                self._livres.put(driver)
+
+    def fechar(self):
+        """Encerra todos os drivers criados pelo pool."""
+        with self._trava:
+            drivers = [d for d in self._todos if d is not None]
+            self._todos = []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                log("INFO", f"Erro ao encerrar o driver: {e}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.fechar()
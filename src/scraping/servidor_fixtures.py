@@ -0,0 +1,103 @@
+import os
+import sys
+import time
+import random
+import argparse
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from metricas import log
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    """
+    Serve páginas salvas em disco: a URL /a/b/c é respondida com o arquivo a_b_c.html do diretório.
+    """
+
+    def translate_path(self, path):
+        caminho = path.split("?", 1)[0].split("#", 1)[0].strip("/")
+        nome = caminho.replace("/", "_") or "index"
+        if not os.path.splitext(nome)[1]:
+            nome += ".html"
+        return os.path.join(self.directory, nome)
+
+    def do_GET(self):
+        estrangulamento = getattr(self.server, "estrangulamento", None)
+        status = estrangulamento.avaliar() if estrangulamento else None
+        if status is not None:
+            self.send_response(status)
+            if status == 429:
+                self.send_header("Retry-After", str(estrangulamento.retry_after))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass  # Mantém a saída dos scrapers limpa
+
+class Estrangulamento:
+    """
+    Simula um site que limita os acessos: acima de `taxa_maxima` req/s responde 429 (com Retry-After)
+    e, com probabilidade `prob_erro`, responde 503. Os contadores permitem conferir o comportamento do cliente.
+    """
+
+    def __init__(self, taxa_maxima=None, prob_erro=0.0, retry_after=1, seed=None):
+        self.taxa_maxima = taxa_maxima
+        self.prob_erro = prob_erro
+        self.retry_after = retry_after
+        self._aleatorio = random.Random(seed)
+        self._trava = threading.Lock()
+        self._tokens = 1.0
+        self._atualizado_em = time.monotonic()
+        self.contagem = {200: 0, 429: 0, 503: 0}
+
+    def avaliar(self):
+        """Retorna o status de erro a responder, ou None para servir a página."""
+        with self._trava:
+            if self.taxa_maxima:
+                agora = time.monotonic()
+                self._tokens = min(1.0, self._tokens + (agora - self._atualizado_em) * self.taxa_maxima)
+                self._atualizado_em = agora
+                if self._tokens < 1:
+                    self.contagem[429] += 1
+                    return 429
+                self._tokens -= 1
+            if self._aleatorio.random() < self.prob_erro:
+                self.contagem[503] += 1
+                return 503
+            self.contagem[200] += 1
+            return None
+
+def iniciar_servidor(diretorio, porta=0, taxa_maxima=None, prob_erro=0.0, retry_after=1):
+    """
+    Inicia um servidor HTTP local em segundo plano servindo as páginas de `diretorio`.
+    Com `taxa_maxima` e/ou `prob_erro`, simula um site que limita acessos (ver Estrangulamento),
+    acessível em servidor.estrangulamento.
+    Retorna (servidor, url_base). Use servidor.shutdown() para encerrar.
+    """
+    handler = partial(FixtureHandler, directory=os.path.abspath(diretorio))
+    servidor = ThreadingHTTPServer(("127.0.0.1", porta), handler)
+    if taxa_maxima or prob_erro:
+        servidor.estrangulamento = Estrangulamento(taxa_maxima, prob_erro, retry_after)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    host, porta = servidor.server_address[:2]
+    return servidor, f"http://{host}:{porta}"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor local de páginas salvas para testar os scrapers.")
+    parser.add_argument("diretorio", help="Diretório com as páginas HTML salvas")
+    parser.add_argument("--porta", type=int, default=8000)
+    parser.add_argument("--taxa-maxima", type=float, default=None,
+                        help="Responde 429 acima desta taxa de requisições por segundo")
+    parser.add_argument("--prob-erro", type=float, default=0.0, help="Probabilidade de responder 503")
+    args = parser.parse_args()
+
+    servidor, url_base = iniciar_servidor(args.diretorio, args.porta, args.taxa_maxima, args.prob_erro)
+    log("INFO", f"Servindo {args.diretorio} em {url_base}")
+    log("INFO", f"Exemplo: TRANSFERENCIAS_SCRAPER={url_base}/{{}}/{{}}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        servidor.shutdown()
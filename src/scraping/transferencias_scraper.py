@@ -1,16 +1,30 @@
 import os
+import sys
 import time
 import random
+import argparse
 import pandas as pd
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 from dotenv import load_dotenv, find_dotenv
-from bs4 import BeautifulSoup
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scraping.pool_drivers import PoolDrivers, caminho_chromedriver
+from scraping.cliente_http import buscar_paginas
+from scraping.cache_paginas import cache_paginas
+from scraping.checkpoint import Checkpoint
+from scraping.parsers import ler_secoes_transferencias, tem_secoes_transferencias
+from scraping.estagio_parse import PARSER_WORKERS, EstagioParse
+from scraping.limitador import TENTATIVAS, limitador, resumo_limitadores
+from metricas import metricas, log, nivel_ativo
+from scraping.carregamento_enxuto import (
+    CARREGAMENTO_ENXUTO, ALVO_TRANSFERENCIAS, configurar_opcoes, bloquear_recursos, abrir_pagina
+)
 
 # Carrega as variáveis de ambiente
 load_dotenv(find_dotenv())
@@ -28,9 +42,19 @@ COLUNA_CODIGO = os.getenv("COLUNA_CODIGO_TRANSFER")  # Código identificador do
 TRANSFERENCIAS_SCRAPER = os.getenv("TRANSFERENCIAS_SCRAPER")
 USER_AGENT = os.getenv("USER_AGENT")  # Agente de usuário para evitar bloqueios automáticos
 
-# Configuração de tempos de espera para evitar bloqueios e garantir carregamento da página
-ATRASO_MINIMO = 3  # Tempo mínimo de espera entre requisições
-ATRASO_MAXIMO = 6  # Tempo máximo de espera entre requisições
+# Espera fixa pelo carregamento da página, usada só com CARREGAMENTO_ENXUTO=0
+# (o intervalo entre requisições é controlado por scraping.limitador)
+ATRASO_MINIMO = 3  # Tempo mínimo de espera
+ATRASO_MAXIMO = 6  # Tempo máximo de espera
+
+# Número de navegadores usados em paralelo (1 = modo sequencial)
+SCRAPER_WORKERS = int(os.getenv("SCRAPER_WORKERS", 1))
+
+# Modo de coleta: "http" baixa as páginas diretamente e só usa o Selenium como fallback
+MODO_COLETA = os.getenv("MODO_COLETA", "http")
+
+# Colunas do CSV bruto de transferências
+COLUNAS_TRANSFERENCIAS = ["Temporada", "Clube_ID", "Tipo", "Player", "Origem_Destino", "Transfer Sum"]
 
 # Obtém a temporada atual automaticamente
 ano_atual = datetime.now().year
@@ -56,33 +80,43 @@ def configurar_driver():
     }
     chrome_options.add_experimental_option("prefs", chrome_prefs)
 
-    # Instala e inicializa o WebDriver
-    service = Service(ChromeDriverManager().install())
-    return webdriver.Chrome(service=service, options=chrome_options)
+    # Estratégia "eager" e imagens desativadas no carregamento enxuto
+    configurar_opcoes(chrome_options)
+
+    # Inicializa o WebDriver (o chromedriver é resolvido uma única vez por processo)
+    service = Service(caminho_chromedriver())
+    return bloquear_recursos(webdriver.Chrome(service=service, options=chrome_options))
 
 # Fechar popups e notificações caso existam na página
-def fechar_popup(driver):
+def fechar_popup(driver, aguardar=True):
     """
     Fecha pop-ups de cookies e notificações caso apareçam na página.
+    Com aguardar=False (carregamento enxuto) apenas verifica os botões já presentes, sem espera fixa.
     """
+    with metricas().cronometro("popup"):
+        _fechar_popup(driver, aguardar)
+
+def _fechar_popup(driver, aguardar):
     try:
-        time.sleep(random.uniform(ATRASO_MINIMO, ATRASO_MAXIMO))  # Aguarda para evitar detecção como bot
+        if aguardar:
+            time.sleep(random.uniform(ATRASO_MINIMO, ATRASO_MAXIMO))  # Aguarda para evitar detecção como bot
 
         popups = [
-            ("//button[contains(text(), 'Aceitar') or contains(text(), 'Accept')]", "[INFO] Popup de cookies fechado!"),
-            ("//button[contains(text(), 'Bloquear') or contains(text(), 'Block')]", "[INFO] Popup de notificações bloqueado!")
+            ("//button[contains(text(), 'Aceitar') or contains(text(), 'Accept')]", "Popup de cookies fechado!"),
+            ("//button[contains(text(), 'Bloquear') or contains(text(), 'Block')]", "Popup de notificações bloqueado!")
         ]
 
         for xpath, message in popups:
-            try:
-                botao = driver.find_element(By.XPATH, xpath)
-                botao.click()
-                print(message)
-            except:
-                pass  # Se não encontrar o botão, ignora
+            botoes = driver.find_elements(By.XPATH, xpath)  # Lista vazia se o botão não existir
+            if botoes:
+                try:
+                    botoes[0].click()
+                    log("INFO", message)
+                except Exception:
+                    pass  # Botão presente, mas não clicável (ex.: oculto)
 
     except Exception as e:
-        print(f"[INFO] Erro ao tentar fechar popups: {e}")
+        log("INFO", f"Erro ao tentar fechar popups: {e}")
 
 # Função para verificar se a temporada está no intervalo permitido
 def temporada_valida(season):
@@ -95,115 +129,313 @@ def temporada_valida(season):
     return False
 
 # Extração de transferências com filtro por temporada
-def extrair_transferencias(driver, nome_clube, codigo_clube, nome_oficial):
+def baixar_transferencias(driver, nome_clube, codigo_clube, nome_oficial, tentativas=TENTATIVAS):
     """
-    Extrai as transferências de jogadores para um clube específico,
-    incluindo a coluna de Tipo (Entrada/Saída) e o ID do Clube.
+    Acessa a página de transferências de um clube com o navegador e retorna o HTML, sem analisá-lo
+    (o parsing fica com o EstagioParse, em paralelo com os próximos acessos).
+    O ritmo dos acessos é controlado pelo limitador do host; erros e páginas sem as seções de
+    transferências (ex.: bloqueio) reduzem a taxa e o clube é tentado de novo, até `tentativas` vezes.
+    Retorna None se todas as tentativas falharem.
     """
-    dados_transferencias = []
     url_formatada = TRANSFERENCIAS_SCRAPER.format(nome_clube, codigo_clube)
+    controle = limitador(url_formatada)
+
+    for _ in range(tentativas):
+        controle.aguardar()
+        try:
+            log("INFO", f"Acessando URL: {url_formatada}")
+            if CARREGAMENTO_ENXUTO:
+                # Segue assim que o título da seção e a tabela estiverem no DOM
+                with metricas().cronometro("fetch", url_formatada):
+                    abrir_pagina(driver, url_formatada, ALVO_TRANSFERENCIAS)
+                fechar_popup(driver, aguardar=False)
+            else:
+                with metricas().cronometro("fetch", url_formatada):
+                    driver.get(url_formatada)
+                fechar_popup(driver)  # Fecha pop-ups antes de continuar
+
+                time.sleep(random.uniform(ATRASO_MINIMO, ATRASO_MAXIMO))  # Aguarda o carregamento da página
+
+            html = driver.page_source
+        except Exception as e:
+            controle.registrar_falha(f"erro ao acessar {url_formatada}: {e.__class__.__name__}")
+            continue
+
+        if tem_secoes_transferencias(html):
+            controle.registrar_sucesso()
+            return html
+        controle.registrar_falha(f"página sem seções de transferências em {url_formatada}")
+
+    log("ERRO", f"Falha ao coletar {nome_oficial} após {tentativas} tentativa(s).")
+    return None
+
+def analisar_transferencias(html, nome_oficial, backend=None):
+    """
+    Extrai as transferências do HTML (str ou bytes) da página de um clube.
+    `backend` escolhe o parser (ver scraping.parsers); por padrão, BACKEND_PARSER.
+    Retorna None se a página não tiver nenhuma seção de transferências (ex.: bloqueio ou conteúdo via JavaScript).
+    """
+    # Encontra todas as seções de transferências e as linhas da tabela de cada uma
+    with metricas().cronometro("parse"):
+        sections = ler_secoes_transferencias(html, backend)
+    if not sections:
+        return None
+
+    with metricas().cronometro("extracao"):
+        dados_transferencias = _extrair_linhas(sections, nome_oficial)
+    metricas().contar_linhas("extracao", len(dados_transferencias))
+    return dados_transferencias
 
-    try:
-        print(f"[INFO] Acessando URL: {url_formatada}")
-        driver.get(url_formatada)
-        fechar_popup(driver)  # Fecha pop-ups antes de continuar
-
-        time.sleep(random.uniform(ATRASO_MINIMO, ATRASO_MAXIMO))  # Aguarda o carregamento da página
-
-        # Captura o código HTML da página
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-
-        # Encontra todas as seções de transferências
-        sections = soup.find_all("h2", class_="content-box-headline")
-
-        for section in sections:
-            season = section.text.strip().replace("Arrivals ", "").replace("Departures ", "")
-
-            # Define se é entrada ou saída com base no título
-            tipo_transferencia = "Entrada" if "Arrivals" in section.text else "Saída"
-
-            # Verifica se a temporada está no intervalo válido
-            if not temporada_valida(season):
-                print(f"[ALERTA] Temporada fora do intervalo permitido: {season}, ignorando essa seção.")
-                continue  # Ignora temporadas inválidas ou fora do intervalo
+def _extrair_linhas(sections, nome_oficial):
+    """Monta as linhas de transferências a partir das seções lidas da página."""
+    dados_transferencias = []
+    depurar = nivel_ativo("DEBUG")  # Uma mensagem por transferência: desligado por padrão (NIVEL_LOG=INFO)
 
-            table = section.find_next("table")  # Localiza a tabela de transferências
+    for titulo, rows in sections:
+        season = titulo.strip().replace("Arrivals ", "").replace("Departures ", "")
 
-            if not table:
-                continue  # Se a tabela não for encontrada, ignora a seção
+        # Define se é entrada ou saída com base no título
+        tipo_transferencia = "Entrada" if "Arrivals" in titulo else "Saída"
 
-            rows = table.find("tbody").find_all("tr")  # Encontra todas as linhas de jogadores
+        # Verifica se a temporada está no intervalo válido
+        if not temporada_valida(season):
+            log("ALERTA", f"Temporada fora do intervalo permitido: {season}, ignorando essa seção.")
+            continue  # Ignora temporadas inválidas ou fora do intervalo
 
-            for row in rows:
-                cols = row.find_all("td")
-                if len(cols) < 4:
-                    continue  # Se não houver colunas suficientes, ignora a linha
+        if rows is None:
+            continue  # Se a tabela não for encontrada, ignora a seção
 
-                player = cols[0].text.strip()  # Nome do jogador
-                club = cols[2].text.strip()  # Clube de origem/destino
-                transfer_sum_raw = cols[3].text.strip()  # Valor da transferência
+        for cols in rows:
+            if len(cols) < 4:
+                continue  # Se não houver colunas suficientes, ignora a linha
 
-                # Corrige valores inconsistentes
-                transfer_sum = (
-                    transfer_sum_raw.replace("Loan fee:\n", "").strip()
-                    if "Loan fee" in transfer_sum_raw else transfer_sum_raw or "Unknown"
-                )
+            player = cols[0]  # Nome do jogador
+            club = cols[2]  # Clube de origem/destino
+            transfer_sum_raw = cols[3]  # Valor da transferência
 
-                # Adiciona os dados à lista, incluindo o tipo de transferência e ID do clube
-                dados_transferencias.append([season, nome_oficial, tipo_transferencia, player, club, transfer_sum])
+            # Corrige valores inconsistentes
+            transfer_sum = (
+                transfer_sum_raw.replace("Loan fee:\n", "").strip()
+                if "Loan fee" in transfer_sum_raw else transfer_sum_raw or "Unknown"
+            )
 
-                print(f"[DEBUG] {season} | {nome_oficial} | {tipo_transferencia} | {player} -> {club} ({transfer_sum})")
+            # Adiciona os dados à lista, incluindo o tipo de transferência e ID do clube
+            dados_transferencias.append([season, nome_oficial, tipo_transferencia, player, club, transfer_sum])
 
-    except Exception as e:
-        print(f"[ERRO] Falha ao acessar {url_formatada}: {e}")
+            if depurar:
+                log("DEBUG", f"{season} | {nome_oficial} | {tipo_transferencia} | {player} -> {club} ({transfer_sum})")
 
     return dados_transferencias
 
 # Função para coletar os dados de todos os clubes
-def coletar_dados():
+def listar_clubes():
     """
-    Coleta as transferências de todos os clubes listados no arquivo de entrada.
+    Lê o arquivo de entrada e retorna a lista de (clube_nome, codigo_clube, nome_oficial), na ordem do arquivo.
     """
     df = pd.read_csv(ARQUIVO_CLUBES_RAW, sep=';', dtype=str).fillna("")
-    driver = configurar_driver()
-    dados_gerais = []
-
+    clubes = []
     for _, row in df.iterrows():
         clube_nome = row[COLUNA_NOME].strip().replace(" ", "-").lower()  # Formata o nome do clube
         codigo_clube = row[COLUNA_CODIGO].strip()
         nome_oficial = row[COLUNA_ID].strip()
+        clubes.append((clube_nome, codigo_clube, nome_oficial))
+    return clubes
 
-        print(f"[INFO] Coletando {nome_oficial}...")
-        dados_clube = extrair_transferencias(driver, clube_nome, codigo_clube, nome_oficial)
+def coletar_dados(workers=SCRAPER_WORKERS, modo=MODO_COLETA, clubes=None, checkpoint=None, parser_workers=PARSER_WORKERS):
+    """
+    Coleta as transferências dos clubes informados (padrão: todos os do arquivo de entrada).
+    Páginas válidas no cache de páginas não são baixadas novamente.
+    No modo "http", as páginas restantes são baixadas em paralelo e o navegador só é usado
+    para os clubes cuja página não trouxe as seções de transferências.
+    Com workers > 1, o navegador roda em um pool paralelo.
+    O parsing roda em `parser_workers` processos (EstagioParse): cada página é analisada assim que
+    chega, enquanto as próximas ainda estão sendo baixadas; o resultado mantém a ordem dos clubes.
+    Com um checkpoint, cada clube é gravado em disco assim que termina e os clubes já concluídos são pulados.
+    """
+    cache = cache_paginas()
+    clubes = clubes if clubes is not None else listar_clubes()
+    urls = [TRANSFERENCIAS_SCRAPER.format(clube_nome, codigo_clube) for clube_nome, codigo_clube, _ in clubes]
+    a_coletar = [i for i, clube in enumerate(clubes) if checkpoint is None or not checkpoint.concluido(clube[2])]
+    baixadas = {}  # Páginas baixadas nesta execução, salvas no cache se tiverem as seções
+
+    def ao_concluir(chave, dados_clube):
+        i = chave[0]
+        html = baixadas.pop(chave, None)
+        if dados_clube is not None and html is not None:
+            cache.salvar(urls[i], html)
+        registrar_clube(checkpoint, clubes[i], dados_clube)
+
+    def enviar(estagio, chave, html):
+        if chave[1] != "cache":
+            baixadas[chave] = html
+        estagio.enviar(chave, html, clubes[chave[0]][2])
+
+    with EstagioParse(analisar_transferencias, parser_workers, ao_concluir=ao_concluir) as estagio:
+        # Páginas do cache vão direto para o parsing
+        a_baixar = []
+        for i in a_coletar:
+            html = cache.obter(urls[i], "transferencias")
+            if html:
+                enviar(estagio, (i, "cache"), html)
+            else:
+                a_baixar.append(i)
+
+        # Páginas baixadas entram no parsing à medida que chegam
+        if modo == "http" and a_baixar and not cache.somente_replay:
+            def ao_receber(indice, html):
+                if html:
+                    enviar(estagio, (a_baixar[indice], "http"), html)
+            buscar_paginas((urls[i] for i in a_baixar), ao_receber=ao_receber)
+
+        resultados = [None] * len(clubes)
+        for i in a_coletar:
+            # Uma página válida sem transferências retorna [], que não deve levar ao navegador
+            do_cache = estagio.resultado((i, "cache"))
+            resultados[i] = do_cache if do_cache is not None else estagio.resultado((i, "http"))
+
+        # Clubes sem as seções no HTML: o navegador baixa, o parsing continua no pool
+        pendentes = [i for i in a_coletar if resultados[i] is None]
+        if pendentes and not cache.somente_replay:
+            if modo == "http":
+                log("INFO", f"Usando o navegador para {len(pendentes)} clube(s)")
+            if workers > 1:
+                baixar_dados_concorrente(clubes, pendentes, workers, lambda i, html: enviar(estagio, (i, "navegador"), html))
+            else:
+                baixar_dados_sequencial(clubes, pendentes, lambda i, html: enviar(estagio, (i, "navegador"), html))
+            for i in pendentes:
+                resultados[i] = estagio.resultado((i, "navegador"))
+    resumo_limitadores()
+
+    if checkpoint is not None:
+        # Clubes concluídos em execuções anteriores vêm do arquivo parcial
+        _, unidades = checkpoint.carregar()
+        resultados = [unidades.get(nome_oficial, []) for _, _, nome_oficial in clubes]
 
+    dados_gerais = []
+    for (_, _, nome_oficial), dados_clube in zip(clubes, resultados):
         if not dados_clube:
-            print(f"[ALERTA] Nenhum dado encontrado para {nome_oficial}.")
+            log("ALERTA", f"Nenhum dado encontrado para {nome_oficial}.")
+        dados_gerais.extend(dados_clube or [])
+    return dados_gerais
 
-        dados_gerais.extend(dados_clube)
-        time.sleep(random.uniform(ATRASO_MINIMO, ATRASO_MAXIMO))
+def registrar_clube(checkpoint, clube, dados_clube):
+    """
+    Grava as transferências do clube no checkpoint, se houver um e a página foi analisada.
+    Clubes sem transferências ([]) também são marcados como concluídos, para não serem coletados de novo.
+    """
+    if checkpoint is not None and dados_clube is not None:
+        checkpoint.registrar(clube[2], dados_clube, COLUNAS_TRANSFERENCIAS)
 
-    driver.quit()
-    return dados_gerais
+def baixar_dados_sequencial(clubes, indices, ao_baixar):
+    """
+    Baixa com um único navegador as páginas dos clubes em `indices`, chamando
+    `ao_baixar(indice, html)` para cada página obtida.
+    """
+    driver = configurar_driver()
+    try:
+        for i in indices:
+            clube_nome, codigo_clube, nome_oficial = clubes[i]
+            log("INFO", f"Coletando {nome_oficial}...")
+            html = baixar_transferencias(driver, clube_nome, codigo_clube, nome_oficial)
+            if html is not None:
+                ao_baixar(i, html)
+    finally:
+        driver.quit()
+
+def baixar_dados_concorrente(clubes, indices, workers, ao_baixar):
+    """
+    Baixa as páginas dos clubes em `indices` usando `workers` navegadores reutilizáveis,
+    limitando as páginas abertas por host, e chama `ao_baixar(indice, html)` para cada página obtida.
+    """
+    with PoolDrivers(configurar_driver, workers) as pool:
+
+        def baixar_clube(i):
+            clube_nome, codigo_clube, nome_oficial = clubes[i]
+            url_formatada = TRANSFERENCIAS_SCRAPER.format(clube_nome, codigo_clube)
+            log("INFO", f"Coletando {nome_oficial}...")
+            with pool.driver(url_formatada) as driver:
+                html = baixar_transferencias(driver, clube_nome, codigo_clube, nome_oficial)
+            if html is not None:
+                ao_baixar(i, html)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(baixar_clube, indices))
+
+def clubes_desatualizados(clubes):
+    """
+    Compara os clubes com o CSV bruto existente e retorna os que precisam ser coletados:
+    clubes ausentes ou sem nenhuma transferência registrada na temporada atual.
+    """
+    if not ARQUIVO_TRANSFERENCIAS_RAW or not os.path.exists(ARQUIVO_TRANSFERENCIAS_RAW):
+        return list(clubes)
+    df = pd.read_csv(ARQUIVO_TRANSFERENCIAS_RAW, sep=';', dtype=str)
+    temporadas_por_clube = df.groupby("Clube_ID")["Temporada"].agg(set).to_dict()
+    return [clube for clube in clubes if temporada_atual not in temporadas_por_clube.get(clube[2], set())]
+
+def mesclar_com_existente(dados):
+    """
+    Junta as transferências recém-coletadas às do CSV bruto existente.
+    Clubes presentes nos novos dados substituem os antigos; os demais são mantidos.
+    """
+    if not ARQUIVO_TRANSFERENCIAS_RAW or not os.path.exists(ARQUIVO_TRANSFERENCIAS_RAW):
+        return dados
+    df = pd.read_csv(ARQUIVO_TRANSFERENCIAS_RAW, sep=';', dtype=str).fillna("")
+    clubes_novos = {linha[1] for linha in dados}
+    mantidos = df[~df["Clube_ID"].isin(clubes_novos)]
+    return mantidos.values.tolist() + dados
 
 # Salvar os dados extraídos em um arquivo CSV
 def salvar_dados(dados):
     """
-    Salva os dados extraídos em um arquivo CSV formatado.
+    Salva os dados extraídos em um arquivo CSV formatado. Retorna True se o CSV foi gravado.
     """
-    colunas = ["Temporada", "Clube_ID", "Tipo", "Player", "Origem_Destino", "Valor"]
-    df = pd.DataFrame(dados, columns=colunas)
+    df = pd.DataFrame(dados, columns=COLUNAS_TRANSFERENCIAS)
 
     if df.empty:
-        print("[ERRO] Nenhuma transferência encontrada!")
-        return
+        log("ERRO", "Nenhuma transferência encontrada!")
+        return False
 
     # Ordenação por temporada e jogador
-    df.sort_values(by=["Season", "Player"], inplace=True)
-
-    df.to_csv(ARQUIVO_TRANSFERENCIAS_RAW, sep=';', index=False, encoding='utf-8')
-    print(f"[INFO] Dados salvos em {ARQUIVO_TRANSFERENCIAS_RAW}")
+    df.sort_values(by=["Temporada", "Player"], inplace=True)
+
+    with metricas().cronometro("escrita"):
+        df.to_csv(ARQUIVO_TRANSFERENCIAS_RAW, sep=';', index=False, encoding='utf-8')
+    metricas().contar_linhas("escrita", len(df))
+    log("INFO", f"Dados salvos em {ARQUIVO_TRANSFERENCIAS_RAW}")
+    return True
+
+def executar(workers=SCRAPER_WORKERS, modo=MODO_COLETA, offline=False, retomar=False, incremental=False):
+    """Coleta as transferências de todos os clubes (ou só dos desatualizados) e salva o CSV bruto."""
+    if offline:
+        cache_paginas().somente_replay = True
+
+    clubes = listar_clubes()
+    if incremental:
+        clubes = clubes_desatualizados(clubes)
+        log("INFO", f"Clubes a coletar: {len(clubes)}")
+
+    checkpoint = Checkpoint(ARQUIVO_TRANSFERENCIAS_RAW, retomar=retomar)
+    dados = coletar_dados(workers, modo, clubes, checkpoint)
+    if incremental:
+        dados = mesclar_com_existente(dados)
+    # Sem CSV gravado, o checkpoint é mantido para a coleta poder ser retomada
+    if salvar_dados(dados):
+        checkpoint.finalizar()
 
 # Execução do script
 if __name__ == "__main__":
-    dados = coletar_dados()
-    salvar_dados(dados)
+    parser = argparse.ArgumentParser(description="Coleta as transferências dos clubes no Transfermarkt.")
+    parser.add_argument("--workers", type=int, default=SCRAPER_WORKERS,
+                        help="Número de navegadores em paralelo (1 = sequencial)")
+    parser.add_argument("--modo", choices=["http", "selenium"], default=MODO_COLETA,
+                        help="http: baixa direto e usa o navegador só como fallback")
+    parser.add_argument("--offline", action="store_true",
+                        help="Usa somente as páginas já salvas no cache, sem acessar a rede")
+    parser.add_argument("--resume", action="store_true",
+                        help="Retoma uma coleta interrompida a partir do último checkpoint")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Coleta somente os clubes ausentes ou desatualizados no CSV bruto")
+    args = parser.parse_args()
+
+    executar(args.workers, args.modo, offline=args.offline, retomar=args.resume, incremental=args.incremental)
+    metricas().exportar("coleta_transferencias")
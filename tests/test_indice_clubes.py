@@ -0,0 +1,35 @@
+import os
+import sys
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+from preprocessing.indice_clubes import IndiceClubes, normalizar_nome
+
+def montar_indice():
+    df_clubes = pd.DataFrame({
+        "ID": [1, 2, 3, 4],
+        "Nome": ["Atlético Mineiro", "Vasco da Gama", "Internacional", "Fluminense"],
+    })
+    return IndiceClubes.construir(df_clubes, colunas_nome=["Nome"])
+
+def resolver(indice, *nomes):
+    return indice.resolver(pd.Series(nomes)).tolist()
+
+def test_sigla_de_estado_diferente_nao_resolve_para_outro_clube():
+    indice = montar_indice()
+    assert resolver(indice, "Atlético-GO", "Atlético-MG") == [pd.NA, 1]
+
+def test_sigla_de_estado_no_fim_nao_e_ignorada():
+    indice = montar_indice()
+    assert normalizar_nome("Vasco-AC") == "vasco ac"
+    assert normalizar_nome("Avaí-SC") == "avai sc"
+    assert resolver(indice, "Vasco-AC", "Vasco da Gama") == [pd.NA, 2]
+
+def test_sigla_de_entidade_no_inicio_e_ignorada():
+    indice = montar_indice()
+    assert normalizar_nome("SC Internacional") == "internacional"
+    assert resolver(indice, "SC Internacional", "Fluminense FC") == [3, 4]
+
+def test_variacoes_de_acento_e_grafia_continuam_resolvidas():
+    indice = montar_indice()
+    assert resolver(indice, "Atletico Mineiro (C)", "Athlético-MG", "Atlético Mineirro", "Fluminence") == [1, 1, 1, 4]
@@ -0,0 +1,57 @@
+import os
+import sys
+import glob
+import gzip
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+from scraping.parsers import tem_secao_classificacao, tem_secoes_transferencias
+from scraping.brasileirao_scraper import analisar_tabela
+from scraping.transferencias_scraper import analisar_transferencias
+
+pytest.importorskip("lxml")
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "benchmarks", "fixtures")
+
+def ler_fixture(caminho):
+    with gzip.open(caminho, "rb") as arquivo:
+        return arquivo.read().decode("utf-8")
+
+def fixtures(prefixo):
+    caminhos = sorted(glob.glob(os.path.join(FIXTURES, f"{prefixo}_*.html.gz")))
+    assert caminhos, f"Nenhuma fixture {prefixo}_*.html.gz em {FIXTURES}"
+    return caminhos
+
+# Variações em que o título da seção não aparece literalmente no HTML: o recorte rápido do lxml
+# falha e o parsing do documento inteiro (XPath) é usado
+
+def sem_marcador_wikipedia(html):
+    return html.replace('<h2 id="Classificação">', '<h2 id="Classifica&#231;&#227;o">')
+
+def sem_marcador_transfermarkt(html):
+    return html.replace('<h2 class="content-box-headline">', "<h2 class=content-box-headline>")
+
+@pytest.mark.parametrize("caminho", fixtures("wikipedia"), ids=os.path.basename)
+@pytest.mark.parametrize("variacao", [None, sem_marcador_wikipedia], ids=["original", "sem_marcador"])
+def test_analisar_tabela_igual_nos_backends(caminho, variacao):
+    html = ler_fixture(caminho)
+    if variacao is not None:
+        html = variacao(html)
+        assert not tem_secao_classificacao(html)
+    ano = int(os.path.basename(caminho).split("_")[1].split(".")[0])
+
+    headers, linhas = analisar_tabela(html, ano, "lxml")
+    assert headers is not None and linhas
+    assert (headers, linhas) == analisar_tabela(html, ano, "bs4")
+
+@pytest.mark.parametrize("caminho", fixtures("transfermarkt"), ids=os.path.basename)
+@pytest.mark.parametrize("variacao", [None, sem_marcador_transfermarkt], ids=["original", "sem_marcador"])
+def test_analisar_transferencias_igual_nos_backends(caminho, variacao):
+    html = ler_fixture(caminho)
+    if variacao is not None:
+        html = variacao(html)
+        assert not tem_secoes_transferencias(html)
+
+    linhas = analisar_transferencias(html, "Clube Teste", "lxml")
+    assert linhas
+    assert linhas == analisar_transferencias(html, "Clube Teste", "bs4")